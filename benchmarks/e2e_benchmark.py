@@ -0,0 +1,313 @@
+# File: benchmarks/e2e_benchmark.py
+#
+# Offline end-to-end benchmarks for handle_mention, the Gmail webhook path and
+# the initial sync. Google, Gemini and Discord are replaced by local fakes, so
+# no accounts or network access are needed.
+#
+# Usage:
+#   python benchmarks/e2e_benchmark.py                      # run and print a report
+#   python benchmarks/e2e_benchmark.py --save-baseline      # record benchmarks/baseline.json
+#   python benchmarks/e2e_benchmark.py --compare            # fail on regressions vs. the baseline
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.fakes.google_server import FakeGoogleServer
+from benchmarks.fakes.discord_fakes import FakeBot, FakeChannel, FakeDiscordAPI, FakeGuild, FakeMessage, FakeUser
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+OWNER_ID = 1
+
+
+class Environment:
+    """Starts the fakes and wires the bot modules to them."""
+
+    def __init__(self, google_latency: float, llm_latency: float, discord_latency: float):
+        self.workdir = tempfile.mkdtemp(prefix="aura-bench-")
+        os.chdir(self.workdir)
+
+        self.server = FakeGoogleServer(latency=google_latency).start()
+        os.environ['GOOGLE_API_ROOT_URL'] = self.server.root_url
+        os.environ['DISCORD_OWNER_ID'] = str(OWNER_ID)
+        os.environ.setdefault('GOOGLE_API_KEY', 'fake-key')
+        self.llm_latency = llm_latency
+        self.discord = FakeDiscordAPI(latency=discord_latency)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            from google.auth.credentials import AnonymousCredentials
+            from src.core import gcp_auth
+            from src.agent import core as agent_core
+            from src.agent import invoker
+            from src.bot import client, mail_delivery, webserver
+            import gmail_history_tracker
+
+            gcp_auth._credentials[OWNER_ID] = AnonymousCredentials()
+            invoker.load_agent()
+
+        self.agent_core = agent_core
+        self.invoker = invoker
+        self.client = client
+        self.webserver = webserver
+        self.mail_delivery = mail_delivery
+        self.tracker = gmail_history_tracker
+
+        self.owner = FakeUser(self.discord, OWNER_ID, "owner")
+        self.me = FakeUser(self.discord, 999, "Aura")
+        self.channel = FakeChannel(self.discord)
+        self.guild = FakeGuild(self.me)
+
+    def use_script(self, turns: list, structured=None):
+        from benchmarks.fakes.chat_model import ScriptedChatModel
+        self.agent_core.model = ScriptedChatModel(turns=turns, latency=self.llm_latency, structured=structured)
+        self.agent_core._model_loaded = True
+
+    def mention(self, text: str) -> FakeMessage:
+        return FakeMessage(self.discord, f"<@{self.me.id}> {text}", self.owner, self.channel, self.guild)
+
+    def reset_tracker_to_now(self):
+        self.tracker.add_processed_message_ids([], self.server.mailbox.history_id)
+        self.tracker.set_current_email_address(self.server.mailbox.email_address)
+
+    def add_mail(self, count: int):
+        for index in range(count):
+            self.server.mailbox.add_message(
+                subject=f"Benchmark mail {index}",
+                sender=f'"Sender {index % 7}" <sender{index % 7}@example.com>',
+                body="Lorem ipsum dolor sit amet. " * 40,
+            )
+
+    def stop(self):
+        self.server.stop()
+
+
+# --- Scenarios ---
+# Each scenario has an optional per-iteration `setup` (not timed) and a timed `run`.
+
+def build_scenarios(env: Environment) -> dict:
+    from benchmarks.fakes.chat_model import tool_call
+    import datetime
+
+    def setup_chat():
+        env.use_script(["Hello! I'm Aura. How can I help?"])
+
+    def setup_tasks():
+        env.use_script([[tool_call('list_tasks', status_filter='pending')], "You have no pending tasks."])
+
+    def setup_calendar():
+        if not env.server.calendar.events:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            for hour in range(1, 11):
+                env.server.calendar.add_event(f"Meeting {hour}", now + datetime.timedelta(hours=hour))
+        env.use_script([[tool_call('fetch_upcoming_events', max_results=5)], "Here are your next events."])
+
+    def setup_free_slots():
+        setup_calendar()
+        from src.agent.tools import free_busy
+        free_busy._snapshots.clear()
+        day = datetime.datetime.now(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+        window_end = day + datetime.timedelta(days=2)
+        env.use_script([
+            [tool_call('find_free_slots', duration_minutes=30, window_start_iso=day.isoformat(),
+                       window_end_iso=window_end.isoformat(), working_hours='09:00-17:00')],
+            [tool_call('check_conflicts', start_time_iso=(day + datetime.timedelta(hours=3)).isoformat(),
+                       end_time_iso=(day + datetime.timedelta(hours=4)).isoformat())],
+            "Here are the times you are free.",
+        ])
+
+    def summarize_all(schema, prompt):
+        ids = re.findall(r"Email id: (\S+)", prompt)
+        return schema(emails=[{'message_id': message_id, 'summary': "A benchmark mail.", 'priority': 'low'}
+                              for message_id in ids])
+
+    def setup_mail_summary():
+        unread = sum(1 for message in env.server.mailbox.messages.values() if 'UNREAD' in message['labelIds'])
+        if unread < 20:
+            env.add_mail(20 - unread)
+        env.use_script([[tool_call('summarize_unread_emails', max_emails=20)], "Here is your inbox summary."],
+                       structured=summarize_all)
+
+    async def run_mention(text):
+        message = env.mention(text)
+        await env.invoker.handle_mention(message)
+        return 1
+
+    def mail_setup(count):
+        def _setup():
+            env.reset_tracker_to_now()
+            env.add_mail(count)
+        return _setup
+
+    async def run_webhook(count):
+        fake_bot = FakeBot(env.discord, env.owner, asyncio.get_running_loop())
+        env.webserver.discord_bot_instance = fake_bot
+        await env.webserver.process_gmail_notification_async(env.server.mailbox.email_address,
+                                                             env.server.mailbox.history_id)
+        await env.mail_delivery.get_worker(fake_bot).wait_idle()
+        return count
+
+    async def run_initial_sync(count):
+        fake_bot = FakeBot(env.discord, env.owner, asyncio.get_running_loop())
+        await env.client.AuraBot.run_initial_gmail_sync(fake_bot)
+        await env.mail_delivery.get_worker(fake_bot).wait_idle()
+        return count
+
+    return {
+        'mention_chat': {'iterations': 20, 'setup': setup_chat, 'run': lambda: run_mention("hi there")},
+        'mention_tasks': {'iterations': 20, 'setup': setup_tasks, 'run': lambda: run_mention("what are my tasks?")},
+        'mention_calendar': {'iterations': 20, 'setup': setup_calendar, 'run': lambda: run_mention("what's next on my calendar?")},
+        'mention_free_slots': {'iterations': 20, 'setup': setup_free_slots, 'run': lambda: run_mention("when am I free for half an hour?")},
+        'mention_mail_summary': {'iterations': 10, 'setup': setup_mail_summary, 'run': lambda: run_mention("summarize my unread mail")},
+        'webhook_3_mails': {'iterations': 20, 'setup': mail_setup(3), 'run': lambda: run_webhook(3)},
+        'webhook_50_mails': {'iterations': 5, 'setup': mail_setup(50), 'run': lambda: run_webhook(50)},
+        'initial_sync_200_mails': {'iterations': 3, 'setup': mail_setup(200), 'run': lambda: run_initial_sync(200)},
+    }
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(env: Environment, scenario: dict, iterations: int) -> dict:
+    latencies, items = [], 0
+    google_calls, discord_calls = Counter(), Counter()
+    llm_calls = 0
+
+    for _ in range(iterations):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if scenario.get('setup'):
+                scenario['setup']()
+            env.server.reset_counts()
+            env.discord.reset()
+            model = env.agent_core.model
+            llm_before = getattr(model, 'calls', 0)
+
+            started = time.perf_counter()
+            items += await scenario['run']()
+            latencies.append(time.perf_counter() - started)
+
+        google_calls.update(env.server.calls)
+        discord_calls.update(env.discord.calls)
+        llm_calls += getattr(env.agent_core.model, 'calls', 0) - llm_before
+
+    total_time = sum(latencies)
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+        'throughput_per_s': round(items / total_time, 2) if total_time else 0.0,
+        'google_calls_per_run': round(sum(count for endpoint, count in google_calls.items()
+                                          if not endpoint.endswith('[batched]')) / iterations, 2),
+        'google_calls_by_endpoint': {key: round(value / iterations, 2) for key, value in sorted(google_calls.items())},
+        'discord_calls_per_run': round(sum(discord_calls.values()) / iterations, 2),
+        'llm_calls_per_run': round(llm_calls / iterations, 2),
+    }
+
+
+def print_report(results: dict):
+    header = f"{'scenario':<26}{'p50 ms':>10}{'p95 ms':>10}{'items/s':>10}{'google':>9}{'discord':>9}{'llm':>6}"
+    print(header)
+    print('-' * len(header))
+    for name, result in results.items():
+        print(f"{name:<26}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['throughput_per_s']:>10.1f}"
+              f"{result['google_calls_per_run']:>9.1f}{result['discord_calls_per_run']:>9.1f}{result['llm_calls_per_run']:>6.1f}")
+    print("\nGoogle API calls per run by endpoint:")
+    for name, result in results.items():
+        calls = ", ".join(f"{endpoint} x{count:g}" for endpoint, count in result['google_calls_by_endpoint'].items())
+        print(f"  {name}: {calls or 'none'}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Latency may grow by at most `tolerance` (a ratio); API call counts may not
+    grow at all, since they are deterministic.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            if base[key] and result[key] > base[key] * tolerance:
+                regressions.append(f"{name}: {key} {result[key]:.1f} > {base[key]:.1f} x {tolerance}")
+        for key in ('google_calls_per_run', 'discord_calls_per_run', 'llm_calls_per_run'):
+            if result[key] > base[key]:
+                regressions.append(f"{name}: {key} {result[key]:g} > {base[key]:g}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmarks for Aura.")
+    parser.add_argument('--scenario', action='append', help="Run only this scenario (repeatable).")
+    parser.add_argument('--iterations', type=int, help="Override the iteration count of every scenario.")
+    parser.add_argument('--google-latency', type=float, default=0.02, help="Seconds added to each fake Google call.")
+    parser.add_argument('--llm-latency', type=float, default=0.2, help="Seconds added to each fake Gemini call.")
+    parser.add_argument('--discord-latency', type=float, default=0.05, help="Seconds added to each fake Discord call.")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, help="Write results as the new baseline.")
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, help="Compare against a baseline file.")
+    parser.add_argument('--tolerance', type=float, default=1.5, help="Allowed latency ratio vs. the baseline.")
+    args = parser.parse_args()
+
+    # The environment changes into a scratch directory; resolve paths first.
+    args.save_baseline = os.path.abspath(args.save_baseline) if args.save_baseline else None
+    args.compare = os.path.abspath(args.compare) if args.compare else None
+
+    env = Environment(args.google_latency, args.llm_latency, args.discord_latency)
+    try:
+        scenarios = build_scenarios(env)
+        selected = args.scenario or list(scenarios)
+        unknown = [name for name in selected if name not in scenarios]
+        if unknown:
+            parser.error(f"Unknown scenario(s): {', '.join(unknown)}. Available: {', '.join(scenarios)}")
+
+        async def run_all():
+            results = {}
+            for name in selected:
+                results[name] = await run_scenario(env, scenarios[name], args.iterations or scenarios[name]['iterations'])
+            return results
+
+        results = asyncio.run(run_all())
+    finally:
+        env.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
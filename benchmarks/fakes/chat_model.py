@@ -0,0 +1,66 @@
+# File: benchmarks/fakes/chat_model.py
+#
+# A scripted stand-in for ChatGoogleGenerativeAI. Each scenario supplies the
+# AI turns to play back; tool calls are executed for real by the graph.
+
+import time
+import uuid
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+
+def tool_call(name: str, **args) -> dict:
+    return {'name': name, 'args': args, 'id': f"call_{uuid.uuid4().hex[:8]}", 'type': 'tool_call'}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Plays back a fixed list of turns. Turn N is returned for the Nth model
+    call after the latest human message, so one script serves any number of
+    runs. A turn is either a final text answer (str) or a list of tool calls.
+    `structured(schema, prompt)` builds the answers for with_structured_output.
+    """
+    turns: list[Any]
+    latency: float = 0.0
+    calls: int = 0
+    structured: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        def _answer(prompt):
+            self.calls += 1
+            if self.latency:
+                time.sleep(self.latency)
+            return self.structured(schema, str(prompt))
+        return RunnableLambda(_answer)
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        last_human = max(index for index, message in enumerate(messages) if isinstance(message, HumanMessage))
+        step = sum(1 for message in messages[last_human:] if isinstance(message, AIMessage))
+        turn = self.turns[min(step, len(self.turns) - 1)]
+
+        prompt_tokens = sum(len(str(message.content)) // 4 for message in messages)
+        if isinstance(turn, str):
+            message = AIMessage(content=turn)
+        else:
+            message = AIMessage(content="", tool_calls=list(turn))
+        message.usage_metadata = {
+            'input_tokens': prompt_tokens,
+            'output_tokens': len(str(turn)) // 4,
+            'total_tokens': prompt_tokens + len(str(turn)) // 4,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
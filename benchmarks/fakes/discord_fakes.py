@@ -0,0 +1,124 @@
+# File: benchmarks/fakes/discord_fakes.py
+#
+# Minimal stand-ins for the discord.py objects touched by handle_mention,
+# the webhook path and the initial sync.
+
+import asyncio
+from collections import Counter
+
+
+class FakeDiscordAPI:
+    """Counts outgoing Discord calls and adds a fixed latency to each."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self.sent: list[dict] = []
+        self.bot_user_id = 999
+
+    async def call(self, kind: str, **payload):
+        self.calls[kind] += 1
+        self.sent.append(dict(payload, kind=kind))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def reset(self):
+        self.calls.clear()
+        self.sent.clear()
+
+
+class _Author:
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+
+class _SentMessage:
+    def __init__(self, author_id: int, content, embeds: list):
+        self.author = _Author(author_id)
+        self.content = content
+        self.embeds = embeds
+
+
+class FakeUser:
+    def __init__(self, api: FakeDiscordAPI, user_id: int, name: str = "user"):
+        self.api = api
+        self.id = user_id
+        self.name = name
+        self.bot = False
+        self.dms: list[_SentMessage] = []
+
+    async def send(self, content=None, **kwargs):
+        await self.api.call('dm', content=content, embeds=len(kwargs.get('embeds') or []))
+        self.dms.append(_SentMessage(self.api.bot_user_id, content, kwargs.get('embeds') or []))
+
+    async def history(self, limit=100):
+        """DMs sent to this user by the bot, newest first."""
+        for message in list(reversed(self.dms))[:limit]:
+            yield message
+
+    def mentioned_in(self, message) -> bool:
+        return f"<@{self.id}>" in message.content
+
+
+class _Typing:
+    def __init__(self, api: FakeDiscordAPI):
+        self.api = api
+
+    async def __aenter__(self):
+        await self.api.call('typing')
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeChannel:
+    def __init__(self, api: FakeDiscordAPI, channel_id: int = 1):
+        self.api = api
+        self.id = channel_id
+
+    def typing(self):
+        return _Typing(self.api)
+
+    async def send(self, content=None, **kwargs):
+        await self.api.call('channel_send', content=content)
+
+
+class FakeGuild:
+    def __init__(self, me: FakeUser):
+        self.me = me
+
+
+class FakeMessage:
+    def __init__(self, api: FakeDiscordAPI, content: str, author: FakeUser, channel: FakeChannel, guild: FakeGuild):
+        self.api = api
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = guild
+        self.replies: list[str] = []
+
+    async def reply(self, content=None, **kwargs):
+        self.replies.append(content)
+        await self.api.call('reply', content=content)
+
+    async def add_reaction(self, emoji):
+        await self.api.call('reaction', emoji=emoji)
+
+    async def remove_reaction(self, emoji, member):
+        await self.api.call('remove_reaction', emoji=emoji)
+
+
+class FakeBot:
+    """Just enough of AuraBot for the Gmail sync paths."""
+
+    def __init__(self, api: FakeDiscordAPI, owner: FakeUser, loop: asyncio.AbstractEventLoop):
+        self.api = api
+        self.owner = owner
+        self.loop = loop
+        self.user = FakeUser(api, api.bot_user_id, "Aura")
+
+    def get_user(self, user_id):
+        return self.owner
+
+    async def wait_until_ready(self):
+        return None
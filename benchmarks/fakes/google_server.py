@@ -0,0 +1,465 @@
+# File: benchmarks/fakes/google_server.py
+#
+# A local stand-in for the Gmail and Calendar REST endpoints used in
+# src/agent/tools/. Point the bot at it with GOOGLE_API_ROOT_URL.
+
+import base64
+import datetime
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from email import message_from_bytes
+from email.message import EmailMessage
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+EMAIL_ADDRESS = "owner@example.com"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+class FakeMailbox:
+    """In-memory Gmail mailbox with a history log."""
+
+    def __init__(self, email_address: str = EMAIL_ADDRESS, start_history_id: int = 1000):
+        self.email_address = email_address
+        self.history_id = start_history_id
+        self.messages: dict[str, dict] = {}
+        self.history: list[dict] = []
+        self.lock = threading.Lock()
+
+    def add_message(self, subject: str, sender: str, body: str = "Hello!", thread_id: str | None = None,
+                    labels: tuple = ('INBOX', 'UNREAD'), attachment_bytes: int = 0) -> dict:
+        with self.lock:
+            self.history_id += 1
+            message_id = uuid.uuid4().hex[:16]
+            message = {
+                'id': message_id,
+                'threadId': thread_id or message_id,
+                'labelIds': list(labels),
+                'historyId': str(self.history_id),
+                'internalDate': str(int(time.time() * 1000)),
+                'snippet': body[:100],
+                'subject': subject,
+                'sender': sender,
+                'body': body,
+                'attachment_bytes': attachment_bytes,
+            }
+            self.messages[message_id] = message
+            self.history.append({
+                'id': str(self.history_id),
+                'messages': [{'id': message_id, 'threadId': message['threadId']}],
+                'messagesAdded': [{'message': {'id': message_id, 'threadId': message['threadId'], 'labelIds': list(labels)}}],
+            })
+            return message
+
+    def delete_message(self, message_id: str):
+        with self.lock:
+            message = self.messages.pop(message_id)
+            self.history_id += 1
+            self.history.append({
+                'id': str(self.history_id),
+                'messages': [{'id': message_id, 'threadId': message['threadId']}],
+                'messagesDeleted': [{'message': {'id': message_id, 'threadId': message['threadId'],
+                                                 'labelIds': message['labelIds']}}],
+            })
+
+    def headers(self, message: dict) -> list[dict]:
+        return [
+            {'name': 'Subject', 'value': message['subject']},
+            {'name': 'From', 'value': message['sender']},
+            {'name': 'To', 'value': self.email_address},
+            {'name': 'Delivered-To', 'value': self.email_address},
+            {'name': 'Date', 'value': datetime.datetime.fromtimestamp(int(message['internalDate']) / 1000).strftime('%a, %d %b %Y %H:%M:%S +0000')},
+        ]
+
+    def to_mime(self, message: dict) -> EmailMessage:
+        mime = EmailMessage()
+        for header in self.headers(message):
+            mime[header['name']] = header['value']
+        mime.set_content(message['body'])
+        if message['attachment_bytes']:
+            mime.add_attachment(b'\0' * message['attachment_bytes'], maintype='application',
+                                subtype='octet-stream', filename='attachment.bin')
+        return mime
+
+    def render(self, message: dict, fmt: str, metadata_headers: list[str]) -> dict:
+        resource = {key: message[key] for key in ('id', 'threadId', 'labelIds', 'historyId', 'internalDate', 'snippet')}
+        if fmt == 'minimal':
+            return resource
+        if fmt == 'raw':
+            resource['raw'] = _b64(self.to_mime(message).as_bytes())
+            return resource
+
+        headers = self.headers(message)
+        if fmt == 'metadata':
+            if metadata_headers:
+                headers = [header for header in headers if header['name'] in metadata_headers]
+            resource['payload'] = {'mimeType': 'multipart/mixed', 'headers': headers}
+            return resource
+
+        body_bytes = message['body'].encode('utf-8')
+        parts = [{
+            'partId': '0', 'mimeType': 'text/plain', 'filename': '',
+            'headers': [{'name': 'Content-Type', 'value': 'text/plain; charset="utf-8"'}],
+            'body': {'size': len(body_bytes), 'data': _b64(body_bytes)},
+        }]
+        if message['attachment_bytes']:
+            parts.append({
+                'partId': '1', 'mimeType': 'application/octet-stream', 'filename': 'attachment.bin',
+                'headers': [{'name': 'Content-Disposition', 'value': 'attachment; filename="attachment.bin"'}],
+                'body': {'size': message['attachment_bytes'], 'attachmentId': f"att-{message['id']}"},
+            })
+        resource['payload'] = {'partId': '', 'mimeType': 'multipart/mixed', 'headers': headers, 'body': {'size': 0}, 'parts': parts}
+        return resource
+
+
+class FakeCalendar:
+    """In-memory primary calendar."""
+
+    def __init__(self):
+        self.events: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def add_event(self, summary: str, start: datetime.datetime, duration_minutes: int = 60) -> dict:
+        with self.lock:
+            event_id = uuid.uuid4().hex[:20]
+            event = {
+                'id': event_id,
+                'summary': summary,
+                'status': 'confirmed',
+                'htmlLink': f"https://calendar.example.com/event?eid={event_id}",
+                'start': {'dateTime': start.isoformat()},
+                'end': {'dateTime': (start + datetime.timedelta(minutes=duration_minutes)).isoformat()},
+            }
+            self.events[event_id] = event
+            return event
+
+    def upcoming(self, time_min: str | None, time_max: str | None, max_results: int) -> list[dict]:
+        def start_of(event):
+            return datetime.datetime.fromisoformat(event['start']['dateTime'].replace('Z', '+00:00'))
+
+        lower = datetime.datetime.fromisoformat(time_min.replace('Z', '+00:00')) if time_min else None
+        upper = datetime.datetime.fromisoformat(time_max.replace('Z', '+00:00')) if time_max else None
+        events = sorted(self.events.values(), key=start_of)
+        if lower:
+            events = [event for event in events if start_of(event) >= lower]
+        if upper:
+            events = [event for event in events if start_of(event) < upper]
+        return events[:max_results]
+
+    def busy(self, time_min: str, time_max: str) -> list[dict]:
+        def parse(value):
+            return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+        lower, upper = parse(time_min), parse(time_max)
+        with self.lock:
+            events = list(self.events.values())
+        blocks = []
+        for event in events:
+            start, end = parse(event['start']['dateTime']), parse(event['end']['dateTime'])
+            if start < upper and end > lower:
+                blocks.append({'start': max(start, lower).isoformat(), 'end': min(end, upper).isoformat()})
+        return sorted(blocks, key=lambda block: parse(block['start']))
+
+
+class FakeGoogleServer:
+    """
+    Serves the fake mailbox and calendar over HTTP and counts calls per
+    endpoint. `latency` seconds are added to every request to mimic network.
+    """
+
+    HISTORY_PAGE_SIZE = 100
+    HISTORY_KEYS = {'messagesAdded': 'messageAdded', 'messagesDeleted': 'messageDeleted',
+                    'labelsAdded': 'labelAdded', 'labelsRemoved': 'labelRemoved'}
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.02):
+        self.mailbox = FakeMailbox()
+        self.calendar = FakeCalendar()
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self.faults: dict[str, list[tuple[int, float | None]]] = {}
+        self._calls_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def root_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> 'FakeGoogleServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def reset_counts(self):
+        with self._calls_lock:
+            self.calls.clear()
+
+    def inject_failures(self, label: str, status: int = 503, count: int = 1, retry_after: float | None = None):
+        """Makes the next `count` calls to the route `label` fail with `status`."""
+        with self._calls_lock:
+            self.faults.setdefault(label, []).extend([(status, retry_after)] * count)
+
+    def _take_fault(self, label: str) -> tuple[int, dict] | None:
+        with self._calls_lock:
+            faults = self.faults.get(label)
+            if not faults:
+                return None
+            status, retry_after = faults.pop(0)
+        payload = {'error': {'code': status, 'message': 'Injected failure',
+                             'errors': [{'reason': 'rateLimitExceeded' if status in (403, 429) else 'backendError'}]}}
+        if retry_after is not None:
+            payload['_headers'] = {'Retry-After': str(retry_after)}
+        return status, payload
+
+    def _count(self, endpoint: str):
+        with self._calls_lock:
+            self.calls[endpoint] += 1
+
+    # --- Routing ---
+
+    def handle(self, method: str, path: str, query: dict, body: dict | None, batched: bool = False) -> tuple[int, dict]:
+        # Calls inside a batch request are counted as '<label> [batched]' so
+        # that unsuffixed labels count HTTP round trips.
+        routes = [
+            ('GET', r'^gmail/v1/users/me/profile$', 'gmail.users.getProfile', self._profile),
+            ('GET', r'^gmail/v1/users/me/messages$', 'gmail.users.messages.list', self._messages_list),
+            ('POST', r'^gmail/v1/users/me/messages/batchModify$', 'gmail.users.messages.batchModify', self._messages_batch_modify),
+            ('GET', r'^gmail/v1/users/me/messages/([^/]+)/attachments/([^/]+)$', 'gmail.users.messages.attachments.get', self._attachment_get),
+            ('GET', r'^gmail/v1/users/me/messages/([^/]+)$', 'gmail.users.messages.get', self._messages_get),
+            ('POST', r'^gmail/v1/users/me/messages/([^/]+)/modify$', 'gmail.users.messages.modify', self._messages_modify),
+            ('GET', r'^gmail/v1/users/me/history$', 'gmail.users.history.list', self._history_list),
+            ('POST', r'^gmail/v1/users/me/watch$', 'gmail.users.watch', self._watch),
+            ('POST', r'^gmail/v1/users/me/stop$', 'gmail.users.stop', self._stop),
+            ('GET', r'^calendar/v3/users/me/calendarList$', 'calendar.calendarList.list', self._calendar_list),
+            ('GET', r'^calendar/v3/calendars/([^/]+)/events$', 'calendar.events.list', self._events_list),
+            ('POST', r'^calendar/v3/calendars/([^/]+)/events$', 'calendar.events.insert', self._events_insert),
+            ('GET', r'^calendar/v3/calendars/([^/]+)/events/([^/]+)$', 'calendar.events.get', self._events_get),
+            ('PUT', r'^calendar/v3/calendars/([^/]+)/events/([^/]+)$', 'calendar.events.update', self._events_update),
+            ('POST', r'^calendar/v3/freeBusy$', 'calendar.freebusy.query', self._freebusy),
+        ]
+        for route_method, pattern, label, handler in routes:
+            match = re.match(pattern, path)
+            if route_method == method and match:
+                self._count(f"{label} [batched]" if batched else label)
+                fault = self._take_fault(label)
+                if fault:
+                    return fault
+                return handler(query, body, *match.groups())
+        self._count(f"unknown {method} {path}")
+        return 404, {'error': {'code': 404, 'message': f'No fake route for {method} {path}'}}
+
+    def handle_batch(self, content_type: str, raw_body: bytes) -> tuple[str, bytes]:
+        """
+        Serves a multipart/mixed batch request by dispatching each embedded HTTP
+        request through handle(). Returns the response content type and body.
+        """
+        self._count('batch')
+        envelope = message_from_bytes(f"Content-Type: {content_type}\r\n\r\n".encode() + raw_body)
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for part in envelope.get_payload():
+            request_line, _, rest = part.get_payload().partition('\n')
+            method, url, _ = request_line.strip().split(' ', 2)
+            _, _, body_text = rest.replace('\r\n', '\n').partition('\n\n')
+            parsed = urlparse(url)
+            body = json.loads(body_text) if body_text.strip() else None
+            status, payload = self.handle(method, parsed.path.lstrip('/'), parse_qs(parsed.query), body, batched=True)
+
+            content_id = (part['Content-ID'] or '').strip('<>')
+            extra_headers = ''.join(f"{name}: {value}\r\n" for name, value in payload.pop('_headers', {}).items())
+            data = json.dumps(payload)
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} OK\r\nContent-Type: application/json; charset=UTF-8\r\n{extra_headers}"
+                f"Content-Length: {len(data)}\r\n\r\n{data}\r\n"
+            )
+        body = ''.join(parts) + f"--{boundary}--\r\n"
+        return f'multipart/mixed; boundary={boundary}', body.encode('utf-8')
+
+    # --- Gmail ---
+
+    def _profile(self, query, body):
+        return 200, {'emailAddress': self.mailbox.email_address, 'historyId': str(self.mailbox.history_id),
+                     'messagesTotal': len(self.mailbox.messages)}
+
+    def _messages_list(self, query, body):
+        label_ids = query.get('labelIds', [])
+        max_results = int(query.get('maxResults', ['100'])[0])
+        messages = [m for m in reversed(list(self.mailbox.messages.values()))
+                    if all(label in m['labelIds'] for label in label_ids)]
+        page = [{'id': m['id'], 'threadId': m['threadId']} for m in messages[:max_results]]
+        return 200, {'messages': page, 'resultSizeEstimate': len(messages)} if page else {'resultSizeEstimate': 0}
+
+    def _messages_get(self, query, body, message_id):
+        message = self.mailbox.messages.get(message_id)
+        if not message:
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        fmt = query.get('format', ['full'])[0]
+        return 200, self.mailbox.render(message, fmt, query.get('metadataHeaders', []))
+
+    def _attachment_get(self, query, body, message_id, attachment_id):
+        message = self.mailbox.messages.get(message_id)
+        if not message or not message['attachment_bytes']:
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        return 200, {'size': message['attachment_bytes'], 'data': _b64(b'\0' * message['attachment_bytes'])}
+
+    def _apply_label_changes(self, message_ids, body):
+        with self.mailbox.lock:
+            for message_id in message_ids:
+                message = self.mailbox.messages.get(message_id)
+                if not message:
+                    continue
+                labels = [label for label in message['labelIds'] if label not in body.get('removeLabelIds', [])]
+                labels += [label for label in body.get('addLabelIds', []) if label not in labels]
+                message['labelIds'] = labels
+
+    def _messages_modify(self, query, body, message_id):
+        if message_id not in self.mailbox.messages:
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        self._apply_label_changes([message_id], body or {})
+        return 200, self.mailbox.render(self.mailbox.messages[message_id], 'minimal', [])
+
+    def _messages_batch_modify(self, query, body):
+        body = body or {}
+        if len(body.get('ids', [])) > 1000:
+            return 400, {'error': {'code': 400, 'message': 'Too many ids'}}
+        self._apply_label_changes(body.get('ids', []), body)
+        return 204, {}
+
+    def _history_list(self, query, body):
+        start = int(query['startHistoryId'][0])
+        history_types = query.get('historyTypes', [])
+        label_id = query.get('labelId', [None])[0]
+        offset = int(query.get('pageToken', ['0'])[0] or 0)
+        max_results = int(query.get('maxResults', [str(self.HISTORY_PAGE_SIZE)])[0])
+
+        records = [record for record in self.mailbox.history if int(record['id']) > start]
+        if history_types:
+            records = [record for record in records
+                       if any(key in record for key, history_type in self.HISTORY_KEYS.items() if history_type in history_types)]
+        if label_id:
+            records = [record for record in records
+                       if any(label_id in item['message'].get('labelIds', [])
+                              for key in self.HISTORY_KEYS for item in record.get(key, []))]
+
+        page = records[offset:offset + max_results]
+        response = {'historyId': str(self.mailbox.history_id)}
+        if page:
+            response['history'] = page
+        if offset + max_results < len(records):
+            response['nextPageToken'] = str(offset + max_results)
+        return 200, response
+
+    def _watch(self, query, body):
+        expiration = int((time.time() + 7 * 24 * 3600) * 1000)
+        return 200, {'historyId': str(self.mailbox.history_id), 'expiration': str(expiration)}
+
+    def _stop(self, query, body):
+        return 204, {}
+
+    # --- Calendar ---
+
+    def _calendar_list(self, query, body):
+        return 200, {'items': [{'id': 'primary', 'summary': self.mailbox.email_address, 'primary': True}]}
+
+    def _events_list(self, query, body, calendar_id):
+        max_results = int(query.get('maxResults', ['250'])[0])
+        items = self.calendar.upcoming(query.get('timeMin', [None])[0], query.get('timeMax', [None])[0], max_results)
+        return 200, {'kind': 'calendar#events', 'items': items}
+
+    def _events_insert(self, query, body, calendar_id):
+        body = body or {}
+        start = datetime.datetime.fromisoformat(body['start']['dateTime'].replace('Z', '+00:00'))
+        end = datetime.datetime.fromisoformat(body['end']['dateTime'].replace('Z', '+00:00'))
+        event = self.calendar.add_event(body.get('summary', ''), start, int((end - start).total_seconds() // 60))
+        event.update({key: value for key, value in body.items() if key not in ('start', 'end')})
+        return 200, event
+
+    def _events_get(self, query, body, calendar_id, event_id):
+        event = self.calendar.events.get(event_id)
+        if not event:
+            return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+        return 200, event
+
+    def _events_update(self, query, body, calendar_id, event_id):
+        if event_id not in self.calendar.events:
+            return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+        event = dict(body or {}, id=event_id)
+        self.calendar.events[event_id] = event
+        return 200, event
+
+    def _freebusy(self, query, body):
+        body = body or {}
+        busy = self.calendar.busy(body['timeMin'], body['timeMax'])
+        calendars = {}
+        for item in body.get('items', []):
+            if item['id'] == 'primary':
+                calendars[item['id']] = {'busy': busy}
+            else:
+                calendars[item['id']] = {'busy': [], 'errors': [{'domain': 'global', 'reason': 'notFound'}]}
+        return 200, {'kind': 'calendar#freeBusy', 'timeMin': body['timeMin'], 'timeMax': body['timeMax'],
+                     'calendars': calendars}
+
+    # --- HTTP plumbing ---
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self, method):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                raw_body = self.rfile.read(length) if length else b''
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if parsed.path.lstrip('/') == 'batch':
+                    content_type, data = server.handle_batch(self.headers.get('Content-Type', ''), raw_body)
+                    self.send_response(200)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+
+                body = json.loads(raw_body) if raw_body and 'json' in (self.headers.get('Content-Type') or '') else None
+                status, payload = server.handle(method, parsed.path.lstrip('/'), parse_qs(parsed.query), body)
+
+                extra_headers = payload.pop('_headers', {})
+                data = json.dumps(payload).encode('utf-8') if status != 204 else b''
+                self.send_response(status)
+                for name, value in extra_headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+            def do_PUT(self):
+                self._dispatch('PUT')
+
+        return Handler
@@ -0,0 +1,136 @@
+# File: benchmarks/startup_benchmark.py
+#
+# Measures what it costs to import the bot entry point, using
+# `python -X importtime`, and checks that the agent stack stays out of it.
+#
+# Usage: python benchmarks/startup_benchmark.py [--budget-ms 1500] [--top 15] [--runs 3]
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# The module whose import cost is bounded: everything needed to connect to Discord.
+ENTRY_MODULE = "src.bot.client"
+
+# Packages that must only be imported on first use of the agent, never at startup.
+FORBIDDEN_PREFIXES = (
+    "langchain",
+    "langchain_core",
+    "langchain_google_genai",
+    "langgraph",
+    "google.genai",
+    "google.generativeai",
+    "google.ai.generativelanguage",
+    "src.agent.graph",
+)
+
+# Files that must not be written as an import side effect.
+SIDE_EFFECT_FILES = ("models.json", "aura.db")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def run_importtime(module: str) -> tuple[list[dict], str]:
+    """
+    Imports `module` in a fresh interpreter with -X importtime and returns the
+    parsed entries plus the working directory it ran in.
+    """
+    # Run from an empty directory so import-time file writes are detectable.
+    workdir = tempfile.mkdtemp(prefix="aura-startup-")
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=workdir, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        entries.append({
+            "module": name,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": len(indent) // 2,
+        })
+    return entries, workdir
+
+
+def summarize(entries: list[dict], top: int) -> dict:
+    total_us = sum(entry["self_us"] for entry in entries)
+
+    by_package: dict[str, int] = {}
+    for entry in entries:
+        package = entry["module"].split('.')[0]
+        by_package[package] = by_package.get(package, 0) + entry["self_us"]
+
+    forbidden = sorted({
+        entry["module"] for entry in entries
+        if any(entry["module"] == prefix or entry["module"].startswith(prefix + '.') for prefix in FORBIDDEN_PREFIXES)
+    })
+
+    return {
+        "total_ms": total_us / 1000,
+        "module_count": len(entries),
+        "top_packages": sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top],
+        "top_modules": sorted(entries, key=lambda entry: entry["cumulative_us"], reverse=True)[:top],
+        "forbidden": forbidden,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time report and startup budget check for Aura.")
+    parser.add_argument("--module", default=ENTRY_MODULE)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Fail if the median import time exceeds this.")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    summaries = []
+    side_effects = set()
+    for _ in range(args.runs):
+        entries, workdir = run_importtime(args.module)
+        summaries.append(summarize(entries, args.top))
+        side_effects.update(name for name in SIDE_EFFECT_FILES if os.path.exists(os.path.join(workdir, name)))
+
+    summaries.sort(key=lambda summary: summary["total_ms"])
+    median = summaries[len(summaries) // 2]
+
+    print(f"=== Import-time report for {args.module} ({args.runs} runs) ===")
+    print(f"Median total: {median['total_ms']:.1f} ms across {median['module_count']} modules "
+          f"(min {summaries[0]['total_ms']:.1f} ms, max {summaries[-1]['total_ms']:.1f} ms)")
+    print("\nTop packages by self time:")
+    for package, self_us in median["top_packages"]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+    print("\nTop modules by cumulative time:")
+    for entry in median["top_modules"]:
+        print(f"  {entry['cumulative_us'] / 1000:8.1f} ms  {entry['module']}")
+
+    failures = []
+    if median["forbidden"]:
+        failures.append(f"agent stack imported at startup: {', '.join(median['forbidden'][:10])}")
+    if side_effects:
+        failures.append(f"import wrote files: {', '.join(sorted(side_effects))}")
+    if median["total_ms"] > args.budget_ms:
+        failures.append(f"median import time {median['total_ms']:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1
+    print(f"PASS: startup import within {args.budget_ms:.0f} ms budget, no agent stack, no side effects.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
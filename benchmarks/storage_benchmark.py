@@ -0,0 +1,139 @@
+# File: benchmarks/storage_benchmark.py
+#
+# Compares the storage backends (src/core/storage.py) on Aura's workload: task
+# records written and read one at a time, pages of a filtered collection, and
+# the Gmail tracker document with its 5000 processed message IDs. Counts are
+# measured both right after a write and when served from the cache. Reports
+# per-operation p50/p95 latency and the size on disk for each collection size.
+#
+# Usage: python benchmarks/storage_benchmark.py [--sizes 100,1000,10000] [--backends memory,json,sqlite] [--ops 100]
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core import storage  # noqa: E402
+
+COLLECTION = "tasks"
+DOCUMENT = "gmail_history"
+PAGE_SIZE = 10
+
+
+def make_task(index: int) -> tuple[str, dict]:
+    task_id = uuid.uuid4().hex[:8]
+    return task_id, {
+        "id": task_id,
+        "description": f"Follow up on item {index} with the team before the weekly review",
+        "status": "completed" if index % 3 else "pending",
+        "created_at": "2026-10-19T09:30:00.000000",
+    }
+
+
+def make_tracker() -> dict:
+    return {
+        "last_history_id": 123456789,
+        "email_address": "someone@example.com",
+        "processed_message_ids": [f"{random.getrandbits(64):016x}" for _ in range(5000)],
+        "watch_expiration": 1760000000000,
+    }
+
+
+def disk_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def time_ops(func, count: int) -> list[float]:
+    samples = []
+    for i in range(count):
+        started = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def time_cold_counts(store, collection: str, tasks: list, count: int) -> list[float]:
+    # Every write invalidates the cached count, so each timed count is computed from scratch.
+    samples = []
+    for i in range(count):
+        store.put_record(collection, *tasks[i])
+        started = time.perf_counter()
+        store.count_records(collection, where={"status": "pending"})
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def bench_backend(kind: str, size: int, ops: int) -> dict:
+    directory = tempfile.mkdtemp(prefix=f"aura-storage-{kind}-")
+    store = storage.open_store(kind, directory)
+    try:
+        items = [make_task(i) for i in range(size)]
+        store.replace_records(COLLECTION, items)
+        keys = [key for key, _ in items]
+        pending = store.count_records(COLLECTION, where={"status": "pending"})
+        tracker = make_tracker()
+        store.save(DOCUMENT, tracker)
+
+        new_tasks = [make_task(size + i) for i in range(2 * ops)]
+        results = {
+            "put_new": time_ops(lambda i: store.put_record(COLLECTION, *new_tasks[i]), ops),
+            "get": time_ops(lambda i: store.get_record(COLLECTION, random.choice(keys)), ops),
+            "update": time_ops(lambda i: store.put_record(COLLECTION, items[i % size][0],
+                                                          dict(items[i % size][1], status="completed")), ops),
+            "page": time_ops(lambda i: store.list_records(
+                COLLECTION, where={"status": "pending"},
+                offset=random.randrange(max(1, pending - PAGE_SIZE)), limit=PAGE_SIZE), ops),
+            "count": time_cold_counts(store, COLLECTION, new_tasks[ops:], ops),
+            "count_cached": time_ops(lambda i: store.count_records(COLLECTION, where={"status": "pending"}), ops),
+            "doc_load": time_ops(lambda i: store.load(DOCUMENT), ops),
+            "doc_save": time_ops(lambda i: store.save(DOCUMENT, tracker), ops),
+        }
+        store.close()
+        return {
+            "latency": {op: (statistics.median(samples), sorted(samples)[int(len(samples) * 0.95) - 1])
+                        for op, samples in results.items()},
+            "disk_bytes": disk_size(directory) if kind != storage.MemoryBackend.kind else 0,
+        }
+    finally:
+        store.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Latency and size comparison of Aura's storage backends.")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated collection sizes.")
+    parser.add_argument("--backends", default=",".join(storage.BACKENDS), help="Comma-separated backends.")
+    parser.add_argument("--ops", type=int, default=100, help="Timed operations per measurement.")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    backends = [kind.strip() for kind in args.backends.split(",") if kind.strip()]
+    unknown = [kind for kind in backends if kind not in storage.BACKENDS]
+    if unknown:
+        parser.error(f"unknown backend(s): {', '.join(unknown)}")
+
+    print(f"=== Storage backends: {args.ops} ops per measurement, page size {PAGE_SIZE}, p50/p95 in ms ===")
+    ops_names = ("put_new", "get", "update", "page", "count", "count_cached", "doc_load", "doc_save")
+    header = f"{'backend':<8} {'records':>8} " + " ".join(f"{name:>15}" for name in ops_names) + f" {'disk':>10}"
+    print(header)
+    print("-" * len(header))
+    for size in sizes:
+        for kind in backends:
+            result = bench_backend(kind, size, args.ops)
+            cells = " ".join(f"{p50:>7.3f}/{p95:<7.3f}" for p50, p95 in (result["latency"][name] for name in ops_names))
+            disk = f"{result['disk_bytes'] / 1024:.0f} KiB" if result["disk_bytes"] else "-"
+            print(f"{kind:<8} {size:>8} {cells} {disk:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
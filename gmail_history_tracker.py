@@ -1,63 +1,149 @@
 # File: gmail_history_tracker.py
 
-import json
-import os
-import asyncio # <-- ADD THIS IMPORT
+import threading
+import time
 
-HISTORY_FILE = "gmail_history.json"
-GMAIL_PROCESSING_LOCK = asyncio.Lock() # <-- ADD THE SHARED LOCK HERE
+from src.core import storage, user_context
 
-def _load_data() -> dict:
-    if not os.path.exists(HISTORY_FILE):
+# Each user's tracker is a document in their own store (see src/core/storage.py).
+# Syncs of a mailbox are serialized by its MailboxSequencer (src/bot/mail_sequencer.py).
+HISTORY_DOCUMENT = storage.register_document("gmail_history")
+
+# Which user tracks which address. Filled by scanning every user's tracker,
+# which is slow, so an address nobody tracks is remembered as unknown for
+# UNKNOWN_ADDRESS_TTL_SECONDS (or until someone starts tracking it) instead of
+# being scanned for on every notification. Storage executor threads and the
+# webhook read and change these together, so they are guarded by one lock.
+UNKNOWN_ADDRESS_TTL_SECONDS = 300
+_users_by_email: dict[str, int] = {}
+_unknown_addresses: dict[str, float] = {}
+_addresses_changed = 0
+_addresses_lock = threading.Lock()
+
+def find_user_by_email_address(email_address: str) -> int | None:
+    """
+    The Discord user whose tracked mailbox is email_address, or None if nobody's is.
+    Blocking: on a cache miss every user's tracker is loaded.
+    """
+    email_address = (email_address or '').lower()
+    with _addresses_lock:
+        if email_address in _users_by_email:
+            return _users_by_email[email_address]
+        unknown_since = _unknown_addresses.get(email_address)
+        if unknown_since is not None and time.monotonic() - unknown_since < UNKNOWN_ADDRESS_TTL_SECONDS:
+            return None
+        changes_before_scan = _addresses_changed
+
+    found = {}
+    for user_id in user_context.known_user_ids():
+        with user_context.as_user(user_id):
+            tracked = (get_current_email_address() or '').lower()
+        if tracked:
+            found[tracked] = user_id
+
+    with _addresses_lock:
+        # An address set during the scan is newer than what the scan read.
+        if _addresses_changed == changes_before_scan:
+            _users_by_email.update(found)
+        user_id = found.get(email_address)
+        if user_id is None:
+            _unknown_addresses[email_address] = time.monotonic()
+        return user_id
+
+def _normalize(data) -> dict:
+    if not isinstance(data, dict):
         return {
             'last_history_id': None,
             'email_address': None,
             'processed_message_ids': []
         }
+    # Ensure processed_message_ids is a list and capped at 5000 entries
+    processed_ids = data.get('processed_message_ids', [])
+    if not isinstance(processed_ids, list):
+        processed_ids = [] # Reset if data is corrupt
+    data['processed_message_ids'] = list(dict.fromkeys(processed_ids))[-5000:]
+    return data
+
+def _load_data() -> dict:
     try:
-        with open(HISTORY_FILE, 'r') as f:
-            data = json.load(f)
-            # Ensure processed_message_ids is a list and capped at 5000 entries
-            processed_ids = data.get('processed_message_ids', [])
-            if not isinstance(processed_ids, list):
-                processed_ids = [] # Reset if data is corrupt
-            data['processed_message_ids'] = list(set(processed_ids))[-5000:]
-            return data
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {
-            'last_history_id': None,
-            'email_address': None,
-            'processed_message_ids': []
-        }
+        data = storage.get_store().load(HISTORY_DOCUMENT)
+    except storage.StorageError as e:
+        print(f"TRACKER WARNING: {e}. Starting from an empty tracker.")
+        data = None
+    return _normalize(data)
 
-def _save_data(data: dict):
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
+def _update_data(change) -> dict:
+    """Applies change(data) to the tracker as one read-modify-write under the store's lock."""
+    def apply(data):
+        data = _normalize(data)
+        change(data)
+        return data
+
+    store = storage.get_store()
+    try:
+        return store.update(HISTORY_DOCUMENT, apply)
+    except storage.StorageError as e:
+        print(f"TRACKER WARNING: {e}. Starting from an empty tracker.")
+        data = apply(None)
+        store.save(HISTORY_DOCUMENT, data)
+        return data
 
 def get_last_history_id() -> int | None:
     return _load_data().get('last_history_id')
 
 def set_last_history_id(history_id: int):
-    data = _load_data()
-    data['last_history_id'] = history_id
-    _save_data(data)
+    _update_data(lambda data: data.update(last_history_id=history_id))
     print(f"TRACKER: History ID saved: {history_id}") # Add confirmation log
 
 def get_current_email_address() -> str | None:
     return _load_data().get('email_address')
 
 def set_current_email_address(email_address: str):
-    data = _load_data()
-    data['email_address'] = email_address
-    _save_data(data)
+    _update_data(lambda data: data.update(email_address=email_address))
+    global _addresses_changed
+    user_id = user_context.get_user_id()
+    with _addresses_lock:
+        _addresses_changed += 1
+        for known_address in [address for address, owner in _users_by_email.items() if owner == user_id]:
+            del _users_by_email[known_address]
+        if email_address and user_id is not None:
+            _users_by_email[email_address.lower()] = user_id
+            _unknown_addresses.pop(email_address.lower(), None)
 
 def add_processed_message_id(message_id: str):
-    data = _load_data()
-    processed_ids_set = set(data.get('processed_message_ids', []))
-    if message_id not in processed_ids_set:
-        processed_ids_set.add(message_id)
-        data['processed_message_ids'] = list(processed_ids_set)[-5000:]
-        _save_data(data)
+    add_processed_message_ids([message_id])
+
+def add_processed_message_ids(message_ids: list, history_id: int | None = None):
+    """
+    Records a whole batch of processed message IDs with a single write and,
+    if given, advances the history ID in the same write.
+    """
+    new_ids = []
+
+    def record(data):
+        processed_ids = data['processed_message_ids']
+        known_ids = set(processed_ids)
+        new_ids.extend(message_id for message_id in dict.fromkeys(message_ids) if message_id not in known_ids)
+        data['processed_message_ids'] = (processed_ids + new_ids)[-5000:]
+        if history_id is not None:
+            data['last_history_id'] = history_id
+
+    _update_data(record)
+    if history_id is not None:
+        print(f"TRACKER: {len(new_ids)} message IDs recorded, History ID saved: {history_id}")
+
+def get_processed_message_ids() -> set:
+    """All recorded message IDs, for checking many messages against one load of the tracker."""
+    return set(_load_data().get('processed_message_ids', []))
 
 def is_message_processed(message_id: str) -> bool:
-    return message_id in set(_load_data().get('processed_message_ids', []))
\ No newline at end of file
+    return message_id in get_processed_message_ids()
+
+def get_watch_expiration() -> int | None:
+    """Expiration of the active Gmail watch in epoch milliseconds, or None if no watch is active."""
+    return _load_data().get('watch_expiration')
+
+def set_watch_expiration(expiration_ms: int | None):
+    _update_data(lambda data: data.update(watch_expiration=expiration_ms))
+    if expiration_ms is not None:
+        print(f"TRACKER: Gmail watch expiration saved: {expiration_ms}")
@@ -1,41 +1,71 @@
 # File: src/agent/core.py (Simplified and Final)
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+import threading
+
 from src.core import model_manager
 
 # --- Global Model Object ---
+# The model is created lazily on first use so that importing this module does
+# not pull in LangChain/google-genai during bot startup.
 model = None
+_model_loaded = False
+_model_lock = threading.RLock()
+
+def _build_model():
+    # Imported here so the (slow) LangChain/google-genai import is only paid
+    # when the LLM is actually needed.
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
-def create_llm_instance():
-    """
-    Creates or reloads the global 'model' instance based on the active
-    configuration in models.json.
-    """
-    global model
-    
-    print("--- Loading LLM instance ---")
-    
     active_config = model_manager.get_active_config()
     
     if not active_config:
         print("CRITICAL: No active model configuration found. Agent will not work.")
-        model = None
-        return
+        return None
 
     model_name = active_config["model_name"]
     api_key = active_config["api_key"]
 
     try:
         # Instantiate the model without the problematic safety_settings
-        model = ChatGoogleGenerativeAI(
+        llm = ChatGoogleGenerativeAI(
             model=model_name,
             google_api_key=api_key,
             convert_system_message_to_human=True
         )
         print(f"✅ Successfully loaded model '{model_name}'.")
+        return llm
     except Exception as e:
         print(f"❌ Error configuring Gemini AI via LangChain: {e}")
-        model = None
+        return None
+
+def create_llm_instance():
+    """
+    Creates or reloads the global 'model' instance based on the active
+    configuration in models.json.
+    """
+    global model, _model_loaded
+    
+    print("--- Loading LLM instance ---")
+    model = _build_model()
+    _model_loaded = True
+
+def get_model():
+    """
+    Returns the global model instance, creating it on first use.
+    """
+    if not _model_loaded:
+        with _model_lock:
+            if not _model_loaded:
+                create_llm_instance()
+    return model
+
+def _on_model_config_change(active_config):
+    """Drops the model when the active model or its key changes; the next get_model() rebuilds it."""
+    global model, _model_loaded
+    with _model_lock:
+        if _model_loaded:
+            print("--- Model configuration changed; the LLM will be reloaded on next use ---")
+            model = None
+            _model_loaded = False
 
-# --- Initial Load ---
-create_llm_instance()
\ No newline at end of file
+model_manager.subscribe(_on_model_config_change)
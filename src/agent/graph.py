@@ -3,6 +3,7 @@
 import sys
 import os
 import operator
+import functools
 from typing import TypedDict, Annotated, Sequence
 
 # --- Path Fix ---
@@ -14,20 +15,49 @@ if project_root not in sys.path:
 
 from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 
-from src.agent.core import model # This is our BASE model from core.py
+from src.agent import core as agent_core # Provides our BASE model, created lazily
 from src.agent.tools import calendar as calendar_tool
+from src.agent.tools import free_busy as free_busy_tool
+from src.agent.tools import mail_search as mail_search_tool
+from src.agent.tools import mail_summary as mail_summary_tool
 from src.agent.tools import notes as notes_tool
 from src.agent.tools import tasks as tasks_tool
+from src.core import metrics
+
+
+NODE_DURATION = metrics.histogram(
+    "aura_graph_node_duration_seconds", "Time spent in each LangGraph node.", ("node",))
+TOOL_DURATION = metrics.histogram(
+    "aura_tool_duration_seconds", "Agent tool call latency.", ("tool",))
+TOOL_ERRORS = metrics.counter(
+    "aura_tool_errors_total", "Agent tool calls that raised an exception.", ("tool",))
+LLM_TOKENS = metrics.counter(
+    "aura_llm_tokens_total", "LLM token usage reported by the model.", ("model", "type"))
+
+
+def instrument_tool(tool):
+    """Wraps a tool function to record its latency and errors. The signature
+    and docstring are preserved so the tool schema seen by the LLM is unchanged."""
+    @functools.wraps(tool)
+    def wrapper(*args, **kwargs):
+        with TOOL_DURATION.time(tool=tool.__name__):
+            try:
+                return tool(*args, **kwargs)
+            except Exception:
+                TOOL_ERRORS.inc(tool=tool.__name__)
+                raise
+    return wrapper
 
 
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], operator.add]
 
 
-tools = [
+tools = [instrument_tool(tool) for tool in [
     tasks_tool.list_tasks,
     tasks_tool.add_task,
     tasks_tool.mark_task_complete,
@@ -35,12 +65,32 @@ tools = [
     notes_tool.save_note,
     notes_tool.delete_note,
     calendar_tool.fetch_upcoming_events,
-    calendar_tool.create_new_event
-]
+    calendar_tool.create_new_event,
+    free_busy_tool.check_conflicts,
+    free_busy_tool.find_free_slots,
+    mail_summary_tool.summarize_unread_emails,
+    mail_search_tool.search_mail,
+    mail_search_tool.read_email
+]]
 
-model_with_tools = model.bind_tools(tools)
 tool_node = ToolNode(tools)
 
+# The base model is bound to the tools on first use, and re-bound whenever
+# `!usemodel` swaps the model in core.py.
+_bound_model = None
+_model_with_tools = None
+
+
+def get_model_with_tools():
+    global _bound_model, _model_with_tools
+    model = agent_core.get_model()
+    if model is None:
+        raise RuntimeError("No active LLM is configured. Use !usemodel to select one.")
+    if model is not _bound_model:
+        _model_with_tools = model.bind_tools(tools)
+        _bound_model = model
+    return _model_with_tools
+
 
 # --- NODES ---
 
@@ -51,10 +101,22 @@ def agent_node(state: AgentState):
     # The system prompt should be the first message.
     # The invoker will ensure this is the case.
     
-    response = model_with_tools.invoke(messages) # LLM has access to tools
+    with NODE_DURATION.time(node="agent"):
+        response = get_model_with_tools().invoke(messages) # LLM has access to tools
+
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        model_name = getattr(_bound_model, "model", "unknown")
+        LLM_TOKENS.inc(usage.get("input_tokens", 0), model=model_name, type="input")
+        LLM_TOKENS.inc(usage.get("output_tokens", 0), model=model_name, type="output")
     return {"messages": [response]}
 
 
+def action_node(state: AgentState, config: RunnableConfig):
+    with NODE_DURATION.time(node="action"):
+        return tool_node.invoke(state, config)
+
+
 # --- EDGES / ROUTING LOGIC ---
 
 def should_continue(state: AgentState):
@@ -71,7 +133,7 @@ def should_continue(state: AgentState):
 workflow = StateGraph(AgentState)
 
 workflow.add_node("agent", agent_node)
-workflow.add_node("action", tool_node)
+workflow.add_node("action", action_node)
 
 workflow.set_entry_point("agent")
 
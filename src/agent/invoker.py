@@ -1,11 +1,28 @@
 # File: src/agent/invoker.py (Final ReAct Invoker)
 
+import time
 import discord
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage # Added AIMessage, ToolMessage for type checking
 
-from src.agent.graph import app, AgentState # Import the compiled ReAct agent app
+from src.core import executors, metrics
+from src.core.profiling import profiled
 
+MENTION_DURATION = metrics.histogram(
+    "aura_mention_duration_seconds", "End-to-end time to answer a mention.", ("outcome",))
 
+
+def load_agent():
+    """
+    Imports and compiles the LangGraph agent. The agent stack (LangChain,
+    LangGraph, google-genai) is only imported here, on first use, so that it
+    does not slow down bot startup. Safe to call repeatedly.
+    """
+    from src.agent import core as agent_core
+    from src.agent.graph import app
+    agent_core.get_model()
+    return app
+
+
+@profiled("handle_mention")
 async def handle_mention(message: discord.Message):
     """
     This function is the main entry point for the ReAct agent.
@@ -17,6 +34,10 @@ async def handle_mention(message: discord.Message):
         if not prompt_content:
             return
 
+        # The first mention pays the agent import cost; keep it off the event loop.
+        app = await executors.run_in(executors.AGENT, load_agent)
+        from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
+
         # THIS IS THE CRITICAL SYSTEM PROMPT FOR THE REACT AGENT
         # It guides its planning, tool use, conversation, and multi-step reasoning.
         system_prompt = (
@@ -28,6 +49,7 @@ async def handle_mention(message: discord.Message):
             "2. **Tool Selection & Planning:** Choose the best tool(s). If it's a complex request requiring multiple tool calls, think step-by-step. For example:\n"
             "   - To 'mark all pending tasks as complete': First, call `list_tasks(status_filter='pending')` to get their IDs. Then, for each ID obtained, call `mark_task_complete(task_id=...)` sequentially.\n"
             "   - To 'add multiple tasks in one go': Call `add_task(description=...)` for each distinct task item found in the user's request.\n"
+            "   - Before `create_new_event`, call `check_conflicts(...)` for the requested time and tell the user about any clash. To find a time, call `find_free_slots(...)` instead of listing events.\n"
             "   - If a tool requires arguments you don't have (e.g., a specific ID), ask the user for *precise* clarification (e.g., 'Please provide the exact ID of the task you want to mark complete.').\n"
             "3. **Act:** Execute the chosen tool(s).\n"
             "4. **Observe:** Analyze the output from the tool(s). This is crucial for planning the next step. If a tool call was successful, indicate so. If it failed, explain the failure.\n"
@@ -41,13 +63,14 @@ async def handle_mention(message: discord.Message):
             "- **General Questions:** If a request is purely conversational and does not involve personal data or tools (e.g., 'What is LangGraph?'), answer directly using your knowledge without attempting tool calls.\n"
         )
 
-        initial_state: AgentState = {
+        initial_state = {
             "messages": [
                 SystemMessage(content=system_prompt),
                 HumanMessage(content=prompt_content)
             ]
         }
 
+        started = time.perf_counter()
         try:
             accumulated_response_content = ""
             
@@ -100,7 +123,9 @@ async def handle_mention(message: discord.Message):
                 # This fallback might occur if agent only executes tools and gives no final text.
                 # Or if the stream somehow terminates without a final text from agent node.
                 await message.add_reaction('✅')
+            MENTION_DURATION.observe(time.perf_counter() - started, outcome="ok")
 
         except Exception as e:
+            MENTION_DURATION.observe(time.perf_counter() - started, outcome="error")
             print(f"Error invoking agent graph: {e}")
             await message.reply("Sorry, I encountered an error while processing your request. Please check my console for details.")
\ No newline at end of file
@@ -1,14 +1,57 @@
 # File: src/gcp/calendar.py
 
 import datetime
+import threading
+from collections import OrderedDict
+
 from googleapiclient.errors import HttpError
 
 # Import the centralized function to build a Google service
 from src.core.gcp_auth import build_google_service
+from src.core import user_context
+from src.agent.tools.free_busy import invalidate_busy_cache
 
 # This file now only contains functions directly related to the Calendar API.
 # All authentication logic has been moved.
 
+# --- Event cache ---
+# Event cards in Discord only carry the event ID (see src/bot/ui/event_ui.py).
+# Events that were just listed, created or updated are kept in a small LRU
+# cache keyed by user and event ID, so opening the edit form rarely needs an
+# API call; anything else is fetched with events.get.
+EVENT_CACHE_SIZE = 256
+
+_event_cache: OrderedDict[tuple[int | None, str], dict] = OrderedDict()
+_event_cache_lock = threading.Lock()
+
+def _cache_events(events: list):
+    user_id = user_context.get_user_id()
+    with _event_cache_lock:
+        for event in events:
+            if not event or 'id' not in event:
+                continue
+            key = (user_id, event['id'])
+            _event_cache[key] = event
+            _event_cache.move_to_end(key)
+        while len(_event_cache) > EVENT_CACHE_SIZE:
+            _event_cache.popitem(last=False)
+
+def get_event(event_id: str) -> dict:
+    """Gets an event of the user's primary calendar, from the cache if it was seen recently."""
+    key = (user_context.get_user_id(), event_id)
+    with _event_cache_lock:
+        if key in _event_cache:
+            _event_cache.move_to_end(key)
+            return _event_cache[key]
+    try:
+        service = build_google_service('calendar', 'v3')
+        event = service.events().get(calendarId="primary", eventId=event_id).execute()
+    except Exception as e:
+        print(f"An error occurred in get_event: {e}")
+        raise e
+    _cache_events([event])
+    return event
+
 def fetch_upcoming_events(max_results=5) -> list:
     """Fetches upcoming events from the user's primary calendar."""
     try:
@@ -21,12 +64,40 @@ def fetch_upcoming_events(max_results=5) -> list:
             calendarId="primary", timeMin=now, maxResults=max_results,
             singleEvents=True, orderBy="startTime"
         ).execute()
-        return events_result.get("items", [])
+        events = events_result.get("items", [])
+        _cache_events(events)
+        return events
     except Exception as e:
         # Re-raise the exception so the command in the cog can handle it
         print(f"An error occurred in fetch_upcoming_events: {e}")
         raise e
 
+def fetch_events_in_range(time_min_iso: str, time_max_iso: str, max_results: int = 250) -> list:
+    """
+    Fetches the events of the user's primary calendar that start between
+    time_min_iso and time_max_iso, in start order, following result pages up
+    to max_results events.
+    """
+    try:
+        service = build_google_service('calendar', 'v3')
+        events, page_token = [], None
+        while len(events) < max_results:
+            events_result = service.events().list(
+                calendarId="primary", timeMin=time_min_iso, timeMax=time_max_iso,
+                maxResults=min(250, max_results - len(events)), singleEvents=True,
+                orderBy="startTime", pageToken=page_token
+            ).execute()
+            events.extend(events_result.get("items", []))
+            page_token = events_result.get("nextPageToken")
+            if not page_token:
+                break
+        events = events[:max_results]
+        _cache_events(events)
+        return events
+    except Exception as e:
+        print(f"An error occurred in fetch_events_in_range: {e}")
+        raise e
+
 def update_event(event_id: str, summary: str, start_time_iso: str, end_time_iso: str, description: str, location: str) -> dict | None:
     """Updates an existing event in the user's primary calendar."""
     try:
@@ -46,6 +117,8 @@ def update_event(event_id: str, summary: str, start_time_iso: str, end_time_iso:
         updated_event = service.events().update(
             calendarId='primary', eventId=event_id, body=event_body
         ).execute()
+        _cache_events([updated_event])
+        invalidate_busy_cache()
         return updated_event
     except HttpError as error:
         # Re-raise the exception for the UI modal to handle
@@ -76,6 +149,8 @@ def create_new_event(summary: str, start_time_iso: str, end_time_iso: str, descr
         ).execute()
         
         print(f"Event created: {new_event.get('htmlLink')}")
+        _cache_events([new_event])
+        invalidate_busy_cache()
         return new_event
     except HttpError as error:
         print(f'An HttpError occurred during event creation: {error}')
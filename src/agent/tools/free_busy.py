@@ -0,0 +1,268 @@
+# File: src/agent/tools/free_busy.py
+
+import bisect
+import datetime
+import threading
+import time
+import zoneinfo
+from collections import OrderedDict
+
+from src.core import config, user_context
+from src.core.gcp_auth import build_google_service
+
+# Availability checks for the agent. Busy blocks of all the user's calendars
+# come from one Calendar freebusy query (no event details are downloaded) and
+# are kept in a BusyIndex, so conflict checks and slot searches run locally and
+# only a compact answer goes back to the LLM. Each query starts a day early (so
+# searches from midnight in any time zone are covered) and spans at least
+# BUSY_PREFETCH_DAYS, and a user's busy blocks are reused for
+# BUSY_CACHE_SECONDS for any window they cover, so checking a time and then
+# looking for alternatives costs a single query.
+
+BUSY_CACHE_SECONDS = 60
+BUSY_PREFETCH_DAYS = 7
+FREEBUSY_MAX_CALENDARS = 50  # per freebusy query
+MAX_WINDOW_DAYS = 62
+
+
+class BusyIndex:
+    """
+    Busy intervals (epoch seconds), merged into disjoint blocks sorted by
+    start. Since the blocks do not overlap, their ends are sorted too, so a
+    bisect finds the first block that can touch a time in O(log n) and queries
+    cost O(log n) plus the blocks they return.
+    """
+    def __init__(self, intervals):
+        merged = []
+        for start, end in sorted(interval for interval in intervals if interval[1] > interval[0]):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, start: float, end: float) -> list[tuple[float, float]]:
+        """The busy blocks that overlap [start, end)."""
+        index = bisect.bisect_right(self.ends, start)
+        blocks = []
+        while index < len(self.starts) and self.starts[index] < end:
+            blocks.append((self.starts[index], self.ends[index]))
+            index += 1
+        return blocks
+
+    def is_free(self, start: float, end: float) -> bool:
+        index = bisect.bisect_right(self.ends, start)
+        return index == len(self.starts) or self.starts[index] >= end
+
+    def free_between(self, start: float, end: float, min_length: float = 0):
+        """Yields the free gaps inside [start, end) that are at least min_length long."""
+        index = bisect.bisect_right(self.ends, start)
+        cursor = start
+        while cursor < end:
+            next_busy = self.starts[index] if index < len(self.starts) else end
+            gap_end = min(next_busy, end)
+            if gap_end - cursor >= min_length and gap_end > cursor:
+                yield cursor, gap_end
+            if index >= len(self.starts):
+                break
+            cursor = max(cursor, self.ends[index])
+            index += 1
+
+
+class _BusySnapshot:
+    def __init__(self, time_min: float, time_max: float, calendars: dict[str, str], busy: dict[str, BusyIndex]):
+        self.loaded_at = time.monotonic()
+        self.time_min = time_min
+        self.time_max = time_max
+        self.calendars = calendars  # calendar ID -> name
+        self.busy = busy  # calendar ID -> its busy blocks
+        self.combined = BusyIndex(interval for index in busy.values() for interval in zip(index.starts, index.ends))
+
+    def covers(self, time_min: float, time_max: float) -> bool:
+        return (self.time_min <= time_min and time_max <= self.time_max
+                and time.monotonic() - self.loaded_at < BUSY_CACHE_SECONDS)
+
+
+_snapshots: OrderedDict[int | None, _BusySnapshot] = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+
+def invalidate_busy_cache():
+    """Forgets the current user's busy blocks, for example after an event was created."""
+    with _snapshots_lock:
+        _snapshots.pop(user_context.get_user_id(), None)
+
+
+def _parse_time(value: str) -> datetime.datetime:
+    parsed = datetime.datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def _format_time(timestamp: float, tz: datetime.tzinfo) -> str:
+    return datetime.datetime.fromtimestamp(timestamp, tz).isoformat(timespec='minutes')
+
+
+def _list_calendars(service) -> dict[str, str]:
+    """The calendars the user has selected in Google Calendar (always including the primary one)."""
+    calendars, page_token = {}, None
+    while True:
+        result = service.calendarList().list(minAccessRole="freeBusyReader", pageToken=page_token).execute()
+        for item in result.get('items', []):
+            if item.get('primary') or item.get('selected'):
+                calendars[item['id']] = item.get('summaryOverride') or item.get('summary') or item['id']
+        page_token = result.get('nextPageToken')
+        if not page_token:
+            break
+    return calendars or {'primary': 'primary'}
+
+
+def _load_busy(time_min: float, time_max: float) -> _BusySnapshot:
+    user_id = user_context.get_user_id()
+    with _snapshots_lock:
+        snapshot = _snapshots.get(user_id)
+        if snapshot and snapshot.covers(time_min, time_max):
+            _snapshots.move_to_end(user_id)
+            return snapshot
+
+    day_start = datetime.datetime.fromtimestamp(time_min - 86400, datetime.timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0)
+    time_min = day_start.timestamp()
+    time_max = max(time_max, (day_start + datetime.timedelta(days=BUSY_PREFETCH_DAYS)).timestamp())
+
+    service = build_google_service('calendar', 'v3')
+    calendars = _list_calendars(service)
+    busy: dict[str, BusyIndex] = {}
+    calendar_ids = list(calendars)
+    for first in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+        result = service.freebusy().query(body={
+            'timeMin': datetime.datetime.fromtimestamp(time_min, datetime.timezone.utc).isoformat(),
+            'timeMax': datetime.datetime.fromtimestamp(time_max, datetime.timezone.utc).isoformat(),
+            'items': [{'id': calendar_id} for calendar_id in calendar_ids[first:first + FREEBUSY_MAX_CALENDARS]],
+        }).execute()
+        for calendar_id, info in result.get('calendars', {}).items():
+            if info.get('errors'):
+                print(f"CALENDAR WARNING: No free/busy data for calendar {calendar_id}: {info['errors']}")
+            busy[calendar_id] = BusyIndex(
+                (_parse_time(block['start']).timestamp(), _parse_time(block['end']).timestamp())
+                for block in info.get('busy', []))
+
+    snapshot = _BusySnapshot(time_min, time_max, calendars, busy)
+    with _snapshots_lock:
+        _snapshots[user_id] = snapshot
+        _snapshots.move_to_end(user_id)
+        while len(_snapshots) > config.AURA_USER_CACHE_SIZE:
+            _snapshots.popitem(last=False)
+    return snapshot
+
+
+def check_conflicts(start_time_iso: str, end_time_iso: str) -> dict:
+    """
+    Checks whether a time range is already busy in any of the user's calendars.
+    Call this before create_new_event to avoid double-booking.
+
+    Args:
+        start_time_iso: Start of the range in ISO 8601, e.g. '2025-06-20T14:00:00+02:00'.
+        end_time_iso: End of the range in ISO 8601.
+
+    Returns:
+        {'conflict': True/False, 'busy': [{'calendar': ..., 'start': ..., 'end': ...}]}
+        listing the busy blocks that overlap the range.
+    """
+    start, end = _parse_time(start_time_iso), _parse_time(end_time_iso)
+    if end <= start:
+        raise ValueError("end_time_iso must be after start_time_iso.")
+    snapshot = _load_busy(start.timestamp(), end.timestamp())
+    if snapshot.combined.is_free(start.timestamp(), end.timestamp()):
+        return {'conflict': False, 'busy': []}
+
+    busy = []
+    for calendar_id, index in snapshot.busy.items():
+        for block_start, block_end in index.overlapping(start.timestamp(), end.timestamp()):
+            busy.append({'calendar': snapshot.calendars.get(calendar_id, calendar_id),
+                         'start': _format_time(block_start, start.tzinfo), 'end': _format_time(block_end, start.tzinfo)})
+    busy.sort(key=lambda block: block['start'])
+    return {'conflict': True, 'busy': busy}
+
+
+def _daily_ranges(start: datetime.datetime, end: datetime.datetime, working_hours: str,
+                  zone: datetime.tzinfo) -> list[tuple[datetime.datetime, datetime.datetime]]:
+    """
+    The parts of [start, end) inside the daily working hours in zone. A range
+    that ends at or before it starts ('22:00-06:00') runs into the next day.
+    """
+    try:
+        day_start, day_end = (datetime.time.fromisoformat(part.strip()) for part in working_hours.split('-'))
+    except ValueError:
+        raise ValueError("working_hours must look like '09:00-17:00'.")
+    overnight = day_end <= day_start
+
+    ranges = []
+    # Start a day early, so an overnight range that began the evening before is included.
+    day = start.astimezone(zone).date() - datetime.timedelta(days=1)
+    while day <= end.astimezone(zone).date():
+        end_day = day + datetime.timedelta(days=1) if overnight else day
+        # Combining with the zone applies that day's UTC offset, so DST changes are respected.
+        range_start = max(start, datetime.datetime.combine(day, day_start, zone))
+        range_end = min(end, datetime.datetime.combine(end_day, day_end, zone))
+        if range_end > range_start:
+            ranges.append((range_start, range_end))
+        day += datetime.timedelta(days=1)
+    return ranges
+
+
+def find_free_slots(duration_minutes: int, window_start_iso: str, window_end_iso: str,
+                    max_results: int = 5, working_hours: str = None, time_zone: str = None) -> list:
+    """
+    Finds free time across all of the user's calendars.
+
+    Args:
+        duration_minutes: How long the free time must be.
+        window_start_iso: Earliest start in ISO 8601, e.g. '2025-06-20T09:00:00+02:00'.
+        window_end_iso: Latest end in ISO 8601 (at most 62 days after the start).
+        max_results: Maximum number of slots to return.
+        working_hours: Optional daily limits like '09:00-17:00'; '22:00-06:00' runs overnight.
+        time_zone: The user's IANA time zone, e.g. 'Europe/Berlin'. Working hours are
+            read in it and slots are returned in it. Needed with working_hours unless
+            the bot has a default time zone configured.
+
+    Returns:
+        Free slots in chronological order as [{'start': ..., 'end': ...}], each at
+        least duration_minutes long; an event can start at any time within a slot
+        as long as it ends by the slot's end.
+    """
+    start, end = _parse_time(window_start_iso), _parse_time(window_end_iso)
+    if end <= start:
+        raise ValueError("window_end_iso must be after window_start_iso.")
+    if end - start > datetime.timedelta(days=MAX_WINDOW_DAYS):
+        raise ValueError(f"The search window can be at most {MAX_WINDOW_DAYS} days long.")
+    if duration_minutes <= 0:
+        raise ValueError("duration_minutes must be positive.")
+
+    zone = None
+    time_zone = time_zone or config.AURA_TIMEZONE
+    if time_zone:
+        try:
+            zone = zoneinfo.ZoneInfo(time_zone)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"'{time_zone}' is not a known IANA time zone (e.g. 'Europe/Berlin').")
+
+    ranges = [(start, end)]
+    if working_hours:
+        if zone is None:
+            raise ValueError("working_hours needs the user's time_zone, e.g. 'Europe/Berlin'.")
+        ranges = _daily_ranges(start, end, working_hours, zone)
+
+    output_zone = zone or start.tzinfo
+    snapshot = _load_busy(start.timestamp(), end.timestamp())
+    slots = []
+    for range_start, range_end in ranges:
+        for gap_start, gap_end in snapshot.combined.free_between(
+                range_start.timestamp(), range_end.timestamp(), duration_minutes * 60):
+            slots.append({'start': _format_time(gap_start, output_zone), 'end': _format_time(gap_end, output_zone)})
+            if len(slots) >= max_results:
+                return slots
+    return slots
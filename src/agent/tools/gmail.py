@@ -1,16 +1,69 @@
 # File: src/agent/tools/gmail.py
 
 import base64
-import email
-from email import policy
+import re
+import threading
 import time
+from collections import OrderedDict
+from html.parser import HTMLParser
 from datetime import datetime, timedelta, timezone
 from googleapiclient.errors import HttpError
 
-from src.core.gcp_auth import build_google_service
+from src.core import config, resilience, user_context
+from src.core.gcp_auth import build_google_service, GOOGLE_API_REQUESTS, GOOGLE_API_DURATION
+from src.agent.tools import mail_index
 import gmail_history_tracker
 
 
+# Gmail accepts up to 100 calls per batch request but recommends at most 50.
+BATCH_GET_SIZE = 50
+
+def batch_get_messages(message_ids: list, service=None, **get_kwargs) -> dict[str, dict]:
+    """
+    Fetches many messages with users.messages.get, grouped into batch HTTP
+    requests of BATCH_GET_SIZE calls. `get_kwargs` are passed to every get
+    (e.g. format='metadata'). Calls that fail transiently inside a batch are
+    retried in a later batch with backoff. Returns {message_id: message};
+    messages that failed for good (e.g. were deleted) are left out.
+    """
+    service = service or build_google_service('gmail', 'v1')
+    results = {}
+
+    message_ids = list(dict.fromkeys(message_ids))
+    for start in range(0, len(message_ids), BATCH_GET_SIZE):
+        pending = message_ids[start:start + BATCH_GET_SIZE]
+        attempt = 0
+        while pending:
+            retry_ids, last_error = [], None
+
+            def _on_response(request_id, response, exception):
+                nonlocal last_error
+                GOOGLE_API_REQUESTS.inc(
+                    method='gmail.users.messages.get',
+                    status=str(exception.resp.status) if isinstance(exception, HttpError) else ('error' if exception else '200'),
+                )
+                if exception is None:
+                    results[request_id] = response
+                elif resilience.failure_reason(exception) and attempt < config.GOOGLE_API_MAX_RETRIES:
+                    retry_ids.append(request_id)
+                    last_error = exception
+                else:
+                    print(f"WARNING: Batched get failed for message {request_id}: {exception}")
+
+            batch = service.new_batch_http_request(callback=_on_response)
+            for message_id in pending:
+                batch.add(service.users().messages().get(userId='me', id=message_id, **get_kwargs), request_id=message_id)
+            with GOOGLE_API_DURATION.time(method='gmail.batch'):
+                resilience.call_with_retry('gmail', batch.execute)
+
+            if retry_ids:
+                delay = resilience.backoff_delay(attempt, last_error)
+                resilience.RETRIES.inc(len(retry_ids), api='gmail', reason=resilience.failure_reason(last_error))
+                print(f"RESILIENCE: Retrying {len(retry_ids)} batched gets in {delay:.2f}s.")
+                time.sleep(delay)
+            pending, attempt = retry_ids, attempt + 1
+    return results
+
 def fetch_unread_emails(max_results=5) -> list:
     try:
         service = build_google_service('gmail', 'v1')
@@ -27,72 +80,241 @@ def fetch_unread_emails(max_results=5) -> list:
         if not messages:
             return []
 
+        fetched = batch_get_messages(
+            [message['id'] for message in messages], service,
+            format='metadata', metadataHeaders=['Subject', 'From', 'Date'], fields='id,threadId,payload/headers'
+        )
         for message in messages:
-            msg = service.users().messages().get(
-                userId='me', id=message['id'], format='metadata'
-            ).execute()
+            msg = fetched.get(message['id'])
+            if msg is None:
+                continue
             
             headers = msg.get('payload', {}).get('headers', [])
             subject = next((i['value'] for i in headers if i['name'] == 'Subject'), 'No Subject')
             sender = next((i['value'] for i in headers if i['name'] == 'From'), 'Unknown Sender')
+            date = next((i['value'] for i in headers if i['name'] == 'Date'), '')
             
-            email_data.append({'subject': subject, 'sender': sender})
+            email_data.append({'id': msg['id'], 'threadId': msg.get('threadId'), 'subject': subject, 'sender': sender, 'date': date})
             
         return email_data
     except Exception as e:
         print(f"An error occurred in fetch_unread_emails: {e}")
         raise e
     
-def get_email_body(message_id: str) -> str | None:
+# --- Body extraction ---
+# Bodies are read from the message structure (format='full') rather than the
+# whole raw RFC 822 message, so attachments are never downloaded. Only the
+# first text/plain part (or text/html as a fallback) is decoded, up to
+# MAX_BODY_BYTES, and results are kept in a small LRU cache keyed by user and
+# message ID.
+MAX_BODY_BYTES = 64 * 1024
+BODY_CACHE_SIZE = 256
+
+_body_cache: OrderedDict[tuple[int | None, str], str | None] = OrderedDict()
+_body_cache_lock = threading.Lock()
+
+class _HTMLTextExtractor(HTMLParser):
+    BLOCK_TAGS = {'br', 'p', 'div', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table', 'blockquote'}
+    SKIP_TAGS = {'script', 'style', 'head', 'title'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.chunks.append(data)
+
+def _html_to_text(html: str) -> str:
+    parser = _HTMLTextExtractor()
+    parser.feed(html)
+    parser.close()
+    text = ''.join(parser.chunks)
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+def _part_charset(part: dict) -> str:
+    for header in part.get('headers', []):
+        if header['name'].lower() == 'content-type':
+            match = re.search(r'charset="?([\w.-]+)"?', header['value'], re.IGNORECASE)
+            if match:
+                return match.group(1)
+    return 'utf-8'
+
+def _is_attachment(part: dict) -> bool:
+    if part.get('filename'):
+        return True
+    return any(
+        header['name'].lower() == 'content-disposition' and header['value'].lower().startswith('attachment')
+        for header in part.get('headers', [])
+    )
+
+def _find_text_parts(payload: dict) -> tuple[dict | None, dict | None]:
+    """Returns the first text/plain and text/html parts of a message payload."""
+    plain, html = None, None
+    stack = [payload]
+    while stack and not plain:
+        part = stack.pop(0)
+        if part.get('parts'):
+            stack[:0] = part['parts']
+            continue
+        if _is_attachment(part):
+            continue
+        if part.get('mimeType') == 'text/plain' and plain is None:
+            plain = part
+        elif part.get('mimeType') == 'text/html' and html is None:
+            html = part
+    return plain, html
+
+def _decode_part(part: dict, message_id: str, service, max_bytes: int) -> str | None:
+    body = part.get('body', {})
+    data = body.get('data')
+    if data is None and body.get('attachmentId'):
+        # Large text parts are stored like attachments and fetched by ID.
+        attachment = service.users().messages().attachments().get(
+            userId='me', messageId=message_id, id=body['attachmentId']
+        ).execute()
+        data = attachment.get('data')
+    if not data:
+        return None
+
+    # Only decode as much base64 as needed to produce max_bytes.
+    encoded_limit = ((max_bytes + 2) // 3) * 4
+    raw = base64.urlsafe_b64decode(data[:encoded_limit] + '=' * (-min(len(data), encoded_limit) % 4))
+    return raw[:max_bytes].decode(_part_charset(part), 'ignore')
+
+def extract_body_from_payload(payload: dict, message_id: str, service, max_bytes: int = MAX_BODY_BYTES) -> str | None:
+    """
+    Extracts readable text from a Gmail message payload (format='full'),
+    preferring text/plain and falling back to text/html converted to text.
+    """
+    plain, html = _find_text_parts(payload)
+    if plain:
+        text = _decode_part(plain, message_id, service, max_bytes)
+        if text:
+            return text
+    if html:
+        text = _decode_part(html, message_id, service, max_bytes)
+        if text:
+            return _html_to_text(text)
+    return None
+
+def _body_key(message_id: str) -> tuple[int | None, str]:
+    return (user_context.get_user_id(), message_id)
+
+def _cache_body(message_id: str, body: str | None):
+    key = _body_key(message_id)
+    with _body_cache_lock:
+        _body_cache[key] = body
+        _body_cache.move_to_end(key)
+        while len(_body_cache) > BODY_CACHE_SIZE:
+            _body_cache.popitem(last=False)
+
+def get_email_body(message_id: str, max_bytes: int = MAX_BODY_BYTES) -> str | None:
+    key = _body_key(message_id)
+    with _body_cache_lock:
+        if key in _body_cache:
+            _body_cache.move_to_end(key)
+            return _body_cache[key]
+
     try:
         service = build_google_service('gmail', 'v1')
         
-        msg_raw = service.users().messages().get(
-            userId='me', id=message_id, format='raw'
+        msg = service.users().messages().get(
+            userId='me', id=message_id, format='full', fields='id,payload'
         ).execute()
 
-        if 'raw' not in msg_raw:
-            return None
-
-        msg_bytes = base64.urlsafe_b64decode(msg_raw['raw'].encode('ASCII'))
-        mime_msg = email.message_from_bytes(msg_bytes, policy=policy.default)
-
-        for part in mime_msg.walk():
-            if part.get_content_maintype() == 'multipart' or part.get('Content-Disposition') is not None:
-                continue
-
-            if part.get_content_type() == 'text/plain':
-                return part.get_payload(decode=True).decode(part.get_content_charset() or 'utf-8', 'ignore')
-
-        if mime_msg.get_content_type() == 'text/plain':
-             return mime_msg.get_payload(decode=True).decode(mime_msg.get_content_charset() or 'utf-8', 'ignore')
-
-        return None
+        body = extract_body_from_payload(msg.get('payload', {}), message_id, service, max_bytes)
+        _cache_body(message_id, body)
+        return body
         
     except Exception as e:
         print(f"An error occurred in get_email_body for message {message_id}: {e}")
         raise e
 
-def mark_message_as_read(message_id: str):
-    try:
-        service = build_google_service('gmail', 'v1')
-        service.users().messages().modify(
-            userId='me',
-            id=message_id,
-            body={'removeLabelIds': ['UNREAD']}
-        ).execute()
-        print(f"DEBUG: Message {message_id} marked as read.")
-    except Exception as e:
-        print(f"WARNING: Could not mark message {message_id} as read: {e}")
+def fetch_unread_emails_with_bodies(max_results: int = 10, max_bytes: int = MAX_BODY_BYTES) -> list:
+    """
+    Like fetch_unread_emails, but also returns each message's body text. The
+    bodies are fetched with one batched format='full' request per
+    BATCH_GET_SIZE messages, and cached like get_email_body.
+    """
+    emails = fetch_unread_emails(max_results)
+    if not emails:
+        return []
+
+    with _body_cache_lock:
+        missing = [email['id'] for email in emails if _body_key(email['id']) not in _body_cache]
+
+    service = build_google_service('gmail', 'v1')
+    if missing:
+        fetched = batch_get_messages(missing, service, format='full', fields='id,payload')
+        for message_id, msg in fetched.items():
+            try:
+                body = extract_body_from_payload(msg.get('payload', {}), message_id, service, max_bytes)
+            except Exception as e:
+                print(f"WARNING: Could not extract body of message {message_id}: {e}")
+                continue
+            _cache_body(message_id, body)
+
+    with _body_cache_lock:
+        for email in emails:
+            email['body'] = _body_cache.get(_body_key(email['id']))
+    return emails
+
+# users.messages.batchModify accepts at most 1000 message IDs per request.
+BATCH_MODIFY_LIMIT = 1000
+
+def mark_messages_as_read(message_ids: list) -> list:
+    """
+    Removes the UNREAD label from many messages using batchModify, chunked to
+    the API limit. Returns the IDs of the chunks that still failed transiently
+    after the shared retry policy, so the caller can try them again later; any
+    other error is raised.
+    """
+    message_ids = list(dict.fromkeys(message_ids))
+    if not message_ids:
+        return []
+
+    service = build_google_service('gmail', 'v1')
+    failed = []
+    for start in range(0, len(message_ids), BATCH_MODIFY_LIMIT):
+        chunk = message_ids[start:start + BATCH_MODIFY_LIMIT]
+        try:
+            service.users().messages().batchModify(
+                userId='me',
+                body={'ids': chunk, 'removeLabelIds': ['UNREAD']}
+            ).execute()
+        except Exception as e:
+            if not (resilience.failure_reason(e) or isinstance(e, resilience.CircuitOpenError)):
+                raise
+            print(f"WARNING: Could not mark {len(chunk)} messages as read: {e}")
+            failed.extend(chunk)
+            continue
+        mail_index.update_labels(chunk, removed=['UNREAD'])
+    return failed
 
 def get_latest_history_id_from_gmail_api() -> int:
-    try:
-        service = build_google_service('gmail', 'v1')
-        profile = service.users().getProfile(userId='me').execute()
-        return int(profile.get('historyId', 0))
-    except Exception as e:
-        print(f"ERROR: Could not fetch latest history ID from Gmail profile API: {e}")
-        return 0 
+    """
+    Returns the mailbox's current historyId. Errors are raised (after the
+    shared retry policy) rather than returned as 0, which would look like
+    "no new history" to the caller.
+    """
+    service = build_google_service('gmail', 'v1')
+    profile = service.users().getProfile(userId='me').execute()
+    return int(profile['historyId'])
 
 def _fetch_messages_from_list_api(label_ids: list, max_results: int = 50) -> list:
     service = build_google_service('gmail', 'v1')
@@ -103,25 +325,32 @@ def _fetch_messages_from_list_api(label_ids: list, max_results: int = 50) -> lis
     ).execute()
     return results.get('messages', [])
 
+METADATA_HEADERS = ['Subject', 'From', 'Delivered-To']
+
+def _parse_metadata(message_id: str, msg_metadata: dict) -> dict:
+    headers = msg_metadata.get('payload', {}).get('headers', [])
+    subject = next((i['value'] for i in headers if i['name'] == 'Subject'), 'No Subject')
+    sender = next((i['value'] for i in headers if i['name'] == 'From'), 'Unknown Sender')
+    delivered_to = next((i['value'] for i in headers if i['name'] == 'Delivered-To'), '').lower()
+
+    return {
+        'id': message_id,
+        'threadId': msg_metadata.get('threadId'),
+        'subject': subject,
+        'sender': sender,
+        'historyId': int(msg_metadata.get('historyId', 0)),
+        'delivered_to': delivered_to,
+        'snippet': msg_metadata.get('snippet', ''),
+        'labelIds': msg_metadata.get('labelIds', []),
+        'internalDate': int(msg_metadata.get('internalDate', 0)),
+    }
+
 def _get_message_metadata(message_id: str, service) -> dict | None:
     try:
         msg_metadata = service.users().messages().get(
-            userId='me', id=message_id, format='metadata', metadataHeaders=['Subject', 'From', 'Delivered-To']
+            userId='me', id=message_id, format='metadata', metadataHeaders=METADATA_HEADERS
         ).execute()
-        
-        headers = msg_metadata.get('payload', {}).get('headers', [])
-        subject = next((i['value'] for i in headers if i['name'] == 'Subject'), 'No Subject')
-        sender = next((i['value'] for i in headers if i['name'] == 'From'), 'Unknown Sender')
-        delivered_to = next((i['value'] for i in headers if i['name'] == 'Delivered-To'), '').lower()
-
-        return {
-            'id': message_id,
-            'threadId': msg_metadata.get('threadId'),
-            'subject': subject,
-            'sender': sender,
-            'historyId': int(msg_metadata.get('historyId', 0)),
-            'delivered_to': delivered_to
-        }
+        return _parse_metadata(message_id, msg_metadata)
     except HttpError as error:
         if error.resp.status == 404:
             print(f"DEBUG: Message {message_id} not found (might be deleted). Skipping.")
@@ -132,103 +361,137 @@ def _get_message_metadata(message_id: str, service) -> dict | None:
         return None
 
 
-def fetch_new_messages_for_processing_from_api(start_history_id: int | None = None) -> tuple[list, int]:
-    service = build_google_service('gmail', 'v1')
-    
-    current_gmail_api_history_id = get_latest_history_id_from_gmail_api()
-    messages_to_process_raw = []
-    
-    effective_start_history_id = start_history_id if start_history_id is not None else 0
-
-    print(f"DEBUG: fetch_new_messages_for_processing_from_api: Current Gmail API history: {current_gmail_api_history_id}, Tracker's effective start: {effective_start_history_id}")
-
-    if effective_start_history_id >= current_gmail_api_history_id:
-        print(f"DEBUG: fetch_new_messages_for_processing_from_api: Tracker historyId ({effective_start_history_id}) is not older than current Gmail history ({current_gmail_api_history_id}). No new history to fetch.")
-        return [], current_gmail_api_history_id
-
-    try:
-        next_page_token = None
-        
-        while True:
+# --- Streaming history sync ---
+# history.list is read one page at a time and each page's new messages are
+# yielded as soon as their metadata is in, together with a historyId the
+# caller can checkpoint once it has committed the batch. History is read for
+# the whole mailbox, not just INBOX, so deletions and label removals reach the
+# mail index; notification candidates are picked out client-side.
+HISTORY_TYPES = ['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved']
+HISTORY_PAGE_SIZE = 100
+
+
+class _AdaptivePacer:
+    """
+    Paces history.list pages. There is no delay while the API keeps up; when
+    the shared retry layer had to retry Gmail calls during a page (rate limits
+    or server errors), the delay before the next page doubles, and every clean
+    page halves it again.
+    """
+    MIN_DELAY = 0.25
+    MAX_DELAY = 8.0
+
+    def __init__(self):
+        self.delay = 0.0
+        self._retries_seen = resilience.RETRIES.total()
+
+    def wait(self):
+        if self.delay:
+            time.sleep(self.delay)
+
+    def page_done(self):
+        retries = resilience.RETRIES.total()
+        if retries > self._retries_seen:
+            self.delay = min(self.MAX_DELAY, max(self.MIN_DELAY, self.delay * 2))
+        else:
+            self.delay = self.delay / 2 if self.delay > self.MIN_DELAY else 0.0
+        self._retries_seen = retries
+
+def _new_message_ids_in_record(history_record: dict) -> list:
+    message_ids = [item['message']['id'] for item in history_record.get('messagesAdded', [])
+                   if 'INBOX' in item['message'].get('labelIds', [])]
+    for label_event in history_record.get('labelsAdded', []):
+        # We only care if the 'INBOX' label was added, signifying a new arrival
+        if 'INBOX' in label_event.get('labelIds', []):
+            message_ids.append(label_event['message']['id'])
+    return message_ids
+
+def iter_new_message_batches(start_history_id: int | None = None):
+    """
+    Yields (messages, checkpoint_history_id) for each page of new INBOX mail
+    since start_history_id. Messages within a batch are ordered by historyId;
+    once a batch has been handled, checkpoint_history_id can be saved as the
+    tracker's last history ID. The last batch's checkpoint is the mailbox's
+    current historyId, so it is yielded even when it has no messages.
+
+    Each page builds its service in the calling thread, so the generator can
+    be advanced from different executor threads (see executors.iterate_in).
+    """
+    if not start_history_id:
+        print("DEBUG: iter_new_message_batches: No start historyId. Performing full unread sync.")
+        yield _fetch_unread_and_get_history_id_fallback(build_google_service('gmail', 'v1'))
+        return
+
+    current_email = (gmail_history_tracker.get_current_email_address() or '').lower()
+    pacer = _AdaptivePacer()
+    page_token = None
+
+    while True:
+        service = build_google_service('gmail', 'v1')
+        pacer.wait()
+        try:
             history_response = service.users().history().list(
                 userId='me',
-                startHistoryId=effective_start_history_id,
-                pageToken=next_page_token,
+                startHistoryId=start_history_id,
+                historyTypes=HISTORY_TYPES,
+                maxResults=HISTORY_PAGE_SIZE,
+                pageToken=page_token,
             ).execute()
+        except HttpError as error:
+            if error.resp.status == 404 and page_token is None:
+                print(f"WARNING: history.list 404 for startHistoryId {start_history_id}. History too old or invalid. Performing full unread sync to re-establish base. Error: {error._get_reason()}")
+                yield _fetch_unread_and_get_history_id_fallback(service)
+                return
+            raise
+
+        history_list = history_response.get('history', [])
+        page_token = history_response.get('nextPageToken')
+
+        candidate_ids, deleted_ids = [], set()
+        for history_record in history_list:
+            mail_index.apply_history_record(history_record)
+            candidate_ids.extend(_new_message_ids_in_record(history_record))
+            deleted_ids.update(item['message']['id'] for item in history_record.get('messagesDeleted', []))
+        if candidate_ids:
+            processed_ids = gmail_history_tracker.get_processed_message_ids()
+            candidate_ids = [msg_id for msg_id in dict.fromkeys(candidate_ids)
+                             if msg_id not in processed_ids and msg_id not in deleted_ids]
+
+        fetched = batch_get_messages(candidate_ids, service, format='metadata', metadataHeaders=METADATA_HEADERS)
+        indexed_metadata = [_parse_metadata(msg_id, fetched[msg_id]) for msg_id in candidate_ids if msg_id in fetched]
+        mail_index.upsert_messages(indexed_metadata)
+
+        messages = []
+        for metadata in indexed_metadata:
+            if current_email and metadata['delivered_to'] == current_email:
+                messages.append(metadata)
+                print(f"SUCCESS: Found new mail '{metadata['subject']}' (ID: {metadata['id']}). Queued for notification.")
+            else:
+                print(f"DEBUG: Skipped message '{metadata['subject']}': Delivered-To '{metadata['delivered_to']}' does not match '{current_email or 'Unknown'}'.")
+        messages.sort(key=lambda x: (x['historyId'], x['id']))
+        pacer.page_done()
 
-            history_list = history_response.get('history', [])
-            
-            if not history_list and not history_response.get('nextPageToken'):
-                break 
-            
-            # --- START OF THE DEFINITIVE FIX ---
-            for history_record in history_list:
-                print(f">>> [RAW_HISTORY_DEBUG] Processing history record: {history_record}")
-
-                messages_in_record = []
-                # Check for messages added directly
-                if 'messagesAdded' in history_record:
-                    # Extract the actual message objects
-                    messages_in_record.extend([item['message'] for item in history_record['messagesAdded']])
-
-                # Check for labels being added (like 'INBOX' or 'UNREAD')
-                if 'labelsAdded' in history_record:
-                    for label_event in history_record['labelsAdded']:
-                        # We only care if the 'INBOX' label was added, signifying a new arrival
-                        if 'INBOX' in label_event.get('labelIds', []):
-                             messages_in_record.extend(label_event['messages'])
-
-                # Now process all unique messages found in this history record
-                processed_ids_in_record = set()
-                for message_summary in messages_in_record:
-                    msg_id = message_summary['id']
-                    
-                    # Avoid processing the same message twice within the same history event
-                    if msg_id in processed_ids_in_record:
-                        continue
-                    processed_ids_in_record.add(msg_id)
-
-                    # Final check: is the message actually new and not already processed by a previous run?
-                    if not gmail_history_tracker.is_message_processed(msg_id):
-                        metadata = _get_message_metadata(msg_id, service)
-                        
-                        print(f">>> [DEEPER_DEBUG] Evaluating message metadata: {metadata}")
-
-                        if metadata and gmail_history_tracker.get_current_email_address() and \
-                           metadata['delivered_to'] == gmail_history_tracker.get_current_email_address().lower():
-                            
-                            messages_to_process_raw.append(metadata)
-                            print(f"SUCCESS: Found new mail '{metadata['subject']}' (ID: {msg_id}). Queued for notification.")
-                        
-                        else:
-                            known_email = gmail_history_tracker.get_current_email_address()
-                            if not metadata:
-                                print(f">>> [DEEPER_DEBUG] SKIPPED message {msg_id} because metadata was None.")
-                            else:
-                                print(f">>> [DEEPER_DEBUG] SKIPPED message '{metadata.get('subject', 'N/A')}' because of email mismatch.")
-                                print(f"    - Expected 'Delivered-To': '{known_email.lower() if known_email else 'Unknown'}'")
-                                print(f"    -  Actual 'Delivered-To': '{metadata.get('delivered_to', 'Not Found')}'")
-            # --- END OF THE DEFINITIVE FIX ---
-
-            next_page_token = history_response.get('nextPageToken')
-            if not next_page_token:
-                break
-            time.sleep(0.1) 
-
-        messages_to_process_raw.sort(key=lambda x: (x['historyId'], x['id']))
-        
-        print(f"DEBUG: fetch_new_messages_for_processing_from_api: Total {len(messages_to_process_raw)} raw messages fetched via history API.")
-        
-        return messages_to_process_raw, current_gmail_api_history_id
-    
-    except HttpError as error:
-        if error.resp.status == 404 and "startHistoryId" in str(error):
-            print(f"WARNING: history.list 404 for startHistoryId {effective_start_history_id}. History too old or invalid. Performing full unread sync to re-establish base. Error: {error._get_reason()}")
-            return _fetch_unread_and_get_history_id_fallback(service)
-        raise
-    except Exception as e:
-        print(f"An unexpected error occurred in fetch_new_messages_for_processing_from_api: {e}")
-        raise e
+        if page_token:
+            # Everything up to the last record of this page has been seen.
+            checkpoint = max((int(record['id']) for record in history_list), default=start_history_id)
+            if messages or checkpoint > start_history_id:
+                yield messages, checkpoint
+            continue
+
+        yield messages, int(history_response.get('historyId', start_history_id))
+        return
+
+def fetch_new_messages_for_processing_from_api(start_history_id: int | None = None) -> tuple[list, int]:
+    """
+    Non-streaming form of iter_new_message_batches: returns every new message
+    and the final historyId.
+    """
+    all_messages, last_history_id = [], start_history_id or 0
+    for messages, checkpoint in iter_new_message_batches(start_history_id):
+        all_messages.extend(messages)
+        last_history_id = checkpoint
+    print(f"DEBUG: fetch_new_messages_for_processing_from_api: Total {len(all_messages)} messages fetched via history API.")
+    return all_messages, last_history_id
 
 def _fetch_unread_and_get_history_id_fallback(service) -> tuple[list, int]:
     messages_to_process = []
@@ -236,12 +499,16 @@ def _fetch_unread_and_get_history_id_fallback(service) -> tuple[list, int]:
 
     print("DEBUG: Performing unread list sync as fallback.")
     unread_messages_list = _fetch_messages_from_list_api(label_ids=['INBOX', 'UNREAD'], max_results=50) 
+    current_email = (gmail_history_tracker.get_current_email_address() or '').lower()
+    processed_ids = gmail_history_tracker.get_processed_message_ids()
     
+    indexed_metadata = []
     for msg_summary in unread_messages_list:
         metadata = _get_message_metadata(msg_summary['id'], service)
-        if metadata and gmail_history_tracker.get_current_email_address() and \
-           metadata['delivered_to'] == gmail_history_tracker.get_current_email_address().lower():
-            if not gmail_history_tracker.is_message_processed(metadata['id']):
+        if metadata:
+            indexed_metadata.append(metadata)
+        if metadata and current_email and metadata['delivered_to'] == current_email:
+            if metadata['id'] not in processed_ids:
                 messages_to_process.append(metadata)
                 if metadata['historyId'] > highest_history_id_in_fetch:
                     highest_history_id_in_fetch = metadata['historyId']
@@ -249,9 +516,50 @@ def _fetch_unread_and_get_history_id_fallback(service) -> tuple[list, int]:
             else:
                 print(f"DEBUG: Fallback list fetch: Skipping message {metadata['id']} ('{metadata['subject']}'): Already processed by tracker.")
     
+    mail_index.upsert_messages(indexed_metadata)
+
     if not messages_to_process and highest_history_id_in_fetch == 0:
         highest_history_id_in_fetch = get_latest_history_id_from_gmail_api()
         print(f"DEBUG: Fallback list fetch: No truly new unread messages, setting historyId to current API history: {highest_history_id_in_fetch}")
 
     messages_to_process.sort(key=lambda x: (x['historyId'], x['id']))
-    return messages_to_process, highest_history_id_in_fetch
\ No newline at end of file
+    return messages_to_process, highest_history_id_in_fetch
+
+def backfill_mail_index(max_messages: int | None = None) -> int:
+    """
+    Seeds an empty mail index with the metadata of the newest messages, so
+    search works before the history sync has seen much mail. Returns the
+    number of messages indexed (0 if the index already had entries).
+    """
+    max_messages = config.MAIL_INDEX_BACKFILL if max_messages is None else max_messages
+    if max_messages <= 0 or mail_index.count() > 0:
+        return 0
+
+    service = build_google_service('gmail', 'v1')
+    message_ids, page_token = [], None
+    while len(message_ids) < max_messages:
+        response = service.users().messages().list(
+            userId='me', maxResults=min(500, max_messages - len(message_ids)), pageToken=page_token
+        ).execute()
+        message_ids.extend(message['id'] for message in response.get('messages', []))
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            break
+
+    fetched = batch_get_messages(message_ids, service, format='metadata', metadataHeaders=['Subject', 'From'])
+    entries = []
+    for message_id, msg in fetched.items():
+        headers = msg.get('payload', {}).get('headers', [])
+        entries.append({
+            'id': message_id,
+            'threadId': msg.get('threadId'),
+            'subject': next((i['value'] for i in headers if i['name'] == 'Subject'), 'No Subject'),
+            'sender': next((i['value'] for i in headers if i['name'] == 'From'), 'Unknown Sender'),
+            'snippet': msg.get('snippet', ''),
+            'labelIds': msg.get('labelIds', []),
+            'internalDate': int(msg.get('internalDate', 0)),
+            'historyId': int(msg.get('historyId', 0)),
+        })
+    mail_index.upsert_messages(entries)
+    print(f"DEBUG: Mail index backfilled with {len(entries)} messages.")
+    return len(entries)
@@ -0,0 +1,198 @@
+# File: src/agent/tools/mail_index.py
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from src.core import config, user_context
+
+# A local index of Gmail message metadata (never bodies) kept current by the
+# history sync in gmail.py. Sender, subject and snippet are searchable through
+# an SQLite FTS5 table, so mail questions don't need live list/get calls.
+
+MAIL_INDEX_FILE = "mail_index.db"  # per user, see user_context.user_data_path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    thread_id TEXT,
+    sender TEXT NOT NULL DEFAULT '',
+    subject TEXT NOT NULL DEFAULT '',
+    snippet TEXT NOT NULL DEFAULT '',
+    labels TEXT NOT NULL DEFAULT '',
+    date INTEGER NOT NULL DEFAULT 0,
+    history_id INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS messages_date ON messages (date);
+CREATE INDEX IF NOT EXISTS messages_thread ON messages (thread_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    sender, subject, snippet, content='messages', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, sender, subject, snippet) VALUES (new.rowid, new.sender, new.subject, new.snippet);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, sender, subject, snippet)
+    VALUES ('delete', old.rowid, old.sender, old.subject, old.snippet);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE OF sender, subject, snippet ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, sender, subject, snippet)
+    VALUES ('delete', old.rowid, old.sender, old.subject, old.snippet);
+    INSERT INTO messages_fts (rowid, sender, subject, snippet) VALUES (new.rowid, new.sender, new.subject, new.snippet);
+END;
+"""
+
+# One connection per user's index file, for the AURA_USER_CACHE_SIZE most
+# recently used ones.
+_connections: OrderedDict[str, sqlite3.Connection] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    # Connections are shared and serialized by _lock; callers run in executor threads.
+    path = user_context.user_data_path(MAIL_INDEX_FILE)
+    connection = _connections.get(path)
+    if connection is None:
+        user_context.ensure_user_data_dir()
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        _connections[path] = connection
+    _connections.move_to_end(path)
+    while len(_connections) > config.AURA_USER_CACHE_SIZE:
+        _connections.popitem(last=False)[1].close()
+    return connection
+
+
+def _labels_text(label_ids) -> str:
+    # Stored as ' INBOX UNREAD ' so a label can be matched with LIKE '% INBOX %'.
+    return f" {' '.join(label_ids)} " if label_ids else ''
+
+
+def upsert_messages(messages: list):
+    """
+    Adds or refreshes index entries. Each message is a dict with 'id' and any of
+    'threadId', 'sender', 'subject', 'snippet', 'labelIds', 'internalDate'
+    (epoch ms) and 'historyId', as returned by gmail._get_message_metadata.
+    """
+    rows = [(
+        message['id'],
+        message.get('threadId'),
+        message.get('sender') or '',
+        message.get('subject') or '',
+        message.get('snippet') or '',
+        _labels_text(message.get('labelIds')),
+        int(message.get('internalDate') or 0),
+        int(message.get('historyId') or 0),
+    ) for message in messages if message and message.get('id')]
+    if not rows:
+        return
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.executemany(
+                """INSERT INTO messages (id, thread_id, sender, subject, snippet, labels, date, history_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       thread_id = excluded.thread_id, sender = excluded.sender, subject = excluded.subject,
+                       snippet = excluded.snippet, labels = excluded.labels, date = excluded.date,
+                       history_id = MAX(history_id, excluded.history_id)""",
+                rows,
+            )
+
+
+def remove_messages(message_ids: list):
+    if not message_ids:
+        return
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.executemany("DELETE FROM messages WHERE id = ?", [(message_id,) for message_id in message_ids])
+
+
+def update_labels(message_ids: list, added: list | None = None, removed: list | None = None):
+    """Adds/removes labels on indexed messages; IDs that aren't indexed are ignored."""
+    if not message_ids:
+        return
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            for message_id in message_ids:
+                row = connection.execute("SELECT labels FROM messages WHERE id = ?", (message_id,)).fetchone()
+                if row is None:
+                    continue
+                labels = [label for label in row['labels'].split() if label not in (removed or [])]
+                labels.extend(label for label in (added or []) if label not in labels)
+                connection.execute("UPDATE messages SET labels = ? WHERE id = ?", (_labels_text(labels), message_id))
+
+
+def apply_history_record(record: dict):
+    """Applies the deletions and label changes of one history record to the index."""
+    deleted = [item['message']['id'] for item in record.get('messagesDeleted', [])]
+    if deleted:
+        remove_messages(deleted)
+    for item in record.get('labelsAdded', []):
+        update_labels([item['message']['id']], added=item.get('labelIds', []))
+    for item in record.get('labelsRemoved', []):
+        update_labels([item['message']['id']], removed=item.get('labelIds', []))
+
+
+def count() -> int:
+    with _lock:
+        return _get_connection().execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+
+def _fts_query(text: str) -> str:
+    # Every word must match (as a prefix), in any of the indexed columns.
+    words = [word.replace('"', '') for word in text.split()]
+    return ' '.join(f'"{word}"*' for word in words if word)
+
+
+def search(query: str = "", sender: str = "", after_ms: int | None = None, before_ms: int | None = None,
+           label: str | None = None, limit: int = 20) -> list[dict]:
+    """
+    Searches the index. `query` is matched word by word against sender,
+    subject and snippet; `sender` is a case-insensitive substring of the From
+    header. Results are ranked by relevance when there is a query, otherwise
+    newest first.
+    """
+    clauses, params = [], []
+    fts = _fts_query(query)
+    if fts:
+        sql = "SELECT m.* FROM messages_fts JOIN messages m ON m.rowid = messages_fts.rowid WHERE messages_fts MATCH ?"
+        params.append(fts)
+    else:
+        sql = "SELECT m.* FROM messages m WHERE 1 = 1"
+    if sender:
+        clauses.append("m.sender LIKE ? ESCAPE '\\'")
+        params.append('%' + sender.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    if after_ms is not None:
+        clauses.append("m.date >= ?")
+        params.append(after_ms)
+    if before_ms is not None:
+        clauses.append("m.date < ?")
+        params.append(before_ms)
+    if label:
+        clauses.append("m.labels LIKE ?")
+        params.append(f"% {label} %")
+    for clause in clauses:
+        sql += f" AND {clause}"
+    sql += " ORDER BY bm25(messages_fts), m.date DESC" if fts else " ORDER BY m.date DESC"
+    sql += " LIMIT ?"
+    params.append(limit)
+
+    with _lock:
+        rows = _get_connection().execute(sql, params).fetchall()
+    return [{
+        'id': row['id'],
+        'threadId': row['thread_id'],
+        'sender': row['sender'],
+        'subject': row['subject'],
+        'snippet': row['snippet'],
+        'labels': row['labels'].split(),
+        'date': datetime.fromtimestamp(row['date'] / 1000, tz=timezone.utc).isoformat() if row['date'] else None,
+    } for row in rows]
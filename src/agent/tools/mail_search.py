@@ -0,0 +1,71 @@
+# File: src/agent/tools/mail_search.py
+
+from datetime import datetime, timedelta, timezone
+
+from src.agent.tools import gmail as gmail_tool
+from src.agent.tools import mail_index
+from src.agent.tools.mail_summary import truncate_to_token_budget
+
+# Mail questions are answered from the local metadata index; only reading a
+# message's body goes to the Gmail API.
+
+MAX_SEARCH_RESULTS = 50
+READ_EMAIL_TOKEN_BUDGET = 1500
+
+
+def _date_to_ms(value: str) -> int:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def search_mail(query: str = "", sender: str = "", days_back: int = 0, after_date: str = "",
+                before_date: str = "", unread_only: bool = False, max_results: int = 10) -> list:
+    """
+    Searches the user's email by words in the sender, subject and preview text, by sender and by date.
+    Use this for questions like "did Alice email me about the invoice last week?".
+
+    Args:
+        query: Words to look for, e.g. "invoice march". Leave empty to match any email.
+        sender: Part of the sender's name or address, e.g. "alice" or "@github.com".
+        days_back: Only emails from the last N days (0 means no limit).
+        after_date: Only emails on or after this date, in YYYY-MM-DD format.
+        before_date: Only emails before this date, in YYYY-MM-DD format.
+        unread_only: Only unread emails.
+        max_results: Maximum number of emails to return (at most 50).
+
+    Returns:
+        A list of matching emails with 'id', 'threadId', 'sender', 'subject', 'snippet',
+        'labels' and 'date' (ISO 8601, UTC), best matches first. Use read_email with an
+        'id' to read the full text.
+    """
+    after_ms = _date_to_ms(after_date) if after_date else None
+    if days_back and days_back > 0:
+        cutoff = int((datetime.now(timezone.utc) - timedelta(days=days_back)).timestamp() * 1000)
+        after_ms = max(after_ms or 0, cutoff)
+    before_ms = _date_to_ms(before_date) if before_date else None
+
+    results = mail_index.search(
+        query=query,
+        sender=sender,
+        after_ms=after_ms,
+        before_ms=before_ms,
+        label='UNREAD' if unread_only else None,
+        limit=max(1, min(int(max_results), MAX_SEARCH_RESULTS)),
+    )
+    return results
+
+
+def read_email(message_id: str) -> dict:
+    """
+    Reads the text of one email. Use an 'id' returned by search_mail.
+
+    Args:
+        message_id: The id of the email to read.
+
+    Returns:
+        A dictionary with 'id' and 'body' (the email text, shortened if very long).
+    """
+    body = gmail_tool.get_email_body(message_id)
+    return {'id': message_id, 'body': truncate_to_token_budget(body, READ_EMAIL_TOKEN_BUDGET) if body else "(This email has no text body.)"}
@@ -0,0 +1,103 @@
+# File: src/agent/tools/mail_summary.py
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from src.agent import core as agent_core
+from src.agent.tools import gmail as gmail_tool
+
+# Summarizes several unread mails with ONE structured LLM call instead of one
+# call per mail. Bodies are fetched with batched Gmail requests and cut to a
+# per-mail token budget so the prompt size stays predictable.
+
+CHARS_PER_TOKEN = 4  # rough average for English text
+MAX_EMAILS = 25
+DEFAULT_BODY_TOKEN_BUDGET = 300
+
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+SUMMARY_INSTRUCTIONS = (
+    "You triage a user's unread email. For every email below, write a one or two "
+    "sentence summary of what it says and what (if anything) the user needs to do, "
+    "and rate its priority: 'high' for time-sensitive or personally important mail "
+    "that needs action, 'medium' for mail worth reading soon, 'low' for newsletters, "
+    "notifications and promotions. Return exactly one entry per email, using the "
+    "email's id as message_id."
+)
+
+
+class EmailSummary(BaseModel):
+    message_id: str = Field(description="The id of the email being summarized.")
+    summary: str = Field(description="One or two sentences on what the email says and any action needed.")
+    priority: Literal["high", "medium", "low"] = Field(description="How urgently the user should read this email.")
+
+
+class InboxSummary(BaseModel):
+    emails: list[EmailSummary] = Field(description="One summary per email, in any order.")
+
+
+def truncate_to_token_budget(text: str, max_tokens: int) -> str:
+    """Cuts text to roughly max_tokens tokens, preferring to break at a word boundary."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    space = cut.rfind(' ')
+    if space > max_chars * 0.8:
+        cut = cut[:space]
+    return cut.rstrip() + " [...]"
+
+
+def _build_prompt(emails: list, body_token_budget: int) -> str:
+    sections = [SUMMARY_INSTRUCTIONS]
+    for email in emails:
+        body = ' '.join((email.get('body') or '(no text body)').split())
+        sections.append(
+            f"--- Email id: {email['id']}\n"
+            f"From: {email['sender']}\n"
+            f"Subject: {email['subject']}\n"
+            f"Date: {email.get('date', '')}\n\n"
+            f"{truncate_to_token_budget(body, body_token_budget)}"
+        )
+    return "\n\n".join(sections)
+
+
+def summarize_unread_emails(max_emails: int = 10, body_token_budget: int = DEFAULT_BODY_TOKEN_BUDGET) -> list:
+    """
+    Summarizes the user's most recent unread inbox emails and rates each one's priority.
+    Use this when the user asks what is in their inbox or to summarize their unread mail.
+
+    Args:
+        max_emails: How many unread emails to summarize (at most 25).
+        body_token_budget: Approximate number of tokens of each email's body to read.
+
+    Returns:
+        A list of dictionaries with 'id', 'sender', 'subject', 'date', 'priority' and
+        'summary', ordered from highest to lowest priority.
+    """
+    max_emails = max(1, min(int(max_emails), MAX_EMAILS))
+    emails = gmail_tool.fetch_unread_emails_with_bodies(max_emails)
+    if not emails:
+        return []
+
+    model = agent_core.get_model()
+    if model is None:
+        raise RuntimeError("No active LLM is configured. Use !usemodel to select one.")
+
+    result = model.with_structured_output(InboxSummary).invoke(_build_prompt(emails, body_token_budget))
+    summaries = {item.message_id: item for item in (result.emails if result else [])}
+
+    digest = []
+    for email in emails:
+        item = summaries.get(email['id'])
+        digest.append({
+            'id': email['id'],
+            'sender': email['sender'],
+            'subject': email['subject'],
+            'date': email.get('date', ''),
+            'priority': item.priority if item else 'medium',
+            'summary': item.summary if item else "(No summary was returned for this email.)",
+        })
+    digest.sort(key=lambda entry: PRIORITY_ORDER[entry['priority']])
+    return digest
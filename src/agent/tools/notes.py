@@ -1,26 +1,11 @@
 # File: src/agent/tools/notes.py
 
-import json
-import os
 from datetime import datetime
 
-# Define the path for our notes JSON file
-NOTES_FILE = "notes.json"
+from src.core import storage
 
-def _load_notes() -> dict:
-    """Loads notes from the JSON file. Returns an empty dict if file doesn't exist."""
-    if not os.path.exists(NOTES_FILE):
-        return {}
-    try:
-        with open(NOTES_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {}
-
-def _save_notes(notes: dict):
-    """Saves the dictionary of notes to the JSON file."""
-    with open(NOTES_FILE, 'w') as f:
-        json.dump(notes, f, indent=4)
+# Notes are records keyed by their normalized key in the current user's store (see src/core/storage.py)
+NOTES_COLLECTION = storage.register_collection("notes")
 
 def save_note(key: str, value: str) -> dict:
     """
@@ -33,7 +18,6 @@ def save_note(key: str, value: str) -> dict:
     Returns:
         The newly created note dictionary.
     """
-    notes = _load_notes()
     key = key.lower().strip() # Normalize the key for easier lookup
     
     note_data = {
@@ -41,8 +25,7 @@ def save_note(key: str, value: str) -> dict:
         "created_at": datetime.now().isoformat()
     }
     
-    notes[key] = note_data
-    _save_notes(notes)
+    storage.get_store().put_record(NOTES_COLLECTION, key, note_data)
     print(f"Note saved: '{key}' -> '{value}'")
     return {key: note_data}
 
@@ -56,9 +39,8 @@ def get_note(key: str) -> str | None:
     Returns:
         The value of the note, or None if not found.
     """
-    notes = _load_notes()
     key = key.lower().strip()
-    note_data = notes.get(key)
+    note_data = storage.get_store().get_record(NOTES_COLLECTION, key)
     
     if note_data:
         return note_data.get('value')
@@ -71,7 +53,15 @@ def list_notes() -> dict:
     Returns:
         A dictionary of all notes.
     """
-    return _load_notes()
+    return dict(storage.get_store().list_records(NOTES_COLLECTION))
+
+def list_notes_page(offset: int = 0, limit: int = 10) -> tuple[dict, int]:
+    """
+    One page of notes for paginated views. Returns the notes on the page and
+    the total number of notes.
+    """
+    store = storage.get_store()
+    return dict(store.list_records(NOTES_COLLECTION, offset=offset, limit=limit)), store.count_records(NOTES_COLLECTION)
 
 def delete_note(key: str) -> bool:
     """
@@ -83,12 +73,9 @@ def delete_note(key: str) -> bool:
     Returns:
         True if the note was deleted, False otherwise.
     """
-    notes = _load_notes()
     key = key.lower().strip()
     
-    if key in notes:
-        del notes[key]
-        _save_notes(notes)
+    if storage.get_store().delete_record(NOTES_COLLECTION, key):
         print(f"Note deleted: '{key}'")
         return True
     return False
\ No newline at end of file
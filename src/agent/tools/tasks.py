@@ -1,27 +1,12 @@
 # File: src/agent/tools/tasks.py
 
-import json
-import os
 import uuid
 from datetime import datetime
 
-# Define the path for our tasks JSON file
-TASKS_FILE = "tasks.json"
+from src.core import storage
 
-def _load_tasks() -> list:
-    """Loads tasks from the JSON file. Returns an empty list if file doesn't exist."""
-    if not os.path.exists(TASKS_FILE):
-        return []
-    try:
-        with open(TASKS_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
-
-def _save_tasks(tasks: list):
-    """Saves the list of tasks to the JSON file."""
-    with open(TASKS_FILE, 'w') as f:
-        json.dump(tasks, f, indent=4)
+# Tasks are records keyed by their ID in the current user's store (see src/core/storage.py)
+TASKS_COLLECTION = storage.register_collection("tasks")
 
 def add_task(description: str) -> dict:
     """
@@ -33,15 +18,13 @@ def add_task(description: str) -> dict:
     Returns:
         The newly created task dictionary.
     """
-    tasks = _load_tasks()
     new_task = {
         "id": str(uuid.uuid4())[:8],  # A short, unique ID
         "description": description,
         "status": "pending",
         "created_at": datetime.now().isoformat()
     }
-    tasks.append(new_task)
-    _save_tasks(tasks)
+    storage.get_store().put_record(TASKS_COLLECTION, new_task["id"], new_task)
     print(f"Task added: {new_task}")
     return new_task
 
@@ -55,10 +38,18 @@ def list_tasks(status_filter: str = None) -> list:
     Returns:
         A list of task dictionaries.
     """
-    tasks = _load_tasks()
-    if status_filter:
-        return [task for task in tasks if task['status'] == status_filter]
-    return tasks
+    where = {"status": status_filter} if status_filter else None
+    return [task for _, task in storage.get_store().list_records(TASKS_COLLECTION, where=where)]
+
+def list_tasks_page(status_filter: str = None, offset: int = 0, limit: int = 10) -> tuple[list, int]:
+    """
+    One page of tasks for paginated views, optionally filtered by status.
+    Returns the page and the total number of matching tasks.
+    """
+    store = storage.get_store()
+    where = {"status": status_filter} if status_filter else None
+    page = [task for _, task in store.list_records(TASKS_COLLECTION, where=where, offset=offset, limit=limit)]
+    return page, store.count_records(TASKS_COLLECTION, where=where)
 
 def mark_task_complete(task_id: str) -> dict | None:
     """
@@ -70,16 +61,12 @@ def mark_task_complete(task_id: str) -> dict | None:
     Returns:
         The updated task dictionary, or None if the task was not found.
     """
-    tasks = _load_tasks()
-    task_found = None
-    for task in tasks:
-        if task['id'] == task_id:
-            task['status'] = 'completed'
-            task_found = task
-            break
-    
+    store = storage.get_store()
+    task_found = store.get_record(TASKS_COLLECTION, task_id)
+
     if task_found:
-        _save_tasks(tasks)
+        task_found['status'] = 'completed'
+        store.put_record(TASKS_COLLECTION, task_id, task_found)
         print(f"Task marked complete: {task_found}")
         return task_found
     else:
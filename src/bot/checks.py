@@ -0,0 +1,18 @@
+# File: src/bot/checks.py
+
+from discord.ext import commands
+
+from src.core import user_context
+
+
+def is_aura_user():
+    """
+    Like commands.is_owner(), but also admits the team members listed in
+    AURA_USER_IDS. Commands run as their author (see AuraBot.setup_hook), so
+    each member works with their own Google account, tasks and notes.
+    """
+    async def predicate(ctx: commands.Context) -> bool:
+        if not user_context.is_allowed(ctx.author.id):
+            raise commands.CheckFailure("You are not set up to use Aura.")
+        return True
+    return commands.check(predicate)
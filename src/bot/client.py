@@ -6,12 +6,15 @@ import os
 from discord.ext import commands
 from discord.ext.commands import Bot
 
-from src.core import config
+from src.core import config, executors, gcp_auth, model_manager, user_context
 from src.agent import invoker
-from src.bot import webserver
+from src.bot import mail_delivery, mail_sequencer, webserver
+from src.bot.mail_poller import AdaptiveMailPoller
+from src.bot.ui.event_ui import EventEditButton
+from src.bot.warmup import Warmup
+from src.bot.watch_scheduler import WatchRenewalScheduler
+from src.core.loop_watchdog import LoopWatchdog
 from src.agent.tools import gmail as gmail_tool
-import gmail_history_tracker
-from gmail_history_tracker import GMAIL_PROCESSING_LOCK # <-- IMPORT THE LOCK
 
 class AuraBot(commands.Bot):
     def __init__(self):
@@ -19,8 +22,16 @@ class AuraBot(commands.Bot):
         intents.message_content = True
         intents.members = True
         super().__init__(command_prefix='!', intents=intents, owner_id=config.DISCORD_OWNER_ID)
+        # Every command runs as its author (see src/core/user_context.py).
+        self.before_invoke(self._enter_user_context)
+
+    async def _enter_user_context(self, ctx: commands.Context):
+        # The hook runs in the command's own task, right before the command.
+        user_context.set_user(ctx.author.id)
 
     async def setup_hook(self):
+        model_manager.initialize_configs()
+
         print("Loading cogs...")
         for filename in os.listdir('./src/bot/cogs'):
             if filename.endswith('.py') and not filename.startswith('__'):
@@ -29,65 +40,84 @@ class AuraBot(commands.Bot):
                 except Exception as e:
                     print(f'  - Failed to load {filename}: {e}')
         
+        # Event card buttons are routed by custom_id, including cards posted before a restart.
+        self.add_dynamic_items(EventEditButton)
+
         webserver.run_webserver(self) 
 
+        self.warmup = Warmup(self.loop)
+        self.warmup.start()
+
+        self.loop_watchdog = LoopWatchdog(self.loop, threshold=config.LOOP_LAG_THRESHOLD_MS / 1000)
+        self.loop_watchdog.start()
+
+        # New mail arrives either by Gmail push (webhook mode, with each user's
+        # watch kept renewed) or by adaptive polling of every user's mailbox.
+        self.watch_schedulers: dict[int, WatchRenewalScheduler] = {}
+        self.mail_poller = None
+        if config.GMAIL_SYNC_MODE == "polling":
+            self.mail_poller = AdaptiveMailPoller(self)
+            self.mail_poller.start()
+        else:
+            for user_id in user_context.known_user_ids():
+                self.get_watch_scheduler(user_id)
+
+    def get_watch_scheduler(self, user_id: int) -> WatchRenewalScheduler | None:
+        """The user's watch renewal scheduler, started on first use. None in polling mode."""
+        if config.GMAIL_SYNC_MODE == "polling":
+            return None
+        if user_id not in self.watch_schedulers:
+            self.watch_schedulers[user_id] = WatchRenewalScheduler(self, user_id)
+            self.watch_schedulers[user_id].start()
+        return self.watch_schedulers[user_id]
+
+    async def close(self):
+        if getattr(self, 'loop_watchdog', None):
+            self.loop_watchdog.stop()
+        for scheduler in getattr(self, 'watch_schedulers', {}).values():
+            scheduler.stop()
+        if getattr(self, 'mail_poller', None):
+            self.mail_poller.stop()
+        mail_sequencer.stop_all()
+        mail_delivery.stop_all()
+        await super().close()
+        executors.shutdown_all()
+
     async def on_ready(self):
         print('------')
         print(f'Logged on as {self.user} ({self.user.id})')
         print('Aura is online and ready.')
         print('------')
 
-        self.loop.create_task(self.run_initial_gmail_sync())
+        # Each user's mailbox is caught up independently and concurrently.
+        for user_id in user_context.known_user_ids():
+            self.start_mail_for_user(user_id)
+
+    def start_mail_for_user(self, user_id: int):
+        """Starts the initial sync and index backfill of a user's mailbox, e.g. on startup or after !auth."""
+        with user_context.as_user(user_id):
+            if not gcp_auth.has_credentials():
+                print(f"SYNC: User {user_id} has not connected a Google account yet. Skipping.")
+                return
+            # Tasks copy the current context, so both run as this user. The
+            # delivery worker first settles anything left in the outbox.
+            mail_delivery.get_worker(self)
+            self.loop.create_task(self.run_initial_gmail_sync())
+            self.loop.create_task(self.backfill_mail_index())
+        if self.mail_poller:
+            self.mail_poller.add_user(user_id)
 
     async def run_initial_gmail_sync(self):
-        async with GMAIL_PROCESSING_LOCK: # <-- ACQUIRE THE LOCK
-            print("\n--- [LOCKED] Initiating initial Gmail sync ---")
-            try:
-                last_tracker_history_id = gmail_history_tracker.get_last_history_id()
-
-                if last_tracker_history_id is None:
-                    print("SYNC: First-time setup. Performing a 'Fresh Start'.")
-                    current_api_history_id = await self.loop.run_in_executor(None, gmail_tool.get_latest_history_id_from_gmail_api)
-                    gmail_history_tracker.set_last_history_id(current_api_history_id)
-                    
-                    service = await self.loop.run_in_executor(None, gmail_tool.build_google_service, 'gmail', 'v1')
-                    profile = await self.loop.run_in_executor(None, service.users().getProfile(userId='me').execute)
-                    tracker_email_address = profile.get('emailAddress')
-                    gmail_history_tracker.set_current_email_address(tracker_email_address)
-                    print(f"SYNC: Baseline established for {tracker_email_address}.")
-                    
-                    print("--- [UNLOCKED] Initial 'Fresh Start' sync complete ---\n")
-                    return
-
-                print("SYNC: Existing history found. Syncing messages since last run...")
-                messages_to_process, new_history_id_to_save = await self.loop.run_in_executor(
-                    None, gmail_tool.fetch_new_messages_for_processing_from_api, last_tracker_history_id
-                )
-
-                if messages_to_process:
-                    print(f"SYNC: Found {len(messages_to_process)} catch-up messages. Notifying owner.")
-                    owner = self.get_user(config.DISCORD_OWNER_ID)
-                    if owner:
-                        for msg in messages_to_process:
-                            await owner.send(
-                                f"📧 Catch-up Mail: **{msg['subject']}** from **{msg['sender'].split('<')[0].strip()}**"
-                            )
-                            await self.loop.run_in_executor(None, gmail_tool.mark_message_as_read, msg['id'])
-                            gmail_history_tracker.add_processed_message_id(msg['id'])
-                        
-                        gmail_history_tracker.set_last_history_id(new_history_id_to_save)
-                    else:
-                        print("SYNC WARNING: Owner not found, cannot send DMs.")
-                else:
-                    print("SYNC: No new messages found. Advancing history tracker.")
-                    current_api_history = await self.loop.run_in_executor(None, gmail_tool.get_latest_history_id_from_gmail_api)
-                    if current_api_history > (last_tracker_history_id or 0):
-                        gmail_history_tracker.set_last_history_id(current_api_history)
-
-            except Exception as e:
-                print(f"SYNC ERROR: {e}")
-            
-            print("--- [UNLOCKED] Initial sync complete ---\n")
+        try:
+            await mail_sequencer.request_sync(self, "initial_sync", "Catch-up Mail", kind=mail_sequencer.INITIAL)
+        except Exception as e:
+            print(f"SYNC ERROR: {e}")
+
+    async def backfill_mail_index(self):
+        try:
+            await executors.run_in(executors.GOOGLE_API, gmail_tool.backfill_mail_index)
+        except Exception as e:
+            print(f"SYNC WARNING: Could not backfill the mail index: {e}")
     
     # ... (rest of the file is the same)
     async def on_message(self, message: discord.Message):
@@ -102,9 +132,38 @@ class AuraBot(commands.Bot):
         is_a_mention = self.user.mentioned_in(message)
 
         if is_in_aura_channel or is_a_mention:
-            await invoker.handle_mention(message)
+            if not user_context.is_allowed(message.author.id):
+                if is_a_mention:
+                    await message.reply("You are not set up to use Aura.")
+                return
+            await self.wait_for_agent_warmup(message)
+            # The agent's tools work on the author's own account and stores.
+            with user_context.as_user(message.author.id):
+                await invoker.handle_mention(message)
+            return
+
+    async def wait_for_agent_warmup(self, message: discord.Message):
+        """
+        Holds early mentions until the background warmup has the agent ready,
+        showing a "warming up" reaction instead of letting every early mention
+        pay the cold start on its own.
+        """
+        if self.warmup.is_ready("agent", "gemini"):
             return
 
+        try:
+            await message.add_reaction('⏳')
+        except discord.HTTPException:
+            pass
+
+        if not await self.warmup.wait_for("agent", "gemini", timeout=config.WARMUP_WAIT_TIMEOUT):
+            print("WARMUP WARNING: Agent still warming up after timeout. Handling mention anyway.")
+
+        try:
+            await message.remove_reaction('⏳', self.user)
+        except discord.HTTPException:
+            pass
+
 def run_bot():
     bot = AuraBot()
     if config.DISCORD_BOT_TOKEN:
@@ -1,31 +1,51 @@
-# File: src/bot/cogs/auth_cog.py (Standard Local Server Flow)
+# File: src/bot/cogs/auth_cog.py
 
 import discord
 import asyncio
-import os
 from discord.ext import commands
 from discord.ext.commands import Bot
 
-from src.core import gcp_auth
+from src.bot import checks
+
+from src.core import executors, gcp_auth
+
+# How long the bot waits for the redirected address after sending the link.
+AUTH_TIMEOUT_SECONDS = 600
 
 class AuthCog(commands.Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
 
     @commands.command(name='auth', help='Authenticate with your Google account.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def auth(self, ctx: commands.Context):
-        """Starts the Google authentication process."""
+        """
+        Starts the Google authentication process. The consent link is sent by
+        DM, so each user signs in with their own Google account on their own
+        device and pastes the address Google sends them to back into the DM.
+        """
         try:
-            await ctx.author.send(
-                "Starting Google authentication...\n\n"
-                "A URL will be printed in the bot's console. You **must** open this URL "
-                "in a browser **on the same computer the bot is running on**."
+            flow, url, state = await executors.run_in(executors.AUTH, gcp_auth.start_auth_flow)
+            dm = await ctx.author.send(
+                "**Connect your Google account**\n"
+                f"1. Open this link and allow access: <{url}>\n"
+                "2. Your browser then shows an error page for `localhost` — that is expected.\n"
+                "3. Copy the whole address from the address bar and paste it here.\n"
+                f"This link expires in {AUTH_TIMEOUT_SECONDS // 60} minutes."
             )
             await ctx.message.add_reaction('✅')
 
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, gcp_auth.run_auth_flow)
+            def is_reply(message: discord.Message) -> bool:
+                return message.author.id == ctx.author.id and message.channel.id == dm.channel.id
+
+            try:
+                reply = await self.bot.wait_for('message', check=is_reply, timeout=AUTH_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                return await ctx.author.send("⌛ Authentication timed out. Run `!auth` again when you are ready.")
+
+            await executors.run_in(executors.AUTH, gcp_auth.finish_auth_flow, flow, state, reply.content)
+            # Establish this user's Gmail baseline and start watching their mail.
+            self.bot.start_mail_for_user(ctx.author.id)
             
             embed = discord.Embed(
                 title="✅ Authentication Successful",
@@ -38,10 +58,10 @@ class AuthCog(commands.Cog):
             await ctx.message.add_reaction('❌')
 
     @commands.command(name='deauth', help='De-authenticate.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def deauth(self, ctx: commands.Context):
-        if os.path.exists("token.json"):
-            os.remove("token.json")
+        if gcp_auth.has_credentials():
+            gcp_auth.clear_credentials()
             await ctx.send("✅ Successfully de-authenticated.")
         else:
             await ctx.send("I am not currently authenticated.")
@@ -0,0 +1,83 @@
+# File: src/bot/cogs/diagnostics_cog.py
+
+import io
+import discord
+from discord.ext import commands
+from discord.ext.commands import Bot
+
+from src.core.profiling import PROFILER
+
+class DiagnosticsCog(commands.Cog):
+    """
+    A cog for owner-only performance diagnostics.
+    """
+    def __init__(self, bot: Bot):
+        self.bot = bot
+
+    @commands.command(name='profile', help='Profiles the next N agent or webhook runs.')
+    @commands.is_owner()
+    async def profile(self, ctx: commands.Context, runs: int = 1):
+        """
+        Samples stacks during the next N handle_mention/webhook runs and posts
+        a collapsed-stack flamegraph file plus a top-functions table.
+        Usage: !profile 3   (use !profile 0 to cancel)
+        """
+        if runs <= 0:
+            PROFILER.disarm()
+            return await ctx.send("🛑 Profiler disarmed.")
+        if runs > 50:
+            return await ctx.send("❌ Please profile at most 50 runs at a time.")
+
+        channel = ctx.channel
+
+        async def send_report(collapsed: str, top_functions: str, summary: str):
+            files = [
+                discord.File(io.BytesIO(collapsed.encode('utf-8')), filename="profile_collapsed.txt"),
+                discord.File(io.BytesIO(top_functions.encode('utf-8')), filename="profile_top.txt"),
+            ]
+            await channel.send(
+                f"📊 {summary}\n`profile_collapsed.txt` can be loaded in speedscope or flamegraph.pl.",
+                files=files
+            )
+
+        PROFILER.arm(runs, send_report)
+        await ctx.send(f"🔬 Profiler armed for the next {runs} agent/webhook run(s). The report will be posted here.")
+
+    @commands.command(name='looplag', help='Shows the worst event-loop blocking callers.')
+    @commands.is_owner()
+    async def loop_lag(self, ctx: commands.Context, action: str = None):
+        """
+        Lists the callers that blocked the event loop the longest.
+        Usage: !looplag   (use !looplag reset to clear the record)
+        """
+        watchdog = getattr(self.bot, 'loop_watchdog', None)
+        if watchdog is None:
+            return await ctx.send("The event-loop watchdog is not running.")
+
+        if action == 'reset':
+            watchdog.reset()
+            return await ctx.send("🧹 Event-loop lag record cleared.")
+
+        offenders = watchdog.worst_offenders()
+        embed = discord.Embed(
+            title="🐢 Event-Loop Lag",
+            description=f"Threshold: **{watchdog.threshold * 1000:.0f} ms** · Worst lag seen: **{watchdog.max_lag * 1000:.0f} ms**",
+            color=discord.Color.orange() if offenders else discord.Color.green()
+        )
+        if not offenders:
+            embed.description += "\nNo blocking calls over the threshold have been recorded."
+        for offender in offenders:
+            embed.add_field(
+                name=offender['caller'][:256],
+                value=f"{offender['count']} stall(s) · max {offender['max'] * 1000:.0f} ms · total {offender['total'] * 1000:.0f} ms",
+                inline=False
+            )
+        await ctx.send(embed=embed)
+
+        if offenders and offenders[0].get('stack'):
+            stack = offenders[0]['stack'][-1800:]
+            await ctx.send(f"Stack of the worst offender:\n```\n{stack}\n```")
+
+async def setup(bot: Bot):
+    """This special function is called by discord.py when loading a cog."""
+    await bot.add_cog(DiagnosticsCog(bot))
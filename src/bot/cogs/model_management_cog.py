@@ -4,9 +4,8 @@ import discord
 from discord.ext import commands
 from discord.ext.commands import Bot
 
-# Import our new manager and the core LLM loader
+# Import our new manager
 from src.core import model_manager
-from src.agent import core as agent_core
 
 class ModelManagementCog(commands.Cog):
     """
@@ -101,16 +100,9 @@ class ModelManagementCog(commands.Cog):
         """Usage: !usemodel <model_id>"""
         try:
             model_manager.set_active_model(model_id)
-            await ctx.send(f"🧠 Set active model to `{model_id}`. Reloading agent core...")
-            
-            # This is the crucial part: we call the function to reload the model.
-            agent_core.create_llm_instance()
-            
-            # We need to re-compile the graph with the new model instance
-            # This is an advanced step, for now we will just reload the instance
-            # and the next agent call will use it. A full reload is more complex.
-            
-            await ctx.send("✅ Agent core reloaded. Now using new model.")
+            # The agent core subscribes to model config changes and drops the
+            # old LLM; the next agent call builds and binds the new one.
+            await ctx.send(f"✅ Set active model to `{model_id}`. The next agent call will use it.")
         except Exception as e:
             await ctx.send(f"❌ Error setting active model: {e}")
 
@@ -4,8 +4,20 @@ import discord
 from discord.ext import commands
 from discord.ext.commands import Bot
 
+from src.bot import checks
+from src.bot.ui.list_ui import PagedListView
+
 # Import the functions from our new notes tool
 from src.agent.tools import notes as notes_tool
+from src.core import executors
+
+def _fetch_notes(_filter, offset: int, limit: int) -> tuple[list, int]:
+    notes, total = notes_tool.list_notes_page(offset, limit)
+    return list(notes.items()), total
+
+def _format_note(note: tuple) -> str:
+    key, data = note
+    return f"**`{key}`** : `{data['value']}`"
 
 class NotesCog(commands.Cog):
     """
@@ -15,14 +27,14 @@ class NotesCog(commands.Cog):
         self.bot = bot
 
     @commands.command(name='save', help='Saves a piece of information.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def save_note(self, ctx: commands.Context, key: str, value: str):
         """
         Saves a value under a specific key.
         Usage: !save "wifi password" "MyPassword123"
         """
         try:
-            notes_tool.save_note(key, value)
+            await executors.run_in(executors.STORAGE, notes_tool.save_note, key, value)
             embed = discord.Embed(
                 title="✅ Note Saved",
                 description=f"I will remember that **`{key}`** is **`{value}`**.",
@@ -33,14 +45,14 @@ class NotesCog(commands.Cog):
             await ctx.send(f"❌ An error occurred while saving the note: {e}")
 
     @commands.command(name='get', help='Retrieves a piece of information.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def get_note(self, ctx: commands.Context, key: str):
         """
         Gets the value for a specific key.
         Usage: !get "wifi password"
         """
         try:
-            value = notes_tool.get_note(key)
+            value = await executors.run_in(executors.STORAGE, notes_tool.get_note, key)
             if value:
                 embed = discord.Embed(
                     title=f"📝 Note for '{key}'",
@@ -53,41 +65,30 @@ class NotesCog(commands.Cog):
         except Exception as e:
             await ctx.send(f"❌ An error occurred while getting the note: {e}")
 
-    @commands.command(name='notes', help='Lists all saved notes.')
-    @commands.is_owner()
+    @commands.command(name='notes', help='Lists your saved notes, a page at a time.')
+    @checks.is_aura_user()
     async def list_notes(self, ctx: commands.Context):
         """
-        Displays all saved key-value notes.
+        Displays the saved key-value notes a page at a time.
         """
         try:
-            all_notes = notes_tool.list_notes()
-            if not all_notes:
-                await ctx.send("You haven't saved any notes yet.")
-                return
-
-            embed = discord.Embed(
-                title="🗒️ Your Saved Notes",
-                color=discord.Color.orange()
+            view = PagedListView(
+                ctx.author.id, _fetch_notes, _format_note, lambda _filter: "🗒️ Your Saved Notes",
+                empty_text="You haven't saved any notes yet.", color=discord.Color.orange()
             )
-            
-            notes_str = ""
-            for key, data in all_notes.items():
-                notes_str += f"**`{key}`** : `{data['value']}`\n"
-            
-            embed.description = notes_str
-            await ctx.send(embed=embed)
+            await view.send(ctx)
         except Exception as e:
             await ctx.send(f"❌ An error occurred while listing notes: {e}")
 
     @commands.command(name='delnote', help='Deletes a saved note.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def delete_note(self, ctx: commands.Context,  key: str):
         """
         Deletes a note by its key.
         Usage: !delnote "wifi password"
         """
         try:
-            if notes_tool.delete_note(key):
+            if await executors.run_in(executors.STORAGE, notes_tool.delete_note, key):
                 embed = discord.Embed(
                     title="🗑️ Note Deleted",
                     description=f"I have forgotten the note for **`{key}`**.",
@@ -4,8 +4,25 @@ import discord
 from discord.ext import commands
 from discord.ext.commands import Bot
 
+from src.bot import checks
+from src.bot.ui.list_ui import PagedListView
+
 # Import the functions from our new tasks tool
 from src.agent.tools import tasks as tasks_tool
+from src.core import executors
+
+TASK_FILTERS = [("Pending", "pending"), ("Completed", "completed"), ("All", None)]
+TASK_TITLES = {"pending": "📝 Your Pending Tasks", "completed": "✅ Your Completed Tasks", None: "📝 All Your Tasks"}
+
+def _format_task(task: dict) -> str:
+    if task['status'] == 'completed':
+        return f"`{task['id']}` - ~~{task['description']}~~"
+    return f"`{task['id']}` - {task['description']}"
+
+def _empty_text(status_filter: str | None) -> str:
+    if status_filter == 'pending':
+        return "🎉 You have no pending tasks!"
+    return "Nothing here yet."
 
 class TasksCog(commands.Cog):
     """
@@ -15,14 +32,14 @@ class TasksCog(commands.Cog):
         self.bot = bot
 
     @commands.command(name='addtask', help='Adds a new task to your to-do list.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def add_task(self, ctx: commands.Context, *, description: str):
         """
         Adds a new task. The description is everything after the command.
         Usage: !addtask Write the project proposal
         """
         try:
-            new_task = tasks_tool.add_task(description)
+            new_task = await executors.run_in(executors.STORAGE, tasks_tool.add_task, description)
             embed = discord.Embed(
                 title="✅ Task Added",
                 description=f"**{new_task['description']}**",
@@ -33,44 +50,37 @@ class TasksCog(commands.Cog):
         except Exception as e:
             await ctx.send(f"❌ An error occurred while adding the task: {e}")
 
-    @commands.command(name='tasks', help='Lists your pending tasks.')
-    @commands.is_owner()
-    async def list_tasks(self, ctx: commands.Context):
+    @commands.command(name='tasks', help='Lists your tasks, a page at a time: !tasks [pending|completed|all].')
+    @checks.is_aura_user()
+    async def list_tasks(self, ctx: commands.Context, status: str = 'pending'):
         """
-        Displays a list of all tasks that are currently pending.
+        Displays your tasks (pending by default) a page at a time, with
+        buttons to page through them and a menu to change the filter.
+        Usage: !tasks, !tasks completed, !tasks all
         """
+        status = status.lower()
+        if status not in ('pending', 'completed', 'all'):
+            await ctx.send("🤔 Use `!tasks`, `!tasks completed` or `!tasks all`.")
+            return
         try:
-            pending_tasks = tasks_tool.list_tasks(status_filter='pending')
-            if not pending_tasks:
-                await ctx.send("🎉 You have no pending tasks!")
-                return
-
-            embed = discord.Embed(
-                title="📝 Your Pending Tasks",
-                color=discord.Color.blue()
+            view = PagedListView(
+                ctx.author.id, tasks_tool.list_tasks_page, _format_task, TASK_TITLES.get,
+                filters=TASK_FILTERS, current_filter=None if status == 'all' else status,
+                empty_text=_empty_text, footer_hint="!donetask <ID> completes a task", color=discord.Color.blue()
             )
-            
-            # Format the list of tasks
-            task_list_str = ""
-            for task in pending_tasks:
-                task_list_str += f"`{task['id']}` - {task['description']}\n"
-            
-            embed.description = task_list_str
-            embed.set_footer(text="Use !donetask <ID> to complete a task.")
-            
-            await ctx.send(embed=embed)
+            await view.send(ctx)
         except Exception as e:
             await ctx.send(f"❌ An error occurred while listing tasks: {e}")
 
     @commands.command(name='donetask', help='Marks a task as complete.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def done_task(self, ctx: commands.Context, task_id: str):
         """
         Marks a specific task as complete using its ID.
         Usage: !donetask <task_id>
         """
         try:
-            completed_task = tasks_tool.mark_task_complete(task_id)
+            completed_task = await executors.run_in(executors.STORAGE, tasks_tool.mark_task_complete, task_id)
             if completed_task:
                 embed = discord.Embed(
                     title="🎉 Task Completed!",
@@ -7,12 +7,17 @@ import datetime
 # Import the functions from our refactored gcp modules
 from src.agent.tools import calendar as google_calendar
 from src.agent.tools import gmail as google_gmail
-from src.agent.tools import gmail_watcher
+from src.bot import checks
+from src.core import executors
 
 # Import the UI components from their new, dedicated files
-from src.bot.ui.event_ui import EventView
+from src.bot.ui.event_ui import EventListView, EventView
 from src.bot.ui.mail_ui import MailDisplayView
 
+# !events covers at most this many days and lists at most this many events.
+MAX_EVENT_DAYS = 90
+MAX_LISTED_EVENTS = 250
+
 
 class ToolsCog(commands.Cog):
     """
@@ -25,30 +30,56 @@ class ToolsCog(commands.Cog):
     async def ping(self, ctx: commands.Context):
         await ctx.send(f'Pong! 🏓 Latency: {round(self.bot.latency * 1000)}ms')
 
-    @commands.command(name='events', help='Lists upcoming events as editable cards.')
-    async def events(self, ctx: commands.Context):
+    @commands.command(name='status', help='Shows which components have finished warming up.')
+    @commands.is_owner()
+    async def status(self, ctx: commands.Context):
+        warmup = getattr(self.bot, 'warmup', None)
+        if warmup is None:
+            return await ctx.send("Warmup has not been started.")
+
+        icons = {'ready': '✅', 'failed': '❌', 'pending': '⏳'}
+        embed = discord.Embed(title="🔥 Warmup Status", color=discord.Color.blue())
+        for name, state in warmup.status.items():
+            value = f"{icons.get(state, '')} {state}"
+            if name in warmup.durations:
+                value += f" ({warmup.durations[name]:.2f}s)"
+            if name in warmup.errors:
+                value += f"\n`{warmup.errors[name][:200]}`"
+            embed.add_field(name=name, value=value, inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(name='events', help='Lists your events for the next few days (default 7) in one message.')
+    @checks.is_aura_user()
+    async def events(self, ctx: commands.Context, days: int = 7):
+        """
+        Shows every event of the next `days` days in a single paged message;
+        picking an event from the menu opens the edit form.
+        Usage: !events, !events 30
+        """
+        days = max(1, min(days, MAX_EVENT_DAYS))
         thinking_message = await ctx.send("📅 Fetching your calendar events...")
-        loop = asyncio.get_running_loop()
         try:
-            # Note: We are importing from a path that doesn't exist yet (agent/tools).
-            # This is part of the plan. We will create these files next.
-            upcoming_events = await loop.run_in_executor(None, google_calendar.fetch_upcoming_events, 5)
-            if not upcoming_events:
-                return await thinking_message.edit(content="No upcoming events found.")
-            
-            await thinking_message.delete()
-            for event in upcoming_events:
-                # Use the imported EventView
-                await ctx.send(view=EventView(event))
+            now = datetime.datetime.now(datetime.timezone.utc)
+            events = await executors.run_in(
+                executors.GOOGLE_API, google_calendar.fetch_events_in_range,
+                now.isoformat(), (now + datetime.timedelta(days=days)).isoformat(), MAX_LISTED_EVENTS
+            )
+            if not events:
+                return await thinking_message.edit(content=f"No events in the next {days} day(s).")
+
+            # The whole range goes into the message that is already there.
+            view = EventListView(ctx.author.id, events, f"📅 Your Events: Next {days} Day(s)")
+            await thinking_message.edit(content=None, embed=view.build_embed(), view=view)
+            view.message = thinking_message
         except Exception as e:
             await thinking_message.edit(content=f"An error occurred: `{e}`")
 
     @commands.command(name='mail', help='Shows your latest unread emails.')
+    @checks.is_aura_user()
     async def mail(self, ctx: commands.Context):
         thinking_message = await ctx.send("📧 Fetching unread mail...")
-        loop = asyncio.get_running_loop()
         try:
-            unread_emails = await loop.run_in_executor(None, google_gmail.fetch_unread_emails, 5)
+            unread_emails = await executors.run_in(executors.GOOGLE_API, google_gmail.fetch_unread_emails, 5)
             if not unread_emails:
                 return await thinking_message.edit(content="No unread emails found!")
             
@@ -62,7 +93,7 @@ class ToolsCog(commands.Cog):
     # In src/bot/cogs/tools_cog.py, replace the create_event command with this final version
 
     @commands.command(name='create_event', help='(TEST) Creates a new calendar event.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def create_event(self, ctx: commands.Context, summary: str, start_str: str, end_str: str):
         """
         A test command to create a calendar event with specific times.
@@ -79,11 +110,10 @@ class ToolsCog(commands.Cog):
             start_iso = start_dt.isoformat()
             end_iso = end_dt.isoformat()
 
-            # 3. Call the tool function in an executor.
+            # 3. Call the tool function in the Google API executor.
             # We must pass arguments positionally, not by keyword.
-            loop = asyncio.get_running_loop()
-            new_event = await loop.run_in_executor(
-                None, 
+            new_event = await executors.run_in(
+                executors.GOOGLE_API,
                 google_calendar.create_new_event,
                 summary,          # summary
                 start_iso,        # start_time_iso
@@ -102,7 +132,7 @@ class ToolsCog(commands.Cog):
                     color=discord.Color.green()
                 )
                 # Send the embed AND the interactive view
-                await ctx.send(embed=embed, view=EventView(new_event))
+                await ctx.send(embed=embed, view=EventView(new_event, ctx.author.id))
             else:
                 await thinking_message.edit(content="❌ Failed to create the event for an unknown reason.")
 
@@ -113,17 +143,22 @@ class ToolsCog(commands.Cog):
             print(f"Error in !create_event: {e}") 
             await thinking_message.edit(content=f"An unexpected error occurred. Please check the console.")
     @commands.command(name='watchmail', help='Starts real-time Gmail notifications.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def watch_mail(self, ctx: commands.Context):
         """Initiates real-time Gmail push notifications."""
+        scheduler = self.bot.get_watch_scheduler(ctx.author.id)
+        if not scheduler:
+            await ctx.send("ℹ️ Aura is running in polling mode (`GMAIL_SYNC_MODE=polling`); new mail is checked automatically.")
+            return
         await ctx.send("📧 Attempting to start real-time Gmail notifications...")
-        loop = asyncio.get_running_loop()
         try:
-            response = await loop.run_in_executor(None, gmail_watcher.watch_gmail_inbox)
+            response = await scheduler.start_watch()
             if response:
+                expires = datetime.datetime.fromtimestamp(int(response['expiration']) / 1000, tz=datetime.timezone.utc)
                 embed = discord.Embed(
                     title="✅ Gmail Watch Started",
-                    description=f"You will now receive notifications for new emails. Expires: {response.get('expirationHistoryId')}",
+                    description=(f"You will now receive notifications for new emails. "
+                                 f"The watch expires {discord.utils.format_dt(expires, 'R')} and is renewed automatically."),
                     color=discord.Color.green()
                 )
                 await ctx.send(embed=embed)
@@ -134,13 +169,16 @@ class ToolsCog(commands.Cog):
             print(f"Error watching mail: {e}")
 
     @commands.command(name='unwatchmail', help='Stops real-time Gmail notifications.')
-    @commands.is_owner()
+    @checks.is_aura_user()
     async def unwatch_mail(self, ctx: commands.Context):
         """Stops real-time Gmail push notifications."""
+        scheduler = self.bot.get_watch_scheduler(ctx.author.id)
+        if not scheduler:
+            await ctx.send("ℹ️ Aura is running in polling mode (`GMAIL_SYNC_MODE=polling`); there is no Gmail watch to stop.")
+            return
         await ctx.send("📧 Attempting to stop real-time Gmail notifications...")
-        loop = asyncio.get_running_loop()
         try:
-            if await loop.run_in_executor(None, gmail_watcher.stop_gmail_inbox_watch):
+            if await scheduler.stop_watch():
                 await ctx.send("✅ Gmail watch stopped successfully.")
             else:
                 await ctx.send("❌ Failed to stop Gmail watch.")
@@ -0,0 +1,139 @@
+# File: src/bot/mail_delivery.py
+
+import asyncio
+import time
+
+from src.agent.tools import gmail as gmail_tool
+from src.bot import mail_outbox
+from src.bot.mail_notifier import find_delivered_pages, send_notification
+from src.core import config, executors, metrics, user_context
+
+# One delivery worker per mailbox drains its outbox (see mail_outbox.py):
+# claim a delivery, DM it, record it as sent, and once the outbox is empty
+# mark everything delivered as read in one batchModify. On start it first
+# settles deliveries left 'sending' by a crash, resending only the pages that
+# are missing from the DM history.
+
+MAX_DIGEST_MESSAGES = 500
+RETRY_SECONDS = 30
+
+NOTIFICATION_LAG = metrics.histogram(
+    "aura_gmail_notification_lag_seconds", "Time from Pub/Sub publish to the user's DM being sent.")
+OUTBOX_PENDING = metrics.gauge(
+    "aura_gmail_outbox_pending", "Discovered messages not yet delivered, per user.", ("user",))
+DELIVERIES = metrics.counter(
+    "aura_gmail_deliveries_total", "Notification deliveries by outcome (sent, recovered, resent, failed).", ("outcome",))
+
+
+class MailDeliveryWorker:
+    def __init__(self, bot, user_id: int | None):
+        self.bot = bot
+        self.user_id = user_id
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._wakeup.set()  # settle what a previous run left behind
+        # The worker copies the current context, so it delivers as this user.
+        with user_context.as_user(user_id):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def wake(self):
+        self._idle.clear()
+        self._wakeup.set()
+
+    async def wait_idle(self):
+        """Waits until everything in the outbox has been delivered (or delivery failed)."""
+        await self._idle.wait()
+
+    def serves(self, bot) -> bool:
+        return self.bot is bot and not self._task.done() and self._task.get_loop() is asyncio.get_running_loop()
+
+    def stop(self):
+        self._task.cancel()
+
+    async def _storage(self, func, *args):
+        return await executors.run_in(executors.STORAGE, func, *args)
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        recovered = False
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            recipient = self.bot.get_user(self.user_id) if self.user_id is not None else None
+            if not recipient:
+                print(f"DELIVERY WARNING: Discord user {self.user_id} not found, cannot send DMs.")
+                self._idle.set()
+                continue
+            try:
+                if not recovered:
+                    await self._recover(recipient)
+                    recovered = True
+                await self._drain(recipient)
+                await self._mark_read()
+            except Exception as e:
+                DELIVERIES.inc(outcome="failed")
+                print(f"DELIVERY ERROR: Delivering mail to user {self.user_id} failed: {e}. Retrying in {RETRY_SECONDS}s.")
+                # The interrupted delivery stays 'sending' and is settled like after a crash.
+                recovered = False
+                self._idle.set()
+                await asyncio.sleep(RETRY_SECONDS)
+                self._wakeup.set()
+                continue
+            finally:
+                OUTBOX_PENDING.set(await self._storage(mail_outbox.pending_count), user=str(self.user_id))
+            if not self._wakeup.is_set():
+                self._idle.set()
+
+    async def _recover(self, recipient):
+        for delivery_id, messages in await self._storage(mail_outbox.in_flight):
+            delivered = await find_delivered_pages(recipient, self.bot.user.id, delivery_id)
+            sent = await send_notification(recipient, messages, messages[0]['heading'], delivery_id, skip_pages=delivered)
+            await self._storage(mail_outbox.mark_sent, delivery_id)
+            DELIVERIES.inc(outcome="resent" if sent else "recovered")
+            print(f"DELIVERY: Settled interrupted delivery {delivery_id} ({len(delivered)} DM(s) already sent, {sent} resent).")
+
+    async def _drain(self, recipient):
+        while True:
+            claimed = await self._storage(mail_outbox.claim, MAX_DIGEST_MESSAGES, config.GMAIL_DIGEST_THRESHOLD)
+            if claimed is None:
+                return
+            delivery_id, messages = claimed
+            await send_notification(recipient, messages, messages[0]['heading'], delivery_id)
+            publish_times = [msg['publish_time'] for msg in messages if msg['publish_time']]
+            if publish_times:
+                NOTIFICATION_LAG.observe(max(0.0, time.time() - min(publish_times)))
+            await self._storage(mail_outbox.mark_sent, delivery_id)
+            DELIVERIES.inc(outcome="sent")
+
+    async def _mark_read(self):
+        message_ids = await self._storage(mail_outbox.sent_message_ids)
+        if not message_ids:
+            return
+        failed = await executors.run_in(executors.GOOGLE_API, gmail_tool.mark_messages_as_read, message_ids)
+        if failed:
+            # Marking is retried with the next delivery; the messages were already DMed.
+            print(f"DELIVERY WARNING: {len(failed)}/{len(message_ids)} delivered messages could not be marked as read yet.")
+            failed = set(failed)
+            message_ids = [message_id for message_id in message_ids if message_id not in failed]
+        if message_ids:
+            await self._storage(mail_outbox.mark_delivered, message_ids)
+
+
+_workers: dict[int | None, MailDeliveryWorker] = {}
+
+
+def get_worker(bot) -> MailDeliveryWorker:
+    """The current user's delivery worker, started on first use."""
+    user_id = user_context.get_user_id()
+    worker = _workers.get(user_id)
+    if worker is None or not worker.serves(bot):
+        if worker is not None and worker._task.get_loop() is asyncio.get_running_loop():
+            worker.stop()
+        worker = _workers[user_id] = MailDeliveryWorker(bot, user_id)
+    return worker
+
+
+def stop_all():
+    for worker in _workers.values():
+        worker.stop()
+    _workers.clear()
@@ -0,0 +1,65 @@
+# File: src/bot/mail_notifier.py
+
+import re
+
+import discord
+
+from src.core import config
+from src.bot.ui.mail_ui import build_mail_digest_embeds, paginate_embeds
+
+# Every notification DM carries the outbox delivery ID ("ref ...") it was sent
+# for, so after a crash mail_delivery.py can tell from the DM history which
+# pages of an interrupted delivery already went out.
+
+HISTORY_SCAN_LIMIT = 100
+_REF_PATTERN = re.compile(r"ref ([0-9a-f]{12})(?: · Page (\d+)/\d+)?")
+
+
+def build_notification_pages(messages: list, heading: str, delivery_id: str) -> list[dict]:
+    """
+    The DMs for one delivery, as keyword arguments for `User.send`.
+
+    A single mail keeps the realtime one-line DM. Several mails are packed into
+    paginated digest embeds so a catch-up of hundreds of mails costs a handful
+    of Discord messages. The result only depends on the messages, so an
+    interrupted delivery can be rebuilt page for page.
+    """
+    if len(messages) == 1:
+        msg = messages[0]
+        return [{'content': f"📧 {heading}: **{msg['subject']}** from **{msg['sender'].split('<')[0].strip()}**\n"
+                            f"-# ref {delivery_id}"}]
+
+    embeds = build_mail_digest_embeds(messages, heading, group_by=config.GMAIL_DIGEST_GROUP_BY)
+    pages = paginate_embeds(embeds)
+    for page_number, page in enumerate(pages, start=1):
+        page[-1].set_footer(text=f"ref {delivery_id} · Page {page_number}/{len(pages)}")
+    return [{'embeds': page} for page in pages]
+
+
+async def find_delivered_pages(recipient: discord.User, bot_user_id: int, delivery_id: str) -> set[int]:
+    """Page numbers (1-based) of the delivery that are already in the recipient's DMs."""
+    delivered = set()
+    async for message in recipient.history(limit=HISTORY_SCAN_LIMIT):
+        if message.author.id != bot_user_id:
+            continue
+        texts = [message.content or ''] + [embed.footer.text or '' for embed in message.embeds if embed.footer]
+        for text in texts:
+            for match in _REF_PATTERN.finditer(text):
+                if match.group(1) == delivery_id:
+                    delivered.add(int(match.group(2) or 1))
+    return delivered
+
+
+async def send_notification(recipient: discord.User, messages: list, heading: str, delivery_id: str,
+                            skip_pages: set[int] = frozenset()) -> int:
+    """Sends the delivery's DMs, except the pages in skip_pages. Returns the number of DMs sent."""
+    pages = build_notification_pages(messages, heading, delivery_id)
+    if len(pages) > 1:
+        print(f"NOTIFY: Sending digest of {len(messages)} messages in {len(pages)} DM(s).")
+    sent = 0
+    for page_number, page in enumerate(pages, start=1):
+        if page_number in skip_pages:
+            continue
+        await recipient.send(**page)
+        sent += 1
+    return sent
@@ -0,0 +1,183 @@
+# File: src/bot/mail_outbox.py
+
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from src.core import config, user_context
+
+# The durable outbox between discovering new mail and DMing it. A sync first
+# commits the messages it found here, and only then advances the Gmail
+# tracker, so a crash can never lose a notification. mail_delivery.py drains
+# the outbox: rows are claimed under a delivery ID ('sending'), DMed with that
+# ID as a reference, marked 'sent', and finally marked read in Gmail and
+# 'delivered'. A delivery that was 'sending' during a crash is checked against
+# the DM history before anything is sent again.
+#
+# Delivered rows are kept as tombstones for GMAIL_OUTBOX_RETENTION_DAYS, so a
+# message that a later sync finds again (for example after a crash between the
+# outbox commit and the tracker checkpoint, or in a full unread re-sync) is
+# ignored by enqueue. The guarantee is bounded: a message rediscovered after
+# its tombstone was pruned can be notified again, and crash recovery only
+# finds pages among the last mail_notifier.HISTORY_SCAN_LIMIT DMs.
+
+OUTBOX_FILE = "mail_outbox.db"  # per user, see user_context.user_data_path
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+DELIVERED = "delivered"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    message_id TEXT NOT NULL UNIQUE,
+    history_id INTEGER NOT NULL DEFAULT 0,
+    thread_id TEXT,
+    sender TEXT NOT NULL DEFAULT '',
+    subject TEXT NOT NULL DEFAULT '',
+    heading TEXT NOT NULL,
+    publish_time REAL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    delivery_id TEXT,
+    queued_at REAL NOT NULL,
+    delivered_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_state ON outbox (state, seq);
+"""
+
+_connections: OrderedDict[str, sqlite3.Connection] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    # Same arrangement as mail_index: shared per-user connections behind _lock.
+    path = user_context.user_data_path(OUTBOX_FILE)
+    connection = _connections.get(path)
+    if connection is None:
+        user_context.ensure_user_data_dir()
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        # Full sync: a committed row must survive a power cut, not just a crash.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        connection.executescript(_SCHEMA)
+        columns = {row['name'] for row in connection.execute("PRAGMA table_info(outbox)")}
+        if 'delivered_at' not in columns:
+            # Outboxes created before delivered rows were kept.
+            connection.execute("ALTER TABLE outbox ADD COLUMN delivered_at REAL")
+        _connections[path] = connection
+    _connections.move_to_end(path)
+    while len(_connections) > config.AURA_USER_CACHE_SIZE:
+        _connections.popitem(last=False)[1].close()
+    return connection
+
+
+def _as_messages(rows) -> list[dict]:
+    return [{
+        'id': row['message_id'],
+        'threadId': row['thread_id'],
+        'sender': row['sender'],
+        'subject': row['subject'],
+        'heading': row['heading'],
+        'publish_time': row['publish_time'],
+    } for row in rows]
+
+
+def enqueue(messages: list, history_id: int, heading: str, publish_time: float | None = None) -> int:
+    """
+    Durably adds newly discovered messages. Messages that are already in the
+    outbox, including recently delivered ones, are skipped, so re-discovering
+    them is harmless.
+    Returns the number of messages added.
+    """
+    rows = [(message['id'], history_id, message.get('threadId'), message.get('sender') or '',
+             message.get('subject') or '', heading, publish_time, time.time()) for message in messages]
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            before = connection.total_changes
+            connection.executemany(
+                """INSERT OR IGNORE INTO outbox
+                   (message_id, history_id, thread_id, sender, subject, heading, publish_time, queued_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            return connection.total_changes - before
+
+
+def claim(max_messages: int, single_threshold: int) -> tuple[str, list[dict]] | None:
+    """
+    Claims the next delivery: the oldest pending messages that share a heading,
+    up to max_messages. If no more than single_threshold are pending, only the
+    oldest one is claimed, so it is sent as its own DM. Returns
+    (delivery_id, messages), or None if nothing is pending.
+    """
+    with _lock:
+        connection = _get_connection()
+        first = connection.execute(
+            "SELECT heading FROM outbox WHERE state = ? ORDER BY seq LIMIT 1", (PENDING,)).fetchone()
+        if first is None:
+            return None
+        rows = connection.execute(
+            "SELECT * FROM outbox WHERE state = ? AND heading = ? ORDER BY seq LIMIT ?",
+            (PENDING, first['heading'], max_messages)).fetchall()
+        if len(rows) <= single_threshold:
+            rows = rows[:1]
+        delivery_id = uuid.uuid4().hex[:12]
+        with connection:
+            connection.executemany(
+                "UPDATE outbox SET state = ?, delivery_id = ? WHERE seq = ?",
+                [(SENDING, delivery_id, row['seq']) for row in rows])
+        return delivery_id, _as_messages(rows)
+
+
+def in_flight() -> list[tuple[str, list[dict]]]:
+    """Deliveries that were being sent when the bot stopped, oldest first."""
+    with _lock:
+        rows = _get_connection().execute(
+            "SELECT * FROM outbox WHERE state = ? ORDER BY seq", (SENDING,)).fetchall()
+    deliveries: dict[str, list] = {}
+    for row in rows:
+        deliveries.setdefault(row['delivery_id'], []).append(row)
+    return [(delivery_id, _as_messages(group)) for delivery_id, group in deliveries.items()]
+
+
+def mark_sent(delivery_id: str):
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.execute("UPDATE outbox SET state = ? WHERE delivery_id = ?", (SENT, delivery_id))
+
+
+def sent_message_ids() -> list[str]:
+    """Messages that were delivered but are not yet marked read in Gmail."""
+    with _lock:
+        rows = _get_connection().execute(
+            "SELECT message_id FROM outbox WHERE state = ? ORDER BY seq", (SENT,)).fetchall()
+    return [row['message_id'] for row in rows]
+
+
+def mark_delivered(message_ids: list):
+    """Records the messages as delivered and marked read, and prunes tombstones past the retention period."""
+    if not message_ids:
+        return
+    now = time.time()
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.executemany(
+                "UPDATE outbox SET state = ?, delivered_at = ? WHERE message_id = ?",
+                [(DELIVERED, now, message_id) for message_id in message_ids])
+            connection.execute(
+                "DELETE FROM outbox WHERE state = ? AND delivered_at < ?",
+                (DELIVERED, now - config.GMAIL_OUTBOX_RETENTION_DAYS * 86400))
+
+
+def pending_count() -> int:
+    """Messages not yet delivered (pending or sending)."""
+    with _lock:
+        return _get_connection().execute(
+            "SELECT COUNT(*) FROM outbox WHERE state IN (?, ?)", (PENDING, SENDING)).fetchone()[0]
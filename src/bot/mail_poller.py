@@ -0,0 +1,152 @@
+# File: src/bot/mail_poller.py
+
+import asyncio
+import time
+
+from src.bot import mail_sequencer
+from src.core import config, metrics, user_context
+from src.core.gcp_auth import GOOGLE_API_REQUESTS
+
+# Polling mode (GMAIL_SYNC_MODE=polling) for deployments without Pub/Sub or a
+# public webhook. The history sync runs on an interval that snaps back to the
+# minimum when mail arrives and doubles while the mailbox is idle. A token
+# bucket of Gmail quota units keeps polling within the configured budget. Every
+# user's mailbox has its own interval; mailboxes that are due are polled
+# concurrently and share the one (per-project) quota budget.
+
+# Gmail API quota units per method (https://developers.google.com/gmail/api/reference/quota).
+QUOTA_UNITS = {
+    'gmail.users.getProfile': 1,
+    'gmail.users.history.list': 2,
+    'gmail.users.messages.list': 5,
+    'gmail.users.messages.get': 5,
+    'gmail.users.messages.attachments.get': 5,
+    'gmail.users.messages.modify': 5,
+    'gmail.users.messages.batchModify': 50,
+}
+IDLE_POLL_UNITS = QUOTA_UNITS['gmail.users.history.list']
+
+POLL_INTERVAL = metrics.gauge(
+    "aura_gmail_poll_interval_seconds", "Current delay between Gmail polls of a user's mailbox.", ("user",))
+POLLS = metrics.counter(
+    "aura_gmail_polls_total", "Gmail polls by outcome (mail, idle, error, throttled).", ("outcome",))
+POLL_QUOTA_UNITS = metrics.counter(
+    "aura_gmail_poll_quota_units_total", "Estimated Gmail quota units spent by polling.")
+
+
+def _gmail_units_used() -> float:
+    return sum(QUOTA_UNITS.get(labels['method'], 0) * value for labels, value in GOOGLE_API_REQUESTS.samples())
+
+
+class AdaptiveMailPoller:
+    def __init__(self, bot, min_interval: float | None = None, max_interval: float | None = None,
+                 units_per_hour: float | None = None, user_ids: list[int] | None = None):
+        self.bot = bot
+        self.min_interval = min_interval or config.GMAIL_POLL_MIN_SECONDS
+        self.max_interval = max(self.min_interval, max_interval or config.GMAIL_POLL_MAX_SECONDS)
+        self.units_per_hour = units_per_hour or config.GMAIL_POLL_QUOTA_UNITS_PER_HOUR
+        # Per user: current interval and when the next poll is due (monotonic).
+        self.intervals: dict[int, float] = {}
+        self._due: dict[int, float] = {}
+        # The bucket holds at most one hour of budget and starts full.
+        self.capacity = self.units_per_hour
+        self.tokens = self.capacity
+        self._refilled_at = time.monotonic()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        for user_id in (user_context.known_user_ids() if user_ids is None else user_ids):
+            self.add_user(user_id)
+
+    @property
+    def interval(self) -> float:
+        """The shortest interval of any mailbox."""
+        return min(self.intervals.values(), default=self.max_interval)
+
+    def add_user(self, user_id: int):
+        """Starts polling a user's mailbox (again) at the minimum interval, e.g. after !auth."""
+        self.intervals[user_id] = self.min_interval
+        self._due[user_id] = time.monotonic() + self.min_interval
+        POLL_INTERVAL.set(self.min_interval, user=str(user_id))
+        self._wakeup.set()
+
+    def start(self):
+        if self._task is None:
+            print(f"POLLER: Polling {len(self.intervals)} Gmail mailbox(es) every {self.min_interval:.0f}-"
+                  f"{self.max_interval:.0f}s within {self.units_per_hour:.0f} quota units/hour.")
+            self._task = self.bot.loop.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._refilled_at) * self.units_per_hour / 3600)
+        self._refilled_at = now
+
+    def _seconds_until_affordable(self, mailboxes: int = 1) -> float:
+        self._refill()
+        missing = min(self.capacity, IDLE_POLL_UNITS * mailboxes) - self.tokens
+        return max(0.0, missing * 3600 / self.units_per_hour)
+
+    def _set_interval(self, user_id: int, interval: float):
+        interval = min(self.max_interval, max(self.min_interval, interval))
+        self.intervals[user_id] = interval
+        self._due[user_id] = time.monotonic() + interval
+        POLL_INTERVAL.set(interval, user=str(user_id))
+
+    async def _poll_user(self, user_id: int) -> int:
+        with user_context.as_user(user_id):
+            try:
+                found = await mail_sequencer.request_sync(self.bot, "poll")
+            except Exception as e:
+                print(f"POLLER ERROR: Polling the mailbox of user {user_id} failed: {e}")
+                POLLS.inc(outcome="error")
+                self._set_interval(user_id, self.intervals[user_id] * 2)
+                return 0
+
+        if found:
+            POLLS.inc(outcome="mail")
+            self._set_interval(user_id, self.min_interval)
+        else:
+            POLLS.inc(outcome="idle")
+            self._set_interval(user_id, self.intervals[user_id] * 2)
+        return found
+
+    async def poll_once(self, user_ids: list[int] | None = None) -> int:
+        """Polls the given mailboxes (all of them by default) concurrently. Returns the messages found."""
+        user_ids = list(self.intervals) if user_ids is None else user_ids
+        units_before = _gmail_units_used()
+        try:
+            found = await asyncio.gather(*(self._poll_user(user_id) for user_id in user_ids))
+        finally:
+            # Other Gmail traffic during the poll is counted too, which errs on the safe side.
+            spent = max(0.0, _gmail_units_used() - units_before)
+            self._refill()
+            self.tokens -= spent
+            POLL_QUOTA_UNITS.inc(spent)
+        return sum(found)
+
+    async def _sleep_until_due(self):
+        self._wakeup.clear()
+        next_due = min(self._due.values(), default=None)
+        timeout = None if next_due is None else max(0.0, next_due - time.monotonic())
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self):
+        while True:
+            await self._sleep_until_due()
+            now = time.monotonic()
+            due = [user_id for user_id, due_at in self._due.items() if due_at <= now]
+            if not due:
+                continue
+            wait = self._seconds_until_affordable(len(due))
+            if wait > 0:
+                POLLS.inc(outcome="throttled")
+                print(f"POLLER: Quota budget exhausted; next poll in {wait:.0f}s.")
+                await asyncio.sleep(wait)
+            await self.poll_once(due)
@@ -0,0 +1,161 @@
+# File: src/bot/mail_sequencer.py
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from src.bot import mail_sync
+from src.core import executors, metrics, user_context
+import gmail_history_tracker
+
+# Every mailbox has one worker task that runs its syncs one after another.
+# Webhooks, polls and the startup sync only submit requests. Each sync reads
+# everything since the tracker's checkpoint, so a request that is still
+# waiting covers any request submitted after it: new requests merge into the
+# pending one instead of queueing. A mailbox therefore has at most one sync
+# running and one pending, however fast notifications arrive.
+
+SYNC = "sync"
+INITIAL = "initial"  # the startup sync, which may also establish the baseline
+
+SYNC_QUEUE_DEPTH = metrics.gauge(
+    "aura_gmail_sync_queue_depth", "Mail sync requests running or waiting, per user.", ("user",))
+SYNC_QUEUE_LAG = metrics.histogram(
+    "aura_gmail_sync_queue_lag_seconds", "Time a mail sync request waited before its sync started.", ("path",))
+SYNC_REQUESTS = metrics.counter(
+    "aura_gmail_sync_requests_total", "Mail sync requests by path and outcome (queued, merged).", ("path", "outcome"))
+
+
+@dataclass
+class SyncRequest:
+    kind: str
+    path: str
+    heading: str
+    history_id: int | None = None  # newest history ID announced by a webhook
+    publish_time: float | None = None  # earliest Pub/Sub publish time, for the notification lag
+    submitted_at: float = field(default_factory=time.perf_counter)
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+    def merge(self, other: "SyncRequest"):
+        if other.kind == INITIAL:
+            self.kind, self.heading = INITIAL, other.heading
+        if other.history_id is not None:
+            self.history_id = max(self.history_id or 0, other.history_id)
+        if other.publish_time is not None:
+            self.publish_time = min(self.publish_time or other.publish_time, other.publish_time)
+
+
+class MailboxSequencer:
+    def __init__(self, bot, user_id: int | None):
+        self.bot = bot
+        self.user_id = user_id
+        self.pending: SyncRequest | None = None
+        self.running: SyncRequest | None = None
+        self._wakeup = asyncio.Event()
+        # The worker copies the current context, so it syncs as this user.
+        with user_context.as_user(user_id):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    @property
+    def depth(self) -> int:
+        return (self.pending is not None) + (self.running is not None)
+
+    def _update_depth(self):
+        SYNC_QUEUE_DEPTH.set(self.depth, user=str(self.user_id))
+
+    def submit(self, request: SyncRequest) -> asyncio.Future:
+        """Queues a sync, or merges it into the one already waiting. The future resolves to the messages notified."""
+        if self.pending is not None:
+            self.pending.merge(request)
+            SYNC_REQUESTS.inc(path=request.path, outcome="merged")
+            return self.pending.future
+        self.pending = request
+        SYNC_REQUESTS.inc(path=request.path, outcome="queued")
+        self._update_depth()
+        self._wakeup.set()
+        return request.future
+
+    def serves(self, bot) -> bool:
+        return self.bot is bot and not self._task.done() and self._task.get_loop() is asyncio.get_running_loop()
+
+    def stop(self):
+        self._task.cancel()
+        for request in (self.running, self.pending):
+            if request and not request.future.done():
+                request.future.cancel()
+        self.pending = self.running = None
+        self._update_depth()
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self.pending is None:
+                continue
+            self.running, self.pending = self.pending, None
+            request = self.running
+            SYNC_QUEUE_LAG.observe(time.perf_counter() - request.submitted_at, path=request.path)
+            try:
+                result = await self._process(request)
+            except Exception as e:
+                print(f"SYNC ERROR: {request.path} sync for user {self.user_id} failed: {e}")
+                if not request.future.done():
+                    request.future.set_exception(e)
+            else:
+                if not request.future.done():
+                    request.future.set_result(result)
+            finally:
+                self.running = None
+                self._update_depth()
+                if self.pending is not None:
+                    self._wakeup.set()
+
+    async def _process(self, request: SyncRequest) -> int:
+        print(f"\n--- Processing {request.path} sync for user {self.user_id} ---")
+        if request.kind == INITIAL:
+            found = await mail_sync.initial_sync(self.bot)
+            print("--- Initial sync complete ---\n")
+            return found
+
+        last_history_id = await executors.run_in(executors.STORAGE, gmail_history_tracker.get_last_history_id)
+        if request.history_id is None and last_history_id is None:
+            print(f"SYNC: No history baseline yet; skipping {request.path} sync.")
+            return 0
+        if request.history_id is not None and last_history_id and request.history_id <= last_history_id:
+            print(f"PROCESS: Webhook ID ({request.history_id}) is not newer than tracker ({last_history_id}). Skipping.")
+            return 0
+
+        found = await mail_sync.sync_new_mail(self.bot, last_history_id, request.heading, request.publish_time)
+        print("--- Processing complete ---\n")
+        return found
+
+
+_sequencers: dict[int | None, MailboxSequencer] = {}
+
+
+def get_sequencer(bot) -> MailboxSequencer:
+    """The current user's sequencer, started on first use."""
+    user_id = user_context.get_user_id()
+    sequencer = _sequencers.get(user_id)
+    if sequencer is None or not sequencer.serves(bot):
+        if sequencer is not None and sequencer._task.get_loop() is asyncio.get_running_loop():
+            sequencer.stop()
+        sequencer = _sequencers[user_id] = MailboxSequencer(bot, user_id)
+    return sequencer
+
+
+async def request_sync(bot, path: str, heading: str = "New Mail", kind: str = SYNC,
+                       history_id: int | None = None, publish_time: float | None = None) -> int:
+    """
+    Asks for a sync of the current user's mailbox and waits for the sync that
+    covers it. Returns the number of messages that sync notified.
+    """
+    request = SyncRequest(kind=kind, path=path, heading=heading, history_id=history_id, publish_time=publish_time)
+    # Shielded: a waiter that is cancelled must not cancel a sync others share.
+    return await asyncio.shield(get_sequencer(bot).submit(request))
+
+
+def stop_all():
+    for sequencer in _sequencers.values():
+        sequencer.stop()
+    _sequencers.clear()
@@ -0,0 +1,64 @@
+# File: src/bot/mail_sync.py
+
+from src.agent.tools import gmail as gmail_tool
+from src.bot import mail_delivery, mail_outbox
+from src.core import executors, user_context
+import gmail_history_tracker
+
+# The history-based mail sync shared by the Gmail webhook, the initial sync
+# and the polling paths: new mail is streamed page by page and every batch is
+# committed to the durable outbox (mail_outbox.py) before the tracker is
+# checkpointed. The mailbox's delivery worker (mail_delivery.py) DMs it and
+# marks it read. Everything runs for the current user (see
+# src/core/user_context.py), one sync per mailbox at a time (see
+# mail_sequencer.py). Tracker reads and writes are disk I/O (fsync'd writes of
+# the whole tracker document), so they run in the storage executor.
+
+
+async def sync_new_mail(bot, start_history_id: int | None, heading: str, publish_time: float | None = None) -> int:
+    """
+    Queues every new message since start_history_id for delivery to the
+    current user. Only called by the user's MailboxSequencer. Returns the
+    number of messages found.
+    """
+    found = 0
+    batches = gmail_tool.iter_new_message_batches(start_history_id)
+    async for messages, checkpoint_history_id in executors.iterate_in(executors.GOOGLE_API, batches):
+        if not messages:
+            if checkpoint_history_id > (start_history_id or 0):
+                await executors.run_in(executors.STORAGE, gmail_history_tracker.set_last_history_id, checkpoint_history_id)
+            continue
+
+        print(f"SYNC: Found {len(messages)} new messages for user {user_context.get_user_id()}. Queuing for delivery.")
+        await executors.run_in(executors.STORAGE, mail_outbox.enqueue, messages, checkpoint_history_id, heading, publish_time)
+        # Only once the messages are durable in the outbox may history move past them.
+        await executors.run_in(executors.STORAGE, gmail_history_tracker.add_processed_message_ids,
+                               [msg['id'] for msg in messages], checkpoint_history_id)
+        mail_delivery.get_worker(bot).wake()
+        found += len(messages)
+
+    if not found:
+        print("SYNC: No new messages found. History tracker advanced.")
+    return found
+
+
+async def initial_sync(bot) -> int:
+    """
+    Catches up on mail received while the bot was offline. On first use the
+    current history ID and the mailbox's address become the baseline instead.
+    """
+    last_history_id = await executors.run_in(executors.STORAGE, gmail_history_tracker.get_last_history_id)
+    if last_history_id is not None:
+        print("SYNC: Existing history found. Syncing messages since last run...")
+        return await sync_new_mail(bot, last_history_id, "Catch-up Mail")
+
+    print("SYNC: First-time setup. Performing a 'Fresh Start'.")
+    current_api_history_id = await executors.run_in(executors.GOOGLE_API, gmail_tool.get_latest_history_id_from_gmail_api)
+    await executors.run_in(executors.STORAGE, gmail_history_tracker.set_last_history_id, current_api_history_id)
+
+    service = await executors.run_in(executors.GOOGLE_API, gmail_tool.build_google_service, 'gmail', 'v1')
+    profile = await executors.run_in(executors.GOOGLE_API, service.users().getProfile(userId='me').execute)
+    tracker_email_address = profile.get('emailAddress')
+    await executors.run_in(executors.STORAGE, gmail_history_tracker.set_current_email_address, tracker_email_address)
+    print(f"SYNC: Baseline established for {tracker_email_address}.")
+    return 0
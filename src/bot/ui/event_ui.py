@@ -4,6 +4,8 @@ import discord
 import asyncio
 import datetime
 
+from src.core import executors, user_context
+
 # Note: We need to do a "type-only" import for the tools to avoid circular dependencies.
 # This is a common pattern in larger discord.py bots.
 from typing import TYPE_CHECKING
@@ -47,16 +49,19 @@ class EventEditModal(discord.ui.Modal):
             start_iso = start_dt.isoformat()
             end_iso = end_dt.isoformat()
 
-            updated_event = await asyncio.get_running_loop().run_in_executor(
-                None, 
-                google_calendar.update_event,
-                self.event['id'], 
-                self.summary_input.value, 
-                start_iso, 
-                end_iso, 
-                self.description_input.value, 
-                self.location_input.value
-            )
+            # Modal submissions arrive outside any command, so the calendar
+            # to update is the submitting user's.
+            with user_context.as_user(interaction.user.id):
+                updated_event = await executors.run_in(
+                    executors.GOOGLE_API,
+                    google_calendar.update_event,
+                    self.event['id'], 
+                    self.summary_input.value, 
+                    start_iso, 
+                    end_iso, 
+                    self.description_input.value, 
+                    self.location_input.value
+                )
             if updated_event:
                 await interaction.followup.send("✅ Event updated!", ephemeral=True)
             else:
@@ -64,10 +69,51 @@ class EventEditModal(discord.ui.Modal):
         except Exception as e:
             await interaction.followup.send(f"❌ Error: {e}", ephemeral=True)
 
+class EventEditButton(discord.ui.DynamicItem[discord.ui.Button], template=(
+        r'aura:event:(?P<user_id>\d+):(?P<event_id>[A-Za-z0-9_-]+)|edit_(?P<legacy_event_id>[A-Za-z0-9_-]+)')):
+    """
+    The edit button of an event card. All it keeps is what its custom_id
+    says: whose calendar and which event. It is registered once with
+    bot.add_dynamic_items, so buttons keep working after a restart; the event
+    itself is loaded when the button is clicked. Cards posted before the
+    owner was part of the custom_id (edit_<event id>) open the clicker's event.
+    """
+    def __init__(self, user_id: int | None, event_id: str, label: str = "Edit Event"):
+        custom_id = f"aura:event:{user_id}:{event_id}" if user_id is not None else f"edit_{event_id}"
+        super().__init__(discord.ui.Button(label=label, style=discord.ButtonStyle.secondary, custom_id=custom_id))
+        self.user_id = user_id
+        self.event_id = event_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        if match['legacy_event_id']:
+            return cls(None, match['legacy_event_id'], label=item.label or "Edit Event")
+        return cls(int(match['user_id']), match['event_id'], label=item.label or "Edit Event")
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not user_context.is_allowed(interaction.user.id):
+            await interaction.response.send_message("You are not set up to use Aura.", ephemeral=True)
+            return False
+        if self.user_id is not None and interaction.user.id != self.user_id:
+            await interaction.response.send_message("Only the owner of this event can edit it.", ephemeral=True)
+            return False
+        return True
+
+    async def callback(self, interaction: discord.Interaction):
+        from src.agent.tools import calendar as google_calendar
+
+        user_id = self.user_id if self.user_id is not None else interaction.user.id
+        try:
+            with user_context.as_user(user_id):
+                event = await executors.run_in(executors.GOOGLE_API, google_calendar.get_event, self.event_id)
+        except Exception as e:
+            await interaction.response.send_message(f"❌ Could not load this event: {e}", ephemeral=True)
+            return
+        await interaction.response.send_modal(EventEditModal(event))
+
 class EventView(discord.ui.View):
-    def __init__(self, event: dict):
+    def __init__(self, event: dict, user_id: int):
         super().__init__(timeout=None)
-        self.event = event
         
         summary = event.get('summary', 'No Title')
         time_str = "All-Day"
@@ -80,9 +126,102 @@ class EventView(discord.ui.View):
         if len(button_label) > 80:
             button_label = button_label[:77] + '...'
             
-        edit_button = discord.ui.Button(label=button_label, style=discord.ButtonStyle.secondary, custom_id=f"edit_{event['id']}")
-        edit_button.callback = self.button_callback
-        self.add_item(edit_button)
+        self.add_item(EventEditButton(user_id, event['id'], label=button_label))
+        # Clicks are routed to EventEditButton, so the view is finished before
+        # it is sent: discord.py then keeps neither the view nor the event.
+        self.stop()
+
+# Events per page of the !events message (a select menu holds at most 25 options).
+EVENTS_PER_PAGE = 10
+
+
+def _event_times(event: dict) -> tuple[str, str]:
+    """The day heading and the time span of an event, as shown in listings."""
+    if 'dateTime' in event['start']:
+        start_dt = datetime.datetime.fromisoformat(event['start']['dateTime'].replace('Z', '+00:00'))
+        end_dt = datetime.datetime.fromisoformat(event['end']['dateTime'].replace('Z', '+00:00'))
+        return start_dt.strftime('%a, %b %-d'), f"{start_dt.strftime('%-I:%M %p')} - {end_dt.strftime('%-I:%M %p')}"
+    start_date = datetime.date.fromisoformat(event['start']['date'])
+    return start_date.strftime('%a, %b %-d'), "All-Day"
+
+
+class EventListView(discord.ui.View):
+    """
+    A date range of events in a single message, a page at a time. The select
+    menu lists the events on the page; picking one opens EventEditModal.
+    Only the user who asked for the list can use it.
+    """
+    def __init__(self, user_id: int, events: list, title: str, timeout: float = 600):
+        super().__init__(timeout=timeout)
+        self.user_id = user_id
+        self.events = events
+        self.title = title
+        self.page = 0
+        self.message: discord.Message | None = None
+
+        self.event_select = discord.ui.Select(placeholder="Pick an event to edit...", row=1)
+        self.event_select.callback = self.select_callback
+        self.add_item(self.event_select)
+        self._update_controls()
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.events) // EVENTS_PER_PAGE))
+
+    def _page_events(self) -> list:
+        start = self.page * EVENTS_PER_PAGE
+        return self.events[start:start + EVENTS_PER_PAGE]
+
+    def _update_controls(self):
+        options = []
+        for index, event in enumerate(self._page_events()):
+            day, time_str = _event_times(event)
+            options.append(discord.SelectOption(
+                label=(event.get('summary') or 'No Title')[:100], value=str(index), description=f"{day} · {time_str}"[:100]))
+        self.event_select.options = options
+        self.previous_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= self.page_count - 1
+
+    def build_embed(self) -> discord.Embed:
+        embed = discord.Embed(title=self.title, color=discord.Color.blue())
+        lines, current_day = [], None
+        for event in self._page_events():
+            day, time_str = _event_times(event)
+            if day != current_day:
+                lines.append(f"**{day}**")
+                current_day = day
+            lines.append(f"`{time_str}` {(event.get('summary') or 'No Title')[:200]}")
+        embed.description = "\n".join(lines)
+        embed.set_footer(text=f"Page {self.page + 1}/{self.page_count} · {len(self.events)} events · Pick one below to edit it")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("Only the person who asked for these events can use this list.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary, row=0)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        self._update_controls()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary, row=0)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = min(self.page_count - 1, self.page + 1)
+        self._update_controls()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    async def select_callback(self, interaction: discord.Interaction):
+        event = self._page_events()[int(self.event_select.values[0])]
+        await interaction.response.send_modal(EventEditModal(event))
 
-    async def button_callback(self, interaction: discord.Interaction):
-        await interaction.response.send_modal(EventEditModal(self.event))
\ No newline at end of file
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,125 @@
+# File: src/bot/ui/list_ui.py
+
+import math
+from typing import Any, Callable
+
+import discord
+
+from src.core import executors, user_context
+
+# Long lists (tasks, notes) are shown one page at a time. Each page is fetched
+# from the store as a slice (offset/limit) together with the total, which the
+# store caches, so opening a list of thousands of rows costs one page.
+
+PAGE_SIZE = 10
+# Per-row cap, so a full page stays far below the 4096 character description limit.
+LINE_LIMIT = 300
+
+
+class PagedListView(discord.ui.View):
+    """
+    Previous/next buttons and an optional filter menu over a stored list.
+    fetch_page(filter_value, offset, limit) runs in the storage executor and
+    returns (items, total); format_item turns one item into a line. Only the
+    user who opened the list can use the controls.
+    """
+    def __init__(self, user_id: int, fetch_page: Callable[[Any, int, int], tuple[list, int]],
+                 format_item: Callable[[Any], str], title: Callable[[Any], str], *,
+                 filters: list[tuple[str, Any]] | None = None, current_filter: Any = None,
+                 empty_text: str | Callable[[Any], str] = "Nothing here yet.", footer_hint: str | None = None,
+                 color: discord.Color = discord.Color.blue(), page_size: int = PAGE_SIZE, timeout: float = 300):
+        super().__init__(timeout=timeout)
+        self.user_id = user_id
+        self.fetch_page = fetch_page
+        self.format_item = format_item
+        self.title = title
+        self.filters = filters or []
+        self.current_filter = current_filter
+        self.empty_text = empty_text
+        self.footer_hint = footer_hint
+        self.color = color
+        self.page_size = page_size
+        self.page = 0
+        self.total = 0
+        self.message: discord.Message | None = None
+
+        if self.filters:
+            self.filter_select = discord.ui.Select(placeholder="Filter", row=1, options=[
+                discord.SelectOption(label=label, value=str(index), default=value == current_filter)
+                for index, (label, value) in enumerate(self.filters)
+            ])
+            self.filter_select.callback = self.filter_callback
+            self.add_item(self.filter_select)
+
+    @property
+    def page_count(self) -> int:
+        return max(1, math.ceil(self.total / self.page_size))
+
+    async def load_page(self, page: int) -> discord.Embed:
+        """Fetches the page (clamped to the list) and returns its embed."""
+        page = max(0, page)
+        # Interactions arrive outside any command, so the list to read is the opener's.
+        with user_context.as_user(self.user_id):
+            items, self.total = await executors.run_in(
+                executors.STORAGE, self.fetch_page, self.current_filter, page * self.page_size, self.page_size)
+            if not items and page > 0 and self.total:
+                # The list shrank since the last page was shown.
+                page = self.page_count - 1
+                items, self.total = await executors.run_in(
+                    executors.STORAGE, self.fetch_page, self.current_filter, page * self.page_size, self.page_size)
+        self.page = page
+        self.previous_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= self.page_count - 1
+        return self._build_embed(items)
+
+    def _build_embed(self, items: list) -> discord.Embed:
+        embed = discord.Embed(title=self.title(self.current_filter), color=self.color)
+        lines = []
+        for item in items:
+            line = self.format_item(item)
+            lines.append(line if len(line) <= LINE_LIMIT else line[:LINE_LIMIT - 3] + '...')
+        empty_text = self.empty_text(self.current_filter) if callable(self.empty_text) else self.empty_text
+        embed.description = "\n".join(lines) if lines else empty_text
+        footer = f"Page {self.page + 1}/{self.page_count} · {self.total} total"
+        embed.set_footer(text=f"{footer} · {self.footer_hint}" if self.footer_hint else footer)
+        return embed
+
+    async def send(self, ctx) -> discord.Message:
+        """Sends the first page, with controls only if there is more than one page or a filter."""
+        embed = await self.load_page(0)
+        if self.page_count > 1 or self.filters:
+            self.message = await ctx.send(embed=embed, view=self)
+        else:
+            self.stop()
+            self.message = await ctx.send(embed=embed)
+        return self.message
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("Only the person who opened this list can page through it.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary, row=0)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.edit_message(embed=await self.load_page(self.page - 1), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary, row=0)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.edit_message(embed=await self.load_page(self.page + 1), view=self)
+
+    async def filter_callback(self, interaction: discord.Interaction):
+        index = int(self.filter_select.values[0])
+        self.current_filter = self.filters[index][1]
+        for option in self.filter_select.options:
+            option.default = option.value == str(index)
+        await interaction.response.edit_message(embed=await self.load_page(0), view=self)
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
@@ -19,4 +19,84 @@ class MailDisplayView(discord.ui.View):
         if len(button_label) > 80:
             button_label = button_label[:77] + '...'
         
-        self.add_item(discord.ui.Button(label=button_label, style=discord.ButtonStyle.secondary, disabled=True))
\ No newline at end of file
+        self.add_item(discord.ui.Button(label=button_label, style=discord.ButtonStyle.secondary, disabled=True))
+
+
+# Discord limits for a single message.
+EMBEDS_PER_MESSAGE = 10
+EMBED_DESCRIPTION_LIMIT = 4096
+MESSAGE_EMBED_CHAR_LIMIT = 6000
+# Room left in each message for the page footer added after packing.
+FOOTER_RESERVE = 50
+
+
+def _sender_name(email_sender: str) -> str:
+    return email_sender.split('<')[0].strip().replace('"', '') or email_sender
+
+
+def build_mail_digest_embeds(messages: list, heading: str, group_by: str = 'sender') -> list[discord.Embed]:
+    """
+    Builds one or more embeds summarizing a batch of emails, grouped by
+    sender or by thread. Groups that do not fit in a single embed are split
+    across continuation embeds.
+    """
+    groups: dict[str, list] = {}
+    for msg in messages:
+        if group_by == 'thread':
+            key = msg.get('threadId') or msg['id']
+        else:
+            key = _sender_name(msg['sender'])
+        groups.setdefault(key, []).append(msg)
+
+    embeds = []
+    for key, group in groups.items():
+        if group_by == 'thread':
+            title = f"🧵 {group[0]['subject']}"
+        else:
+            title = f"✉️ {key}"
+        title = f"{title} ({len(group)})"
+        if len(title) > 256:
+            title = title[:253] + '...'
+
+        lines = []
+        for msg in group:
+            if group_by == 'thread':
+                line = f"• from **{_sender_name(msg['sender'])}**"
+            else:
+                line = f"• **{msg['subject']}**"
+            lines.append(line[:300])
+
+        description = ""
+        for line in lines:
+            if len(description) + len(line) + 1 > EMBED_DESCRIPTION_LIMIT:
+                embeds.append(discord.Embed(title=title, description=description, color=discord.Color.blue()))
+                title = f"{title[:240]} (cont.)"
+                description = ""
+            description += line + "\n"
+        embeds.append(discord.Embed(title=title, description=description, color=discord.Color.blue()))
+
+    if embeds:
+        embeds[0].set_author(name=f"{heading}: {len(messages)} new emails")
+    return embeds
+
+
+def paginate_embeds(embeds: list[discord.Embed]) -> list[list[discord.Embed]]:
+    """
+    Splits embeds into pages that each fit in a single Discord message
+    (at most 10 embeds and 6000 characters).
+    """
+    pages, current, current_size = [], [], 0
+    for embed in embeds:
+        size = len(embed)
+        if current and (len(current) >= EMBEDS_PER_MESSAGE or current_size + size > MESSAGE_EMBED_CHAR_LIMIT - FOOTER_RESERVE):
+            pages.append(current)
+            current, current_size = [], 0
+        current.append(embed)
+        current_size += size
+    if current:
+        pages.append(current)
+
+    if len(pages) > 1:
+        for page_number, page in enumerate(pages, start=1):
+            page[-1].set_footer(text=f"Page {page_number}/{len(pages)}")
+    return pages
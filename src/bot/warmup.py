@@ -0,0 +1,120 @@
+# File: src/bot/warmup.py
+
+import asyncio
+import time
+
+from src.core import executors, gcp_auth
+
+# Components that talk to Google run in the Google API executor, so the
+# services and connections they warm are cached in the threads that use them;
+# the agent and Gemini client are warmed in the agent executor.
+GOOGLE_COMPONENTS = {"google_auth", "gmail", "calendar"}
+
+# Component states
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+def _warm_agent():
+    from src.agent import invoker
+    invoker.load_agent()
+
+def _warm_gemini():
+    # Opens the TLS connection to Gemini with a free count_tokens call.
+    from src.agent import core as agent_core
+    model = agent_core.get_model()
+    if model is None:
+        raise RuntimeError("No active model configured.")
+    model.get_num_tokens("warmup")
+
+def _warm_gmail():
+    service = gcp_auth.build_google_service('gmail', 'v1')
+    service.users().getProfile(userId='me').execute()
+
+def _warm_calendar():
+    service = gcp_auth.build_google_service('calendar', 'v3')
+    service.calendarList().list(maxResults=1).execute()
+
+
+class Warmup:
+    """
+    Pre-builds first-use resources (agent graph, LLM client, OAuth refresh,
+    Google services) in the background and records each component's readiness.
+    Callers can await a component instead of paying its cold start themselves.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.status: dict[str, str] = {}
+        self.errors: dict[str, str] = {}
+        self.durations: dict[str, float] = {}
+        self._events: dict[str, asyncio.Event] = {}
+        self._task: asyncio.Task | None = None
+
+        for name in ("agent", "gemini", "google_auth", "gmail", "calendar"):
+            self.status[name] = PENDING
+            self._events[name] = asyncio.Event()
+
+    def start(self) -> asyncio.Task:
+        if self._task is None:
+            self._task = self.loop.create_task(self._run())
+        return self._task
+
+    async def _run(self):
+        print("WARMUP: Starting background warmup...")
+        started = time.perf_counter()
+        await asyncio.gather(
+            self._chain(("agent", _warm_agent), ("gemini", _warm_gemini)),
+            self._chain(
+                ("google_auth", gcp_auth.get_credentials),
+                ("gmail", _warm_gmail),
+                ("calendar", _warm_calendar),
+            ),
+        )
+        summary = ", ".join(f"{name}={state}" for name, state in self.status.items())
+        print(f"WARMUP: Finished in {time.perf_counter() - started:.2f}s ({summary})")
+
+    async def _chain(self, *steps):
+        # Steps in a chain depend on the previous one; a failure skips the rest.
+        for index, (name, func) in enumerate(steps):
+            if not await self._warm(name, func):
+                for skipped_name, _ in steps[index + 1:]:
+                    self._finish(skipped_name, FAILED, 0.0, f"skipped because '{name}' failed")
+                return
+
+    async def _warm(self, name: str, func) -> bool:
+        started = time.perf_counter()
+        try:
+            executor = executors.GOOGLE_API if name in GOOGLE_COMPONENTS else executors.AGENT
+            await executors.run_in(executor, func)
+        except Exception as e:
+            self._finish(name, FAILED, time.perf_counter() - started, str(e))
+            print(f"WARMUP: '{name}' failed: {e}")
+            return False
+        self._finish(name, READY, time.perf_counter() - started)
+        return True
+
+    def _finish(self, name: str, state: str, duration: float, error: str | None = None):
+        self.status[name] = state
+        self.durations[name] = duration
+        if error:
+            self.errors[name] = error
+        self._events[name].set()
+
+    def is_ready(self, *names: str) -> bool:
+        """True once every named component has finished warming (successfully or not)."""
+        return all(self._events[name].is_set() for name in names)
+
+    async def wait_for(self, *names: str, timeout: float | None = None) -> bool:
+        """
+        Waits until the named components have finished warming. Returns False
+        if the timeout expired first.
+        """
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(self._events[name].wait() for name in names)),
+                timeout=timeout,
+            )
+            return True
+        except asyncio.TimeoutError:
+            return False
@@ -0,0 +1,196 @@
+# File: src/bot/watch_scheduler.py
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+
+from src.agent.tools import gmail_watcher
+from src.bot import mail_sequencer
+from src.core import config, executors, metrics, user_context
+import gmail_history_tracker
+
+# Gmail watches expire after about a week. Once `!watchmail` has started one,
+# its expiration is kept in the tracker and the watch is renewed well before
+# it runs out. If renewal keeps failing until the watch lapses, new mail is
+# polled by a short "bridge" loop until push delivery works again. Each user
+# has their own scheduler, and its tasks run as that user.
+
+RETRY_MIN_SECONDS = 60
+RETRY_MAX_SECONDS = 30 * 60
+MAX_SLEEP_SECONDS = 60 * 60  # re-check at least hourly, e.g. after the clock jumps
+
+WATCH_RENEWALS = metrics.counter(
+    "aura_gmail_watch_renewals_total", "Gmail watch renewal attempts by outcome.", ("outcome",))
+WATCH_EXPIRES_IN = metrics.gauge(
+    "aura_gmail_watch_expires_in_seconds", "Seconds until the user's current Gmail watch expires.", ("user",))
+POLL_BRIDGE_ACTIVE = metrics.gauge(
+    "aura_gmail_poll_bridge_active", "Mailboxes polled because their push delivery is broken.")
+
+
+def _format_expiration(expiration_ms: int) -> str:
+    return datetime.fromtimestamp(expiration_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+
+
+class WatchRenewalScheduler:
+    def __init__(self, bot, user_id: int | None):
+        self.bot = bot
+        self.user_id = user_id
+        self.failures = 0
+        self.last_error: str | None = None
+        self._next_retry = 0.0
+        self._jitter: tuple[int, float] | None = None  # (expiration it was drawn for, seconds)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._bridge_task: asyncio.Task | None = None
+
+    def _create_task(self, coro) -> asyncio.Task:
+        # Tasks copy the current context, so everything they do is for this user.
+        with user_context.as_user(self.user_id):
+            return self.bot.loop.create_task(coro)
+
+    def start(self):
+        if self._task is None:
+            self._task = self._create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+        if self._bridge_task:
+            self._bridge_task.cancel()
+            POLL_BRIDGE_ACTIVE.dec()
+        self._task = self._bridge_task = None
+
+    @property
+    def bridge_active(self) -> bool:
+        return self._bridge_task is not None
+
+    # --- Commands ---
+
+    async def start_watch(self) -> dict:
+        """Starts (or renews) the watch now and schedules its renewal. Used by !watchmail."""
+        with user_context.as_user(self.user_id):
+            response = await self._renew()
+        self._wakeup.set()
+        return response
+
+    async def stop_watch(self) -> bool:
+        """Stops the watch and its renewals. Used by !unwatchmail."""
+        with user_context.as_user(self.user_id):
+            stopped = await executors.run_in(executors.GOOGLE_API, gmail_watcher.stop_gmail_inbox_watch)
+            await executors.run_in(executors.STORAGE, gmail_history_tracker.set_watch_expiration, None)
+        self.failures = 0
+        self._stop_bridge()
+        self._wakeup.set()
+        return stopped
+
+    # --- Scheduling ---
+
+    def _renew_at(self, expiration_ms: int) -> float:
+        if self.failures:
+            return self._next_retry
+        if self._jitter is None or self._jitter[0] != expiration_ms:
+            self._jitter = (expiration_ms, random.uniform(0, config.GMAIL_WATCH_RENEW_JITTER_MINUTES * 60))
+        return expiration_ms / 1000 - config.GMAIL_WATCH_RENEW_BEFORE_HOURS * 3600 - self._jitter[1]
+
+    async def _sleep(self, seconds: float | None):
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self):
+        while True:
+            expiration_ms = await executors.run_in(executors.STORAGE, gmail_history_tracker.get_watch_expiration)
+            if expiration_ms is None:
+                WATCH_EXPIRES_IN.set(0, user=str(self.user_id))
+                await self._sleep(None)  # until !watchmail starts a watch
+                continue
+
+            now = time.time()
+            WATCH_EXPIRES_IN.set(max(0.0, expiration_ms / 1000 - now), user=str(self.user_id))
+            if expiration_ms / 1000 <= now and not self.bridge_active:
+                self._start_bridge()
+
+            renew_at = self._renew_at(expiration_ms)
+            if now < renew_at:
+                await self._sleep(min(renew_at - now, MAX_SLEEP_SECONDS))
+                continue
+
+            try:
+                await self._renew()
+            except Exception as e:
+                await self._renewal_failed(e, expiration_ms)
+
+    async def _renew(self) -> dict:
+        try:
+            response = await executors.run_in(executors.GOOGLE_API, gmail_watcher.watch_gmail_inbox)
+        except Exception:
+            WATCH_RENEWALS.inc(outcome="failure")
+            raise
+        WATCH_RENEWALS.inc(outcome="success")
+        expiration_ms = int(response['expiration'])
+        await executors.run_in(executors.STORAGE, gmail_history_tracker.set_watch_expiration, expiration_ms)
+        print(f"WATCH: Gmail watch for user {self.user_id} active until {_format_expiration(expiration_ms)}.")
+
+        recovered = self.failures > 0 or self.bridge_active
+        self.failures = 0
+        self.last_error = None
+        self._stop_bridge()
+        if recovered:
+            await self._alert(f"✅ Gmail watch renewed; push notifications are working again "
+                              f"(active until {_format_expiration(expiration_ms)}).")
+        return response
+
+    async def _renewal_failed(self, error: Exception, expiration_ms: int):
+        self.failures += 1
+        self.last_error = str(error)
+        delay = min(RETRY_MAX_SECONDS, RETRY_MIN_SECONDS * 2 ** (self.failures - 1)) * random.uniform(0.8, 1.2)
+        self._next_retry = time.time() + delay
+        print(f"WATCH ERROR: Gmail watch renewal for user {self.user_id} failed ({error}). Retrying in {delay / 60:.1f} min.")
+
+        # Alert on the first failure, and again if push delivery is about to lapse.
+        started_bridge = False
+        if expiration_ms / 1000 <= self._next_retry and not self.bridge_active:
+            self._start_bridge()
+            started_bridge = True
+        if self.failures == 1 or started_bridge:
+            bridge_note = (f" Polling for new mail every {config.GMAIL_POLL_BRIDGE_SECONDS:.0f}s until it works again."
+                           if self.bridge_active else
+                           f" The current watch stays active until {_format_expiration(expiration_ms)}.")
+            await self._alert(f"⚠️ Gmail watch renewal failed: `{error}`. Retrying in {delay / 60:.0f} min.{bridge_note}")
+
+    # --- Polling bridge ---
+
+    def _start_bridge(self):
+        print(f"WATCH: Push delivery for user {self.user_id} is down. Polling Gmail every {config.GMAIL_POLL_BRIDGE_SECONDS:.0f}s.")
+        self._bridge_task = self._create_task(self._bridge())
+        POLL_BRIDGE_ACTIVE.inc()
+
+    def _stop_bridge(self):
+        # The bridge loop notices it was replaced and exits between syncs, so a
+        # sync in progress is never cut off between DMs and its checkpoint.
+        if self._bridge_task:
+            self._bridge_task = None
+            POLL_BRIDGE_ACTIVE.dec()
+            print(f"WATCH: Polling bridge for user {self.user_id} stopped.")
+
+    async def _bridge(self):
+        while self._bridge_task is asyncio.current_task():
+            try:
+                await mail_sequencer.request_sync(self.bot, "poll_bridge")
+            except Exception as e:
+                print(f"WATCH ERROR: Polling bridge sync failed: {e}")
+            await asyncio.sleep(config.GMAIL_POLL_BRIDGE_SECONDS)
+
+    async def _alert(self, text: str):
+        await self.bot.wait_until_ready()
+        user = self.bot.get_user(self.user_id) if self.user_id is not None else None
+        if not user:
+            print(f"WATCH WARNING: Discord user {self.user_id} not found, cannot send alert: {text}")
+            return
+        try:
+            await user.send(text)
+        except Exception as e:
+            print(f"WATCH WARNING: Could not DM user {self.user_id}: {e}")
@@ -2,20 +2,45 @@
 
 import json
 import base64
+import hmac
 import threading
-from flask import Flask, request, jsonify
+from datetime import datetime
+from flask import Flask, Response, request, jsonify
 import asyncio
 from functools import partial
 
-from src.agent.tools import gmail as gmail_tool
+from src.bot import mail_sequencer
 import gmail_history_tracker
-from src.core import config 
-from gmail_history_tracker import GMAIL_PROCESSING_LOCK # <-- IMPORT THE LOCK
+from src.core import config, executors, metrics, user_context
+from src.core.profiling import profiled
 
 discord_bot_instance = None 
 
 app = Flask(__name__)
 
+WEBHOOKS_RECEIVED = metrics.counter(
+    "aura_gmail_webhooks_total", "Gmail Pub/Sub push notifications received.")
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    # Disabled without AURA_METRICS_TOKEN, so the webhook port does not expose internals.
+    if not config.AURA_METRICS_TOKEN:
+        return 'Not found', 404
+    supplied = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(supplied.encode(), f"Bearer {config.AURA_METRICS_TOKEN}".encode()):
+        return 'Unauthorized', 401, {'WWW-Authenticate': 'Bearer'}
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+def _parse_publish_time(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
 @app.route('/', methods=['POST'])
 def gmail_webhook():
     if request.method == 'POST':
@@ -30,12 +55,14 @@ def gmail_webhook():
 
             email_address = pubsub_message.get('emailAddress')
             webhook_history_id = int(pubsub_message.get('historyId'))
+            publish_time = _parse_publish_time(envelope['message'].get('publishTime'))
+            WEBHOOKS_RECEIVED.inc()
 
             print(f"WEBHOOK: Received notification for {email_address}, historyId: {webhook_history_id}. Queuing task.")
 
             if discord_bot_instance and discord_bot_instance.loop.is_running():
                 asyncio.run_coroutine_threadsafe(
-                    process_gmail_notification_async(email_address, webhook_history_id),
+                    process_gmail_notification_async(email_address, webhook_history_id, publish_time),
                     discord_bot_instance.loop
                 )
             else:
@@ -49,44 +76,21 @@ def gmail_webhook():
     return 'Method not allowed', 405
 
 
-async def process_gmail_notification_async(email_address: str, webhook_history_id: int):
-    async with GMAIL_PROCESSING_LOCK: # <-- ACQUIRE THE LOCK
-        print(f"\n--- [LOCKED] Processing webhook for {email_address} (ID: {webhook_history_id}) ---")
+@profiled("gmail_webhook")
+async def process_gmail_notification_async(email_address: str, webhook_history_id: int, publish_time: float | None = None):
+    # Notifications are routed to the user whose tracked mailbox they are for
+    # and handed to that mailbox's sequencer, which merges notifications that
+    # arrive while a sync is running or waiting.
+    user_id = await executors.run_in(executors.STORAGE, gmail_history_tracker.find_user_by_email_address, email_address)
+    if user_id is None:
+        print(f"WEBHOOK WARNING: No user is tracking {email_address}. Skipping.")
+        return
+    with user_context.as_user(user_id):
         try:
-            last_processed_id = gmail_history_tracker.get_last_history_id()
-            
-            if last_processed_id and webhook_history_id <= last_processed_id:
-                print(f"PROCESS: Webhook ID ({webhook_history_id}) is not newer than tracker ({last_processed_id}). Skipping.")
-                print("--- [UNLOCKED] Processing complete (redundant) ---\n")
-                return
-
-            messages, new_history_id = await discord_bot_instance.loop.run_in_executor(
-                None, gmail_tool.fetch_new_messages_for_processing_from_api, last_processed_id
-            )
-
-            if messages:
-                print(f"PROCESS: Found {len(messages)} new messages to notify.")
-                owner = discord_bot_instance.get_user(config.DISCORD_OWNER_ID)
-                
-                if owner:
-                    for msg in messages:
-                        await owner.send(f"📧 New Mail: **{msg['subject']}** from **{msg['sender'].split('<')[0].strip()}**")
-                        await discord_bot_instance.loop.run_in_executor(None, gmail_tool.mark_message_as_read, msg['id'])
-                        gmail_history_tracker.add_processed_message_id(msg['id'])
-                    
-                    gmail_history_tracker.set_last_history_id(new_history_id)
-                else:
-                    print("PROCESS WARNING: Owner not found, cannot send DMs.")
-            else:
-                print("PROCESS: No new messages found. Advancing history tracker.")
-                current_api_history = await discord_bot_instance.loop.run_in_executor(None, gmail_tool.get_latest_history_id_from_gmail_api)
-                if current_api_history > (last_processed_id or 0):
-                     gmail_history_tracker.set_last_history_id(current_api_history)
-
+            await mail_sequencer.request_sync(discord_bot_instance, "webhook", "New Mail",
+                                              history_id=webhook_history_id, publish_time=publish_time)
         except Exception as e:
             print(f"PROCESS ERROR: {e}")
-        
-        print("--- [UNLOCKED] Processing complete ---\n")
 
 
 def run_webserver(bot_instance, host='0.0.0.0', port=5000):
@@ -1,11 +1,27 @@
 # File: src/core/config.py (Complete Final Version)
 
 import os
+import zoneinfo
 from dotenv import load_dotenv
 
 # This line finds the .env file in your project folder and loads its contents
 load_dotenv()
 
+# Numeric settings fall back to their default, with a warning, when the value is invalid.
+def _get_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        print(f"WARNING: {name} is invalid. Falling back to {default}.")
+        return default
+
+def _get_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        print(f"WARNING: {name} is invalid. Falling back to {default}.")
+        return default
+
 # Load Discord Bot Token
 DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 if not DISCORD_BOT_TOKEN:
@@ -28,4 +44,124 @@ try:
     DISCORD_OWNER_ID = int(os.getenv("DISCORD_OWNER_ID"))
 except (ValueError, TypeError):
     DISCORD_OWNER_ID = None
-    print("WARNING: DISCORD_OWNER_ID not found or invalid in .env. Bot owner commands may not work correctly, and DMs to owner may fail.")
\ No newline at end of file
+    print("WARNING: DISCORD_OWNER_ID not found or invalid in .env. Bot owner commands may not work correctly, and DMs to owner may fail.")
+
+# --- Team Members ---
+# Discord user IDs (comma-separated) that may use Aura besides the owner. Each
+# user has their own Google credentials, Gmail tracker, tasks and notes, kept
+# under AURA_USER_DATA_DIR/<user id>/; the owner keeps the files in the project
+# folder. Google clients of at most AURA_USER_CACHE_SIZE recently active users
+# stay cached in memory.
+try:
+    AURA_USER_IDS = {int(user_id) for user_id in os.getenv("AURA_USER_IDS", "").split(",") if user_id.strip()}
+except ValueError:
+    AURA_USER_IDS = set()
+    print("WARNING: AURA_USER_IDS is invalid. Only the owner can use Aura.")
+AURA_USER_DATA_DIR = os.getenv("AURA_USER_DATA_DIR", "users")
+AURA_USER_CACHE_SIZE = max(1, _get_int("AURA_USER_CACHE_SIZE", 32))
+
+# --- Storage ---
+# Where tasks, notes, the Gmail tracker and the model configuration are kept:
+# 'json' (one JSON file each, the original layout), 'sqlite' (one database file
+# per user, AURA_STORAGE_SQLITE_FILE) or 'memory' (lost on restart, for tests
+# and benchmarks). Move existing data with `python -m src.core.storage_migration`.
+AURA_STORAGE_BACKEND = os.getenv("AURA_STORAGE_BACKEND", "json").lower()
+if AURA_STORAGE_BACKEND not in ("json", "sqlite", "memory"):
+    print(f"WARNING: AURA_STORAGE_BACKEND '{AURA_STORAGE_BACKEND}' is invalid. Falling back to 'json'.")
+    AURA_STORAGE_BACKEND = "json"
+AURA_STORAGE_SQLITE_FILE = os.getenv("AURA_STORAGE_SQLITE_FILE", "aura.db")
+
+# --- Gmail Notification Settings ---
+# When a single sync produces more than this many new mails, they are sent as
+# one paginated digest instead of one DM per message.
+GMAIL_DIGEST_THRESHOLD = _get_int("GMAIL_DIGEST_THRESHOLD", 5)
+
+# Delivered messages stay in the outbox as tombstones for this many days, so a
+# message that is discovered again in that time is not notified twice.
+GMAIL_OUTBOX_RETENTION_DAYS = _get_float("GMAIL_OUTBOX_RETENTION_DAYS", 30.0)
+
+# How digest entries are grouped: 'sender' or 'thread'.
+GMAIL_DIGEST_GROUP_BY = os.getenv("GMAIL_DIGEST_GROUP_BY", "sender").lower()
+if GMAIL_DIGEST_GROUP_BY not in ("sender", "thread"):
+    print(f"WARNING: GMAIL_DIGEST_GROUP_BY '{GMAIL_DIGEST_GROUP_BY}' is invalid. Falling back to 'sender'.")
+    GMAIL_DIGEST_GROUP_BY = "sender"
+
+# --- Gmail Sync Mode ---
+# 'webhook' relies on Gmail push notifications through Pub/Sub and webserver.py.
+# 'polling' needs neither: the history sync runs every GMAIL_POLL_MIN_SECONDS
+# while mail is arriving and backs off exponentially to GMAIL_POLL_MAX_SECONDS
+# when idle, spending at most GMAIL_POLL_QUOTA_UNITS_PER_HOUR Gmail quota units.
+GMAIL_SYNC_MODE = os.getenv("GMAIL_SYNC_MODE", "webhook").lower()
+if GMAIL_SYNC_MODE not in ("webhook", "polling"):
+    print(f"WARNING: GMAIL_SYNC_MODE '{GMAIL_SYNC_MODE}' is invalid. Falling back to 'webhook'.")
+    GMAIL_SYNC_MODE = "webhook"
+GMAIL_POLL_MIN_SECONDS = _get_float("GMAIL_POLL_MIN_SECONDS", 15.0)
+GMAIL_POLL_MAX_SECONDS = _get_float("GMAIL_POLL_MAX_SECONDS", 600.0)
+GMAIL_POLL_QUOTA_UNITS_PER_HOUR = _get_float("GMAIL_POLL_QUOTA_UNITS_PER_HOUR", 3600.0)
+
+# --- Gmail Watch Renewal ---
+# An active Gmail watch is renewed this many hours before it expires, minus a
+# random jitter of up to GMAIL_WATCH_RENEW_JITTER_MINUTES. While push delivery
+# is known to be broken (the watch lapsed or cannot be renewed), new mail is
+# polled every GMAIL_POLL_BRIDGE_SECONDS instead.
+GMAIL_WATCH_RENEW_BEFORE_HOURS = _get_float("GMAIL_WATCH_RENEW_BEFORE_HOURS", 24.0)
+GMAIL_WATCH_RENEW_JITTER_MINUTES = _get_float("GMAIL_WATCH_RENEW_JITTER_MINUTES", 60.0)
+GMAIL_POLL_BRIDGE_SECONDS = _get_float("GMAIL_POLL_BRIDGE_SECONDS", 60.0)
+
+# --- Calendar ---
+# The IANA time zone (e.g. 'Europe/Berlin') that daily working hours in free
+# slot searches are read in, unless the agent passes one.
+AURA_TIMEZONE = os.getenv("AURA_TIMEZONE") or None
+if AURA_TIMEZONE:
+    try:
+        zoneinfo.ZoneInfo(AURA_TIMEZONE)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        print(f"WARNING: AURA_TIMEZONE '{AURA_TIMEZONE}' is not a known time zone. Ignoring it.")
+        AURA_TIMEZONE = None
+
+# --- Mail Index ---
+# How many of the newest messages to index when the local mail index is empty.
+MAIL_INDEX_BACKFILL = _get_int("MAIL_INDEX_BACKFILL", 500)
+
+# --- Startup Warmup ---
+# Mentions that arrive while the agent is still warming up wait at most this
+# many seconds before being handled anyway.
+WARMUP_WAIT_TIMEOUT = _get_float("WARMUP_WAIT_TIMEOUT", 60.0)
+
+# --- Google API Endpoint Override ---
+# Points all Google API clients at another root URL (for example a local fake
+# server used by the offline benchmarks). Leave unset in production.
+GOOGLE_API_ROOT_URL = os.getenv("GOOGLE_API_ROOT_URL") or None
+
+# --- Google API Retries ---
+# Transient Google API failures are retried up to GOOGLE_API_MAX_RETRIES times
+# with jittered exponential backoff (GOOGLE_API_BACKOFF_BASE doubling up to
+# GOOGLE_API_BACKOFF_MAX seconds). After GOOGLE_API_BREAKER_THRESHOLD failures
+# in a row, calls to that API fail fast for GOOGLE_API_BREAKER_RESET_SECONDS.
+GOOGLE_API_MAX_RETRIES = _get_int("GOOGLE_API_MAX_RETRIES", 4)
+GOOGLE_API_BACKOFF_BASE = _get_float("GOOGLE_API_BACKOFF_BASE", 0.5)
+GOOGLE_API_BACKOFF_MAX = _get_float("GOOGLE_API_BACKOFF_MAX", 30.0)
+GOOGLE_API_BREAKER_THRESHOLD = _get_int("GOOGLE_API_BREAKER_THRESHOLD", 5)
+GOOGLE_API_BREAKER_RESET_SECONDS = _get_float("GOOGLE_API_BREAKER_RESET_SECONDS", 30.0)
+
+# --- Metrics Endpoint ---
+# /metrics is served on the same public port as the Gmail webhook, so it is
+# off unless a token is set; scrapers then send `Authorization: Bearer <token>`.
+AURA_METRICS_TOKEN = os.getenv("AURA_METRICS_TOKEN") or None
+
+# --- Event Loop Watchdog ---
+# Stalls of the Discord event loop longer than this are attributed to the
+# blocking caller and reported by !looplag.
+LOOP_LAG_THRESHOLD_MS = _get_float("LOOP_LAG_THRESHOLD_MS", 250.0)
+
+# --- Executors ---
+# Worker threads and queue limit for each blocking I/O domain, as
+# EXECUTOR_<DOMAIN>_WORKERS and EXECUTOR_<DOMAIN>_QUEUE. Storage defaults to a
+# single worker so read-modify-write updates of the JSON files stay serialized.
+# The agent executor loads the agent stack and opens the Gemini connection.
+EXECUTOR_LIMITS = {
+    "google_api": (_get_int("EXECUTOR_GOOGLE_API_WORKERS", 8), _get_int("EXECUTOR_GOOGLE_API_QUEUE", 64)),
+    "storage": (_get_int("EXECUTOR_STORAGE_WORKERS", 1), _get_int("EXECUTOR_STORAGE_QUEUE", 64)),
+    "auth": (_get_int("EXECUTOR_AUTH_WORKERS", 1), _get_int("EXECUTOR_AUTH_QUEUE", 1)),
+    "agent": (_get_int("EXECUTOR_AGENT_WORKERS", 2), _get_int("EXECUTOR_AGENT_QUEUE", 64)),
+}
@@ -0,0 +1,133 @@
+# File: src/core/executors.py
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core import config, metrics
+
+# Named, bounded thread pools per I/O domain, so that a slow `!auth` flow or a
+# large history sync cannot starve unrelated work on a shared default pool.
+
+GOOGLE_API = "google_api"
+STORAGE = "storage"
+AUTH = "auth"
+AGENT = "agent"
+
+EXECUTOR_ACTIVE = metrics.gauge(
+    "aura_executor_active", "Jobs currently running in each executor.", ("executor",))
+EXECUTOR_QUEUED = metrics.gauge(
+    "aura_executor_queued", "Jobs waiting for a free worker in each executor.", ("executor",))
+EXECUTOR_CAPACITY = metrics.gauge(
+    "aura_executor_capacity", "Maximum running plus queued jobs per executor.", ("executor",))
+EXECUTOR_REJECTED = metrics.counter(
+    "aura_executor_rejected_total", "Jobs rejected because an executor's queue was full.", ("executor",))
+EXECUTOR_QUEUE_WAIT = metrics.histogram(
+    "aura_executor_queue_wait_seconds", "Time jobs spent queued before a worker picked them up.", ("executor",))
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when an executor already has its maximum number of queued jobs."""
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, queue_limit: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"aura-{name}")
+        self._pending = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        EXECUTOR_CAPACITY.set(max_workers + queue_limit, executor=name)
+
+    def _update_gauges(self):
+        EXECUTOR_ACTIVE.set(self._running, executor=self.name)
+        EXECUTOR_QUEUED.set(self._pending - self._running, executor=self.name)
+
+    async def run(self, func, *args):
+        """
+        Runs func(*args) in this executor and awaits the result. The caller's
+        context variables are carried into the worker thread.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_limit:
+                EXECUTOR_REJECTED.inc(executor=self.name)
+                raise ExecutorSaturatedError(f"The '{self.name}' executor is busy. Please try again shortly.")
+            self._pending += 1
+            self._update_gauges()
+
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+
+        def _call():
+            EXECUTOR_QUEUE_WAIT.observe(time.perf_counter() - submitted, executor=self.name)
+            with self._lock:
+                self._running += 1
+                self._update_gauges()
+            try:
+                return context.run(func, *args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._update_gauges()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, _call)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._update_gauges()
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executors: dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            max_workers, queue_limit = config.EXECUTOR_LIMITS[name]
+            executor = _executors[name] = BoundedExecutor(name, max_workers, queue_limit)
+        return executor
+
+
+async def run_in(name: str, func, *args):
+    """Runs a blocking call in the named executor, e.g. `await run_in(GOOGLE_API, fetch, 5)`."""
+    return await get_executor(name).run(func, *args)
+
+
+_EXHAUSTED = object()
+
+
+def _next_item(iterator):
+    return next(iterator, _EXHAUSTED)
+
+
+async def iterate_in(name: str, iterator):
+    """
+    Consumes a blocking iterator (e.g. a generator that pages through an API)
+    one item at a time in the named executor, yielding each item to the
+    caller's event loop as soon as it is produced.
+    """
+    executor = get_executor(name)
+    while True:
+        item = await executor.run(_next_item, iterator)
+        if item is _EXHAUSTED:
+            return
+        yield item
+
+
+def shutdown_all(wait: bool = False):
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+    print(f"EXECUTORS: Shut down {len(executors)} executor(s).")
@@ -1,10 +1,20 @@
-# File: src/core/gcp_auth.py (Standard Local Server Flow)
+# File: src/core/gcp_auth.py
 
+import json
 import os.path
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+
+from src.core import config, metrics, resilience, user_context
 
 # File: src/core/gcp_auth.py
 
@@ -16,38 +26,214 @@ SCOPES = [
 TOKEN_PATH = "token.json"
 CREDS_PATH = "credentials.json"
 
-def get_credentials() -> Credentials:
-    creds = None
-    if os.path.exists(TOKEN_PATH):
-        creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
-    
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            with open(TOKEN_PATH, "w") as token:
-                token.write(creds.to_json())
+# --- Caches ---
+# Each user's credentials are loaded from their token file once and refreshed
+# in place when they expire; loading and refreshing (a network call) hold only
+# that user's lock, so one user's refresh never delays another user's calls.
+# Discovery documents are parsed once per API.
+# Service objects wrap an httplib2.Http, which is not thread-safe, so they are
+# cached per thread; this keeps each executor thread's TLS connection to Google
+# alive between calls. Both caches hold only the AURA_USER_CACHE_SIZE most
+# recently active users; an evicted user is reloaded from disk on next use.
+_credentials: OrderedDict[int | None, Credentials] = OrderedDict()
+_credentials_lock = threading.Lock()
+_user_locks: dict[int | None, threading.Lock] = {}
+_discovery_documents: dict[tuple[str, str], dict] = {}
+_thread_local = threading.local()
+
+GOOGLE_API_REQUESTS = metrics.counter(
+    "aura_google_api_requests_total", "Google API requests by API method and HTTP status.", ("method", "status"))
+GOOGLE_API_DURATION = metrics.histogram(
+    "aura_google_api_request_duration_seconds", "Google API request latency by API method.", ("method",))
+
+# Non-GET calls that are safe to repeat: they only read, or setting the same
+# labels twice has the same effect. Anything else (events.insert,
+# events.update, users.watch, ...) may already have been applied when a 5xx or
+# a dropped connection arrives, so it is sent once.
+IDEMPOTENT_METHODS = {
+    'calendar.freebusy.query',
+    'gmail.users.messages.batchModify',
+    'gmail.users.messages.modify',
+    'gmail.users.stop',
+}
+
+class InstrumentedHttpRequest(HttpRequest):
+    """
+    HttpRequest that records call counts, status codes and latency per API
+    method, and runs every attempt through the API's circuit breaker (see
+    src/core/resilience.py). Idempotent requests are retried under the shared
+    retry policy, others only when the caller passes num_retries.
+    """
+    def execute(self, http=None, num_retries=0):
+        method = self.methodId or "unknown"
+        if num_retries:
+            max_retries = num_retries
+        elif self.method == 'GET' or method in IDEMPOTENT_METHODS:
+            max_retries = None  # the shared policy
         else:
-            raise Exception("Authentication required. Please run the `!auth` command.")
-            
-    return creds
+            max_retries = 0
+        return resilience.call_with_retry(method.split('.')[0], self._execute_once, http, max_retries=max_retries)
+
+    def _execute_once(self, http):
+        method = self.methodId or "unknown"
+        status = "200"
+        started = time.perf_counter()
+        try:
+            return super().execute(http=http)
+        except HttpError as error:
+            status = str(error.resp.status)
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            GOOGLE_API_DURATION.observe(time.perf_counter() - started, method=method)
+            GOOGLE_API_REQUESTS.inc(method=method, status=status)
+
+def _token_path() -> str:
+    return user_context.user_data_path(TOKEN_PATH)
+
+def _save_token(creds: Credentials):
+    # Written to a temporary file first, so a crash never leaves a truncated token.
+    user_context.ensure_user_data_dir()
+    token_path = _token_path()
+    temp_path = f"{token_path}.tmp"
+    with open(temp_path, "w") as token:
+        token.write(creds.to_json())
+    os.replace(temp_path, token_path)
+
+def _user_lock(user_id: int | None) -> threading.Lock:
+    with _credentials_lock:
+        return _user_locks.setdefault(user_id, threading.Lock())
+
+def _remember_credentials(user_id: int | None, creds: Credentials):
+    # Caller holds _credentials_lock.
+    _credentials[user_id] = creds
+    _credentials.move_to_end(user_id)
+    while len(_credentials) > config.AURA_USER_CACHE_SIZE:
+        _credentials.popitem(last=False)
+
+def get_credentials() -> Credentials:
+    """The current user's credentials (see src/core/user_context.py)."""
+    user_id = user_context.get_user_id()
+    with _credentials_lock:
+        creds = _credentials.get(user_id)
+        if creds is not None and creds.valid:
+            _credentials.move_to_end(user_id)
+            return creds
 
-def run_auth_flow() -> Credentials:
+    with _user_lock(user_id):
+        # Another thread may have loaded or refreshed them in the meantime.
+        with _credentials_lock:
+            creds = _credentials.get(user_id)
+        token_path = _token_path()
+        if creds is None and os.path.exists(token_path):
+            creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+                _save_token(creds)
+            else:
+                raise Exception("Authentication required. Please run the `!auth` command.")
+
+        with _credentials_lock:
+            _remember_credentials(user_id, creds)
+        return creds
+
+def has_credentials() -> bool:
+    """Whether the current user has connected a Google account."""
+    with _credentials_lock:
+        if user_context.get_user_id() in _credentials:
+            return True
+    return os.path.exists(_token_path())
+
+def clear_credentials():
+    """Forgets the current user's credentials and deletes their token, e.g. for `!deauth`."""
+    with _credentials_lock:
+        _credentials.pop(user_context.get_user_id(), None)
+    token_path = _token_path()
+    if os.path.exists(token_path):
+        os.remove(token_path)
+
+# The consent page is opened by the user on their own device, not on the bot's
+# host: Google redirects their browser to a loopback address that nothing
+# listens on, and the user pastes that address (which carries the
+# authorization code) back to the bot. Desktop app clients accept any loopback
+# redirect, so credentials.json needs no changes.
+AUTH_REDIRECT_URI = "http://localhost:1"
+
+def start_auth_flow() -> tuple[InstalledAppFlow, str, str]:
     """
-    Runs the local server authorization flow. This is the standard, most
-    reliable method for Desktop apps.
+    Starts authorization for the current user. Returns the flow, the consent
+    URL to send them and the state that the redirect must carry back.
     """
     if not os.path.exists(CREDS_PATH):
         raise FileNotFoundError(f"CRITICAL: '{CREDS_PATH}' not found.")
-    
-    flow = InstalledAppFlow.from_client_secrets_file(CREDS_PATH, SCOPES)
-    
-    # This will print a URL (like http://localhost:12345/) in the console.
-    creds = flow.run_local_server(port=0)
-    
-    with open(TOKEN_PATH, "w") as token:
-        token.write(creds.to_json())
+
+    flow = InstalledAppFlow.from_client_secrets_file(
+        CREDS_PATH, SCOPES, redirect_uri=AUTH_REDIRECT_URI, autogenerate_code_verifier=True)
+    url, state = flow.authorization_url(access_type='offline', prompt='consent')
+    return flow, url, state
+
+def finish_auth_flow(flow: InstalledAppFlow, state: str, redirected_url: str) -> Credentials:
+    """
+    Exchanges the code in the address the user was redirected to (or the bare
+    code) for credentials, and saves them as the current user's.
+    """
+    query = parse_qs(urlparse(redirected_url.strip()).query)
+    if 'error' in query:
+        raise ValueError(f"Google did not grant access: {query['error'][0]}")
+    if 'code' in query:
+        if query.get('state', [None])[0] != state:
+            raise ValueError("That address belongs to a different sign-in attempt. Please run `!auth` again.")
+        code = query['code'][0]
+    else:
+        code = redirected_url.strip()
+    flow.fetch_token(code=code)
+    creds = flow.credentials
+
+    user_id = user_context.get_user_id()
+    with _user_lock(user_id):
+        _save_token(creds)
+        with _credentials_lock:
+            _remember_credentials(user_id, creds)
     return creds
 
+def _get_discovery_document(service_name: str, version: str) -> dict | None:
+    key = (service_name, version)
+    if key not in _discovery_documents:
+        content = discovery_cache.get_static_doc(service_name, version)
+        if content is None:
+            return None
+        document = json.loads(content)
+        if config.GOOGLE_API_ROOT_URL:
+            # rootUrl is used for both regular and batch requests.
+            document['rootUrl'] = config.GOOGLE_API_ROOT_URL
+        _discovery_documents[key] = document
+    return _discovery_documents[key]
+
 def build_google_service(service_name: str, version: str):
     creds = get_credentials()
-    return build(service_name, version, credentials=creds)
\ No newline at end of file
+
+    services = getattr(_thread_local, 'services', None)
+    if services is None:
+        services = _thread_local.services = OrderedDict()
+
+    key = (user_context.get_user_id(), service_name, version)
+    cached = services.get(key)
+    if cached and cached[0] is creds:
+        services.move_to_end(key)
+        return cached[1]
+
+    document = _get_discovery_document(service_name, version)
+    if document is not None:
+        service = build_from_document(document, credentials=creds, requestBuilder=InstrumentedHttpRequest)
+    else:
+        service = build(service_name, version, credentials=creds, requestBuilder=InstrumentedHttpRequest)
+    services[key] = (creds, service)
+    services.move_to_end(key)
+    # Gmail and Calendar for each of the most recently active users.
+    while len(services) > 2 * config.AURA_USER_CACHE_SIZE:
+        services.popitem(last=False)
+    return service
@@ -0,0 +1,137 @@
+# File: src/core/loop_watchdog.py
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+
+from src.core import metrics
+
+# Measures event-loop lag with a heartbeat coroutine. A separate thread watches
+# the heartbeat; when it goes stale for longer than the threshold, the loop
+# thread's stack is captured so the blocking caller can be identified.
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+MAX_OFFENDERS = 50
+
+LOOP_LAG = metrics.histogram(
+    "aura_event_loop_lag_seconds", "Delay between a scheduled heartbeat and when it actually ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+LOOP_STALLS = metrics.counter(
+    "aura_event_loop_stalls_total", "Event-loop stalls over the threshold, by blocking caller.", ("caller",))
+LOOP_STALL_SECONDS = metrics.counter(
+    "aura_event_loop_stall_seconds_total", "Total time the event loop was blocked, by blocking caller.", ("caller",))
+
+
+def _is_project_frame(filename: str) -> bool:
+    path = os.path.abspath(filename)
+    return path.startswith(PROJECT_ROOT) and 'site-packages' not in path and os.sep + 'venv' + os.sep not in path
+
+
+def _blocking_caller(frame) -> str:
+    """The innermost frame from this project's code, or the leaf frame if none."""
+    leaf = frame
+    while frame is not None:
+        if _is_project_frame(frame.f_code.co_filename):
+            break
+        frame = frame.f_back
+    frame = frame or leaf
+    filename = os.path.relpath(frame.f_code.co_filename, PROJECT_ROOT) if _is_project_frame(frame.f_code.co_filename) \
+        else os.path.basename(frame.f_code.co_filename)
+    return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+class LoopWatchdog:
+    def __init__(self, loop: asyncio.AbstractEventLoop, interval: float = 0.1, threshold: float = 0.25):
+        self.loop = loop
+        self.interval = interval
+        self.threshold = threshold
+        self.offenders: dict[str, dict] = {}
+        self.max_lag = 0.0
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._pending_caller: str | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._stop.clear()
+        self._task = self.loop.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="aura-loop-watchdog", daemon=True)
+        self._thread.start()
+        print(f"WATCHDOG: Monitoring event-loop lag (threshold {self.threshold * 1000:.0f} ms).")
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _heartbeat(self):
+        self._loop_thread_id = threading.get_ident()
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._last_beat = now
+            LOOP_LAG.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+            with self._lock:
+                caller, self._pending_caller = self._pending_caller, None
+            if caller and lag >= self.threshold:
+                self._record_stall(caller, lag)
+
+    def _watch(self):
+        captured_for_beat = None
+        while not self._stop.wait(self.interval / 2):
+            last_beat = self._last_beat
+            stalled_for = time.monotonic() - last_beat - self.interval
+            if stalled_for < self.threshold or captured_for_beat == last_beat or self._loop_thread_id is None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            caller = _blocking_caller(frame)
+            stack = ''.join(traceback.format_stack(frame)[-12:])
+            captured_for_beat = last_beat
+            with self._lock:
+                self._pending_caller = caller
+                offender = self.offenders.get(caller)
+                if offender is None:
+                    offender = self.offenders[caller] = {'caller': caller, 'count': 0, 'total': 0.0, 'max': 0.0}
+                offender['stack'] = stack
+                self._trim_offenders()
+
+    def _record_stall(self, caller: str, lag: float):
+        with self._lock:
+            offender = self.offenders.get(caller)
+            if offender is None:
+                return
+            offender['count'] += 1
+            offender['total'] += lag
+            offender['max'] = max(offender['max'], lag)
+        LOOP_STALLS.inc(caller=caller)
+        LOOP_STALL_SECONDS.inc(lag, caller=caller)
+        print(f"WATCHDOG: Event loop blocked for {lag * 1000:.0f} ms by {caller}")
+
+    def _trim_offenders(self):
+        if len(self.offenders) <= MAX_OFFENDERS:
+            return
+        for caller in sorted(self.offenders, key=lambda key: self.offenders[key]['total'])[:len(self.offenders) - MAX_OFFENDERS]:
+            del self.offenders[caller]
+
+    def worst_offenders(self, limit: int = 10) -> list[dict]:
+        with self._lock:
+            offenders = [dict(offender) for offender in self.offenders.values() if offender['count']]
+        return sorted(offenders, key=lambda offender: offender['total'], reverse=True)[:limit]
+
+    def reset(self):
+        with self._lock:
+            self.offenders.clear()
+            self.max_lag = 0.0
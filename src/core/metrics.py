@@ -0,0 +1,176 @@
+# File: src/core/metrics.py
+
+import threading
+import time
+from contextlib import contextmanager
+
+# A small, dependency-free metrics registry that renders the Prometheus text
+# exposition format. Metrics are created with counter()/gauge()/histogram(),
+# which return the existing metric if one with the same name is registered.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: dict[str, '_Metric'] = {}
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple, labelvalues: tuple, extra: dict | None = None) -> str:
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.extend(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric '{self.name}' expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in sorted(items):
+            lines.extend(self._render_sample(labelvalues, value))
+        return lines
+
+    def _render_sample(self, labelvalues: tuple, value) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[tuple[dict, float]]:
+        """Every (labels, value) pair recorded so far."""
+        with self._lock:
+            items = list(self._values.items())
+        return [(dict(zip(self.labelnames, labelvalues)), value) for labelvalues, value in items]
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][index] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_sample(self, labelvalues: tuple, state) -> list[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets, state['counts']):
+            cumulative += count
+            labels = _format_labels(self.labelnames, labelvalues, {'le': _format_value(bound)})
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, labelvalues)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+def _get_or_create(cls, name: str, documentation: str, labelnames: tuple, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, documentation, labelnames, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric '{name}' is already registered as a {metric.type_name}.")
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+    return _get_or_create(Gauge, name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+    return _get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def render() -> str:
+    """Renders every registered metric in the Prometheus text format."""
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda metric: metric.name)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
@@ -1,39 +1,165 @@
 # File: src/core/model_manager.py
 
+import copy
+import hashlib
 import json
-import os
-from typing import Dict, Any
+import threading
+from typing import Any, Callable, Dict
 
-from src.core import config
+from src.core import config, storage
 
-MODELS_FILE = "models.json"
+# The model configuration is shared by all users (models.json with the JSON backend).
+MODELS_DOCUMENT = storage.register_document("models", shared=True)
 
-# --- Private Helper Functions ---
+# --- Cached Configuration ---
+# The configuration is parsed once and kept in memory. Every access compares
+# the stored document's version (for models.json: its mtime and size) with the
+# cached copy, and re-reads it only when they differ; a changed hash then means
+# the configuration really changed (for example the file was edited by hand).
+# The store writes atomically. Subscribers are called whenever the active
+# model or the API keys change, whether through these functions or an edit.
 
-def _load_configs() -> Dict[str, Any]:
-    """Loads model and key configurations from the JSON file."""
-    if not os.path.exists(MODELS_FILE):
-        return {}
+_lock = threading.RLock()
+_configs: Dict[str, Any] = {}
+_stored_version: tuple | None = None
+_configs_hash: str | None = None
+_subscribers: list[Callable[[Dict[str, Any] | None], None]] = []
+
+
+class ConfigValidationError(ValueError):
+    """Raised when a model configuration does not match the expected schema."""
+
+
+def validate_configs(configs: Any) -> list[str]:
+    """Returns the schema violations of a model configuration (empty if valid)."""
+    if not isinstance(configs, dict):
+        return ["the configuration must be a JSON object"]
+    errors = []
+    active_model_id = configs.get("active_model_id")
+    if active_model_id is not None and not isinstance(active_model_id, str):
+        errors.append("'active_model_id' must be a string")
+    api_keys = configs.get("api_keys", {})
+    if not isinstance(api_keys, dict) or not all(isinstance(value, str) for value in api_keys.values()):
+        errors.append("'api_keys' must map key names to strings")
+    models = configs.get("models", {})
+    if not isinstance(models, dict):
+        errors.append("'models' must be an object")
+        models = {}
+    for model_id, model in models.items():
+        if not isinstance(model, dict):
+            errors.append(f"model '{model_id}' must be an object")
+            continue
+        for field in ("model_name", "provider", "api_key_id"):
+            if not isinstance(model.get(field), str) or not model.get(field):
+                errors.append(f"model '{model_id}' needs a string '{field}'")
+    return errors
+
+
+def _hash(configs: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(configs, sort_keys=True).encode()).hexdigest()
+
+
+def _active_signature(configs: Dict[str, Any]) -> tuple:
+    return (json.dumps(_resolve_active(configs), sort_keys=True), json.dumps(configs.get("api_keys", {}), sort_keys=True))
+
+
+def _refresh() -> bool:
+    """
+    Re-reads the configuration if it changed in the store. Caller holds _lock.
+    Returns whether subscribers need to be notified.
+    """
+    global _stored_version
+    store = storage.get_shared_store()
+    version = store.version(MODELS_DOCUMENT)
+    if version == _stored_version:
+        return False
+    _stored_version = version
     try:
-        with open(MODELS_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {}
+        configs = store.load(MODELS_DOCUMENT)
+    except storage.StorageError as e:
+        print(f"WARNING: {e}. Keeping the previous model configuration.")
+        return False
+    if configs is None:
+        return _replace_configs({}, None)
+    digest = _hash(configs)
+    if digest == _configs_hash:
+        return False
+    errors = validate_configs(configs)
+    if errors:
+        print(f"WARNING: The model configuration is invalid ({'; '.join(errors)}). Keeping the previous configuration.")
+        return False
+    return _replace_configs(configs, digest)
+
+
+def _replace_configs(configs: Dict[str, Any], digest: str | None) -> bool:
+    """Installs a new configuration. Caller holds _lock. Returns whether the active model or keys changed."""
+    global _configs, _configs_hash
+    changed = _active_signature(configs) != _active_signature(_configs)
+    _configs, _configs_hash = configs, digest
+    return changed
+
+
+def _notify(configs: Dict[str, Any]):
+    # Called without _lock held, so subscribers may use this module freely.
+    active_config = _resolve_active(configs)
+    for callback in list(_subscribers):
+        try:
+            callback(active_config)
+        except Exception as e:
+            print(f"WARNING: Model config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+
+def _current_configs() -> Dict[str, Any]:
+    """The cached configuration (do not modify), refreshed from disk if the file changed."""
+    with _lock:
+        changed = _refresh()
+        configs = _configs
+    if changed:
+        _notify(configs)
+    return configs
+
+
+def _load_configs() -> Dict[str, Any]:
+    """A private copy of the current configuration, safe to modify and pass to _save_configs."""
+    return copy.deepcopy(_current_configs())
+
 
 def _save_configs(configs: Dict[str, Any]):
-    """Saves the configurations to the JSON file."""
-    with open(MODELS_FILE, 'w') as f:
-        json.dump(configs, f, indent=4)
+    """Validates the configuration and replaces the stored one with it."""
+    global _stored_version
+    errors = validate_configs(configs)
+    if errors:
+        raise ConfigValidationError("; ".join(errors))
+    configs = copy.deepcopy(configs)
+    with _lock:
+        store = storage.get_shared_store()
+        store.save(MODELS_DOCUMENT, configs)
+        _stored_version = store.version(MODELS_DOCUMENT)
+        changed = _replace_configs(configs, _hash(configs))
+    if changed:
+        _notify(configs)
 
-def _initialize_configs():
+
+def subscribe(callback: Callable[[Dict[str, Any] | None], None]):
+    """
+    Registers callback(active_config) to be called when the active model or
+    the API keys change. active_config is what get_active_config() returns.
+    Callbacks run in the thread that noticed the change and must be quick.
+    """
+    with _lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+
+
+def initialize_configs():
     """
-    Creates a default models.json from .env variables if it doesn't exist.
-    This is called on bot startup.
+    Creates a default model configuration from .env variables if none is stored.
+    This is called on bot startup, not at import time.
     """
-    if os.path.exists(MODELS_FILE):
+    if storage.get_shared_store().version(MODELS_DOCUMENT) is not None:
         return
 
-    print("INFO: models.json not found. Creating a default configuration from .env file...")
+    print("INFO: No model configuration found. Creating a default configuration from .env file...")
     
     if not config.GOOGLE_API_KEY:
         print("WARNING: GOOGLE_API_KEY not found in .env. Cannot create default model config.")
@@ -53,7 +179,7 @@ def _initialize_configs():
         }
     }
     _save_configs(default_configs)
-    print("INFO: Default models.json created successfully.")
+    print("INFO: Default model configuration created successfully.")
 
 # --- Public Management Functions ---
 
@@ -111,7 +237,9 @@ def get_active_config() -> Dict[str, Any] | None:
     """
     Gets the full configuration details for the currently active model.
     """
-    configs = _load_configs()
+    return _resolve_active(_current_configs())
+
+def _resolve_active(configs: Dict[str, Any]) -> Dict[str, Any] | None:
     active_model_id = configs.get("active_model_id")
     if not active_model_id:
         return None
@@ -129,6 +257,3 @@ def get_active_config() -> Dict[str, Any] | None:
         "model_name": model_info["model_name"],
         "api_key": api_key
     }
-
-# --- Initialization ---
-_initialize_configs()
\ No newline at end of file
@@ -0,0 +1,181 @@
+# File: src/core/profiling.py
+
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# A sampling profiler that can be armed for the next N agent/webhook runs.
+# While disarmed, a profiled coroutine costs one attribute check per call.
+
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+MAX_STACK_DEPTH = 128
+
+# Leaf frames that mean a thread is idle rather than doing work.
+IDLE_LEAVES = {
+    ('selectors.py', 'select'),
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'),
+    ('socketserver.py', 'serve_forever'),
+    ('thread.py', '_worker'),
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all other threads at a fixed interval and counts
+    them as collapsed stacks ("root;...;leaf" -> samples).
+    """
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="aura-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        thread_names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                thread_names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(thread_names.get(thread_id, str(thread_id)))
+                self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format used by flamegraph.pl and speedscope."""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + '\n'
+
+    def top_functions(self, limit: int = 40) -> str:
+        self_counts, total_counts = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')[1:]  # drop the thread name
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+
+        total = sum(self.stacks.values()) or 1
+        lines = [
+            f"Samples: {total} stacks over {self.samples} ticks ({self.interval * 1000:.0f} ms interval)",
+            "",
+            f"{'self %':>8} {'total %':>8} {'self':>7} {'total':>7}  function",
+        ]
+        for frame, count in self_counts.most_common(limit):
+            lines.append(f"{count / total * 100:8.1f} {total_counts[frame] / total * 100:8.1f} "
+                         f"{count:7d} {total_counts[frame]:7d}  {frame}")
+        return '\n'.join(lines) + '\n'
+
+
+class ProfileController:
+    """
+    Arms the sampling profiler for the next N profiled runs. When the last run
+    finishes, the report is handed to the reporter coroutine and the profiler
+    turns itself off.
+    """
+    def __init__(self):
+        self.remaining = 0
+        self.labels: Counter = Counter()
+        self._active = 0
+        self._profiler: SamplingProfiler | None = None
+        self._reporter = None
+        self._started_at = 0.0
+
+    @property
+    def armed(self) -> bool:
+        return self.remaining > 0 or self._active > 0
+
+    def arm(self, runs: int, reporter):
+        """`reporter` is an async callable taking (collapsed_text, top_text, summary)."""
+        self.remaining = runs
+        self.labels = Counter()
+        self._reporter = reporter
+
+    def disarm(self):
+        """Cancels any pending runs. A run in progress finishes without a report."""
+        self.remaining = 0
+        self._reporter = None
+        if self._active == 0 and self._profiler:
+            self._profiler.stop()
+            self._profiler = None
+
+    async def run(self, label: str, coro_func, *args, **kwargs):
+        if self.remaining <= 0:
+            return await coro_func(*args, **kwargs)
+
+        self.remaining -= 1
+        self.labels[label] += 1
+        if self._active == 0 and self._profiler is None:
+            self._profiler = SamplingProfiler()
+            self._started_at = time.perf_counter()
+            self._profiler.start()
+        self._active += 1
+        try:
+            return await coro_func(*args, **kwargs)
+        finally:
+            self._active -= 1
+            if self.remaining <= 0 and self._active == 0:
+                await self._finish()
+
+    async def _finish(self):
+        profiler, reporter = self._profiler, self._reporter
+        self._profiler, self._reporter = None, None
+        if profiler is None:
+            return
+        await asyncio.get_running_loop().run_in_executor(None, profiler.stop)
+
+        runs = ", ".join(f"{count}x {label}" for label, count in self.labels.items())
+        summary = f"Profiled {runs} in {time.perf_counter() - self._started_at:.2f}s ({profiler.samples} ticks)."
+        print(f"PROFILER: {summary}")
+        if reporter:
+            try:
+                await reporter(profiler.collapsed(), profiler.top_functions(), summary)
+            except Exception as e:
+                print(f"PROFILER ERROR: Could not deliver report: {e}")
+
+
+PROFILER = ProfileController()
+
+
+def profiled(label: str):
+    """Decorator for coroutines that should be profiled while the profiler is armed."""
+    def decorator(coro_func):
+        @functools.wraps(coro_func)
+        async def wrapper(*args, **kwargs):
+            if PROFILER.remaining <= 0:
+                return await coro_func(*args, **kwargs)
+            return await PROFILER.run(label, coro_func, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,181 @@
+# File: src/core/resilience.py
+
+import email.utils
+import random
+import ssl
+import threading
+import time
+
+from googleapiclient.errors import HttpError
+from httplib2 import ServerNotFoundError
+
+from src.core import config, metrics
+
+# One retry policy for every Google API call: transient failures (429, 5xx,
+# rate-limit 403s, dropped connections) are retried with exponential backoff
+# and full jitter, honoring Retry-After. A circuit breaker per API ("gmail",
+# "calendar") fails calls fast while that API keeps failing, then lets a
+# single probe through to test whether it has recovered.
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = ("ratelimitexceeded", "userratelimitexceeded")
+
+# Breaker states, exported as the aura_circuit_breaker_state gauge value.
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+RETRIES = metrics.counter(
+    "aura_google_api_retries_total", "Google API calls retried after a transient failure.", ("api", "reason"))
+BREAKER_TRIPS = metrics.counter(
+    "aura_circuit_breaker_trips_total", "Times a Google API circuit breaker opened.", ("api",))
+BREAKER_REJECTED = metrics.counter(
+    "aura_circuit_breaker_rejected_total", "Calls failed fast because the circuit breaker was open.", ("api",))
+BREAKER_STATE = metrics.gauge(
+    "aura_circuit_breaker_state", "Circuit breaker state per API (0 closed, 1 half-open, 2 open).", ("api",))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an API whose circuit breaker is open."""
+
+
+def failure_reason(error: BaseException) -> str | None:
+    """The retry reason for a transient error (e.g. '503', 'connection'), or None if it should not be retried."""
+    if isinstance(error, HttpError):
+        status = error.resp.status
+        if status in RETRYABLE_STATUSES:
+            return str(status)
+        if status == 403 and any(reason in str(error).lower() for reason in RATE_LIMIT_REASONS):
+            return "403_rate_limit"
+        return None
+    if isinstance(error, (ConnectionError, TimeoutError, ssl.SSLError, ServerNotFoundError)):
+        return "connection"
+    return None
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    resp = getattr(error, 'resp', None)
+    value = resp.get('retry-after') if resp is not None and hasattr(resp, 'get') else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, error: BaseException | None = None) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based), or the server's Retry-After."""
+    retry_after = retry_after_seconds(error) if error is not None else None
+    if retry_after is not None:
+        return min(retry_after, config.GOOGLE_API_BACKOFF_MAX)
+    return random.uniform(0, min(config.GOOGLE_API_BACKOFF_MAX, config.GOOGLE_API_BACKOFF_BASE * 2 ** attempt))
+
+
+class CircuitBreaker:
+    def __init__(self, api: str, failure_threshold: int, reset_timeout: float):
+        self.api = api
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(STATE_VALUES[CLOSED], api=api)
+
+    def _set_state(self, state: str):
+        self.state = state
+        BREAKER_STATE.set(STATE_VALUES[state], api=self.api)
+
+    def before_call(self):
+        """Raises CircuitOpenError if the call should be shed."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        BREAKER_REJECTED.inc(api=self.api)
+        raise CircuitOpenError(
+            f"The Google {self.api} API is failing; requests are paused for about {retry_in:.0f}s.")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            if self.state != CLOSED:
+                print(f"RESILIENCE: Circuit breaker for '{self.api}' closed.")
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+                BREAKER_TRIPS.inc(api=self.api)
+                print(f"RESILIENCE: Circuit breaker for '{self.api}' opened after {self.failures} failures.")
+
+    def record_neutral(self):
+        # A non-transient error (e.g. 404) says the API is up, but a half-open
+        # probe that ends this way must still free the probe slot.
+        with self._lock:
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN:
+                self.failures = 0
+                self._set_state(CLOSED)
+            elif self.state == CLOSED:
+                self.failures = 0
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(api: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(api)
+        if breaker is None:
+            breaker = _breakers[api] = CircuitBreaker(
+                api, config.GOOGLE_API_BREAKER_THRESHOLD, config.GOOGLE_API_BREAKER_RESET_SECONDS)
+        return breaker
+
+
+def call_with_retry(api: str, func, *args, max_retries: int | None = None):
+    """
+    Calls func(*args) under the API's circuit breaker, retrying transient
+    failures. Non-transient errors are raised immediately.
+    """
+    max_retries = config.GOOGLE_API_MAX_RETRIES if max_retries is None else max_retries
+    breaker = get_breaker(api)
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = func(*args)
+        except Exception as error:
+            reason = failure_reason(error)
+            if reason is None:
+                breaker.record_neutral()
+                raise
+            breaker.record_failure()
+            if attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt, error)
+            RETRIES.inc(api=api, reason=reason)
+            print(f"RESILIENCE: {api} call failed ({reason}); retry {attempt + 1}/{max_retries} in {delay:.2f}s.")
+            time.sleep(delay)
+            attempt += 1
+            continue
+        breaker.record_success()
+        return result
@@ -0,0 +1,524 @@
+# File: src/core/storage.py
+
+import copy
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from src.core import config, user_context
+
+# One storage interface for Aura's small persistent state, with interchangeable
+# backends chosen by AURA_STORAGE_BACKEND:
+#
+# - documents are whole JSON values that are read and written at once (the
+#   Gmail tracker, the model configuration);
+# - collections are ordered sets of keyed records (tasks, notes) that can be
+#   read one at a time or a page at a time, without loading the rest.
+#
+# Every user has their own store in their data folder (user_context.user_data_dir);
+# data shared by all users lives in the owner's store. Modules register the
+# names they use, so storage_migration.py knows what to copy between backends.
+
+_DOCUMENTS: dict[str, bool] = {}  # name -> shared by all users
+_COLLECTIONS: dict[str, bool] = {}
+
+
+class StorageError(Exception):
+    """Raised when stored data cannot be read back, for example a corrupt JSON file."""
+
+
+def register_document(name: str, shared: bool = False) -> str:
+    _DOCUMENTS[name] = shared
+    return name
+
+
+def register_collection(name: str, shared: bool = False) -> str:
+    _COLLECTIONS[name] = shared
+    return name
+
+
+def registered_documents() -> dict[str, bool]:
+    return dict(_DOCUMENTS)
+
+
+def registered_collections() -> dict[str, bool]:
+    return dict(_COLLECTIONS)
+
+
+def _matches(record: dict, where: dict | None) -> bool:
+    return not where or all(record.get(field) == value for field, value in where.items())
+
+
+# One lock per directory rather than per store object: a store evicted from the
+# cache below may still be in use while a new one is opened over the same
+# folder, and both must serialize their read-modify-writes.
+_directory_locks: dict[str, threading.RLock] = {}
+_directory_locks_lock = threading.Lock()
+
+
+def _directory_lock(directory: str) -> threading.RLock:
+    with _directory_locks_lock:
+        return _directory_locks.setdefault(os.path.abspath(directory), threading.RLock())
+
+
+def _write_atomically(path: str, data: bytes):
+    """Replaces path with data so that readers and crashes only ever see the old or the new file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=".aura-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class StorageBackend:
+    """
+    The interface every backend implements. Values are plain JSON data; what a
+    caller gets back is its own copy. Each method is atomic on its own, and
+    update() makes a read-modify-write of a document atomic within the process.
+    """
+    kind = ""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = _directory_lock(directory)
+        self._counts: dict[tuple, tuple[Any, int]] = {}
+        self._writes: dict[str, int] = {}
+
+    # --- Documents ---
+
+    def load(self, name: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def save(self, name: str, value: Any):
+        raise NotImplementedError
+
+    def version(self, name: str) -> tuple | None:
+        """A cheap token that changes whenever the document changes, or None if it does not exist."""
+        raise NotImplementedError
+
+    def update(self, name: str, func: Callable[[Any], Any], default: Any = None) -> Any:
+        """Saves func(current value) as the document's new value and returns it."""
+        with self._lock:
+            value = func(self.load(name, copy.deepcopy(default)))
+            self.save(name, value)
+            return value
+
+    # --- Collections ---
+
+    def get_record(self, collection: str, key: str) -> dict | None:
+        raise NotImplementedError
+
+    def put_record(self, collection: str, key: str, record: dict):
+        """Inserts the record at the end of the collection, or replaces it in place."""
+        raise NotImplementedError
+
+    def delete_record(self, collection: str, key: str) -> bool:
+        raise NotImplementedError
+
+    def list_records(self, collection: str, where: dict | None = None,
+                     offset: int = 0, limit: int | None = None) -> list[tuple[str, dict]]:
+        """(key, record) pairs in insertion order whose fields equal those in where."""
+        raise NotImplementedError
+
+    def count_records(self, collection: str, where: dict | None = None) -> int:
+        """
+        The number of records whose fields equal those in where. Counts are
+        cached until the collection changes, so paging through a long list
+        only counts it once.
+        """
+        key = (collection, tuple(sorted((where or {}).items())))
+        with self._lock:
+            version = self._collection_version(collection)
+            cached = self._counts.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            count = self._count_records(collection, where)
+            self._counts[key] = (version, count)
+            return count
+
+    def _count_records(self, collection: str, where: dict | None) -> int:
+        raise NotImplementedError
+
+    def _collection_version(self, collection: str) -> Any:
+        # Changes whenever the collection does; backends add what other processes can change.
+        return self._writes.get(collection, 0)
+
+    def _changed(self, collection: str):
+        # Caller holds _lock.
+        self._writes[collection] = self._writes.get(collection, 0) + 1
+
+    def replace_records(self, collection: str, items: list[tuple[str, dict]]):
+        """Replaces the whole collection with the given (key, record) pairs."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryBackend(StorageBackend):
+    kind = "memory"
+
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self._documents: dict[str, tuple[int, Any]] = {}
+        self._collections: dict[str, dict[str, dict]] = {}
+        self._counter = 0
+
+    def load(self, name, default=None):
+        with self._lock:
+            if name not in self._documents:
+                return default
+            return copy.deepcopy(self._documents[name][1])
+
+    def save(self, name, value):
+        with self._lock:
+            self._counter += 1
+            self._documents[name] = (self._counter, copy.deepcopy(value))
+
+    def version(self, name):
+        with self._lock:
+            return (self._documents[name][0],) if name in self._documents else None
+
+    def get_record(self, collection, key):
+        with self._lock:
+            return copy.deepcopy(self._collections.get(collection, {}).get(key))
+
+    def put_record(self, collection, key, record):
+        with self._lock:
+            self._collections.setdefault(collection, {})[key] = copy.deepcopy(record)
+            self._changed(collection)
+
+    def delete_record(self, collection, key):
+        with self._lock:
+            if self._collections.get(collection, {}).pop(key, None) is None:
+                return False
+            self._changed(collection)
+            return True
+
+    def list_records(self, collection, where=None, offset=0, limit=None):
+        with self._lock:
+            items = [(key, record) for key, record in self._collections.get(collection, {}).items()
+                     if _matches(record, where)]
+            end = None if limit is None else offset + limit
+            return copy.deepcopy(items[offset:end])
+
+    def _count_records(self, collection, where):
+        return sum(1 for record in self._collections.get(collection, {}).values() if _matches(record, where))
+
+    def replace_records(self, collection, items):
+        with self._lock:
+            self._collections[collection] = {key: copy.deepcopy(record) for key, record in items}
+            self._changed(collection)
+
+
+class JsonFileBackend(StorageBackend):
+    """
+    The original layout: every document and collection is <name>.json in the
+    user's folder. Collections are stored as an object of records by key; a
+    list of records (the old tasks.json format) is read using their 'id'.
+    Every write replaces the whole file atomically. The parsed collection is
+    kept until the file changes, so paging through it parses the file once,
+    but each record write still rewrites the whole file; large collections
+    belong in the sqlite backend, which reads and writes single rows.
+    """
+    kind = "json"
+
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self._parsed: dict[str, tuple[tuple, dict[str, dict]]] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _read(self, name: str, default: Any) -> Any:
+        path = self._path(name)
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+        except json.JSONDecodeError as e:
+            raise StorageError(f"{path} is not valid JSON: {e}") from e
+
+    def _write(self, name: str, value: Any):
+        _write_atomically(self._path(name), json.dumps(value, indent=4).encode())
+
+    def _read_collection(self, collection: str) -> dict[str, dict]:
+        # Caller holds _lock. The result is shared with later reads: copy before changing or returning it.
+        version = self.version(collection)
+        cached = self._parsed.get(collection)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        records = self._read(collection, {})
+        if isinstance(records, list):
+            records = {str(record['id']): record for record in records if isinstance(record, dict) and 'id' in record}
+        elif not isinstance(records, dict):
+            raise StorageError(f"{self._path(collection)} does not contain a collection of records.")
+        if version is not None:
+            self._parsed[collection] = (version, records)
+        return records
+
+    def _write_collection(self, collection: str, records: dict[str, dict]):
+        self._write(collection, records)
+        self._parsed[collection] = (self.version(collection), records)
+        self._changed(collection)
+
+    def load(self, name, default=None):
+        with self._lock:
+            return self._read(name, default)
+
+    def save(self, name, value):
+        with self._lock:
+            self._write(name, value)
+
+    def version(self, name):
+        try:
+            stat = os.stat(self._path(name))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get_record(self, collection, key):
+        with self._lock:
+            return copy.deepcopy(self._read_collection(collection).get(key))
+
+    def put_record(self, collection, key, record):
+        with self._lock:
+            records = dict(self._read_collection(collection))
+            records[key] = copy.deepcopy(record)
+            self._write_collection(collection, records)
+
+    def delete_record(self, collection, key):
+        with self._lock:
+            records = dict(self._read_collection(collection))
+            if key not in records:
+                return False
+            del records[key]
+            self._write_collection(collection, records)
+            return True
+
+    def list_records(self, collection, where=None, offset=0, limit=None):
+        end = None if limit is None else offset + limit
+        with self._lock:
+            items = [(key, record) for key, record in self._read_collection(collection).items()
+                     if _matches(record, where)]
+            return copy.deepcopy(items[offset:end])
+
+    def _count_records(self, collection, where):
+        return sum(1 for record in self._read_collection(collection).values() if _matches(record, where))
+
+    def _collection_version(self, collection):
+        # The file can also be edited by hand.
+        return (super()._collection_version(collection), self.version(collection))
+
+    def replace_records(self, collection, items):
+        with self._lock:
+            self._write_collection(collection, {key: copy.deepcopy(record) for key, record in items})
+
+
+class SqliteBackend(StorageBackend):
+    """
+    One database file per user (AURA_STORAGE_SQLITE_FILE) holding every
+    document and collection. Records are stored one per row, so writing a task
+    or reading a page of notes does not touch the rest of the collection.
+    """
+    kind = "sqlite"
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS documents (
+        name TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        version INTEGER NOT NULL DEFAULT 1
+    );
+    CREATE TABLE IF NOT EXISTS records (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        collection TEXT NOT NULL,
+        key TEXT NOT NULL,
+        data TEXT NOT NULL,
+        UNIQUE (collection, key)
+    );
+    CREATE INDEX IF NOT EXISTS records_order ON records (collection, seq);
+    """
+
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self.path = os.path.join(directory, config.AURA_STORAGE_SQLITE_FILE)
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self, create: bool = True) -> sqlite3.Connection | None:
+        # Caller holds _lock. Reopens the file if the store was closed while in use.
+        # Reads pass create=False and get None while the file does not exist yet.
+        if self._connection is None:
+            if not create and not os.path.exists(self.path):
+                return None
+            os.makedirs(self.directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            # Tasks and notes exist nowhere else, so a commit must survive a power cut.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=FULL")
+            connection.executescript(self._SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _decode(data: str) -> Any:
+        try:
+            return json.loads(data)
+        except json.JSONDecodeError as e:
+            raise StorageError(f"Stored value is not valid JSON: {e}") from e
+
+    @staticmethod
+    def _where_sql(where: dict | None) -> tuple[str, list]:
+        clauses, params = [], []
+        for field, value in (where or {}).items():
+            path = '$."' + field.replace('"', '') + '"'
+            if value is None:
+                clauses.append("json_extract(data, ?) IS NULL")
+                params.append(path)
+            else:
+                clauses.append("json_extract(data, ?) = ?")
+                params.extend((path, value))
+        return "".join(f" AND {clause}" for clause in clauses), params
+
+    def load(self, name, default=None):
+        with self._lock:
+            connection = self._connect(create=False)
+            row = connection and connection.execute("SELECT data FROM documents WHERE name = ?", (name,)).fetchone()
+        return default if row is None else self._decode(row[0])
+
+    def save(self, name, value):
+        data = json.dumps(value)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    """INSERT INTO documents (name, data) VALUES (?, ?)
+                       ON CONFLICT (name) DO UPDATE SET data = excluded.data, version = documents.version + 1""",
+                    (name, data))
+
+    def version(self, name):
+        with self._lock:
+            connection = self._connect(create=False)
+            row = connection and connection.execute("SELECT version FROM documents WHERE name = ?", (name,)).fetchone()
+        return None if row is None else (row[0],)
+
+    def get_record(self, collection, key):
+        with self._lock:
+            connection = self._connect(create=False)
+            row = connection and connection.execute(
+                "SELECT data FROM records WHERE collection = ? AND key = ?", (collection, key)).fetchone()
+        return None if row is None else self._decode(row[0])
+
+    def put_record(self, collection, key, record):
+        data = json.dumps(record)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    """INSERT INTO records (collection, key, data) VALUES (?, ?, ?)
+                       ON CONFLICT (collection, key) DO UPDATE SET data = excluded.data""",
+                    (collection, key, data))
+            self._changed(collection)
+
+    def delete_record(self, collection, key):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                cursor = connection.execute("DELETE FROM records WHERE collection = ? AND key = ?", (collection, key))
+            self._changed(collection)
+            return cursor.rowcount > 0
+
+    def list_records(self, collection, where=None, offset=0, limit=None):
+        where_sql, params = self._where_sql(where)
+        with self._lock:
+            connection = self._connect(create=False)
+            rows = connection.execute(
+                f"SELECT key, data FROM records WHERE collection = ?{where_sql} ORDER BY seq LIMIT ? OFFSET ?",
+                [collection, *params, -1 if limit is None else limit, offset]).fetchall() if connection else []
+        return [(key, self._decode(data)) for key, data in rows]
+
+    def _count_records(self, collection, where):
+        where_sql, params = self._where_sql(where)
+        connection = self._connect(create=False)
+        if connection is None:
+            return 0
+        return connection.execute(
+            f"SELECT COUNT(*) FROM records WHERE collection = ?{where_sql}", [collection, *params]).fetchone()[0]
+
+    def _collection_version(self, collection):
+        # data_version changes when another connection (another process) commits.
+        connection = self._connect(create=False)
+        data_version = connection.execute("PRAGMA data_version").fetchone()[0] if connection else None
+        return (super()._collection_version(collection), data_version)
+
+    def replace_records(self, collection, items):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM records WHERE collection = ?", (collection,))
+                connection.executemany(
+                    "INSERT INTO records (collection, key, data) VALUES (?, ?, ?)",
+                    [(collection, key, json.dumps(record)) for key, record in items])
+            self._changed(collection)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._counts.clear()
+
+
+BACKENDS = {
+    MemoryBackend.kind: MemoryBackend,
+    JsonFileBackend.kind: JsonFileBackend,
+    SqliteBackend.kind: SqliteBackend,
+}
+
+# Open stores of the AURA_USER_CACHE_SIZE most recently used users (plus the
+# shared one). In-memory stores are never dropped: they hold the only copy.
+_stores: OrderedDict[tuple[str, str], StorageBackend] = OrderedDict()
+_stores_lock = threading.Lock()
+
+
+def open_store(kind: str, directory: str) -> StorageBackend:
+    """A new, uncached store of the given backend over directory."""
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown storage backend '{kind}'. Choose from: {', '.join(BACKENDS)}.")
+    return BACKENDS[kind](directory)
+
+
+def _cached_store(directory: str) -> StorageBackend:
+    kind = config.AURA_STORAGE_BACKEND
+    key = (kind, os.path.abspath(directory))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = open_store(kind, directory)
+        _stores.move_to_end(key)
+        if kind != MemoryBackend.kind:
+            while len(_stores) > config.AURA_USER_CACHE_SIZE + 1:
+                _stores.popitem(last=False)[1].close()
+    return store
+
+
+def get_store(user_id: int | None = None) -> StorageBackend:
+    """The configured store for a user's data, the current user's by default."""
+    return _cached_store(user_context.user_data_dir(user_id))
+
+
+def get_shared_store() -> StorageBackend:
+    """The configured store for data shared by all users (kept with the owner's)."""
+    return _cached_store(".")
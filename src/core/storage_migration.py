@@ -0,0 +1,104 @@
+# File: src/core/storage_migration.py
+#
+# Copies every user's stored data (tasks, notes, Gmail tracker, model
+# configuration) from one storage backend to another. Stop the bot first, run
+# the migration, then set AURA_STORAGE_BACKEND to the target backend. The
+# source is left untouched, so switching back needs no migration.
+#
+# Usage: python -m src.core.storage_migration --from json --to sqlite [--user ID ...] [--overwrite] [--dry-run]
+
+import argparse
+import sys
+
+from src.core import storage, user_context
+
+# Importing the modules that own stored data registers their documents and collections.
+import gmail_history_tracker  # noqa: F401
+from src.agent.tools import notes, tasks  # noqa: F401
+from src.core import model_manager  # noqa: F401
+
+
+def migrate_store(source: storage.StorageBackend, target: storage.StorageBackend, include_shared: bool,
+                  overwrite: bool = False, dry_run: bool = False) -> list[str]:
+    """Copies the registered documents and collections of one folder. Returns a report line per item."""
+    report = []
+    copied = "would be copied" if dry_run else "copied"
+    for name, shared in storage.registered_documents().items():
+        if shared and not include_shared:
+            continue
+        if source.version(name) is None:
+            report.append(f"  document {name}: not in source, skipped")
+            continue
+        if target.version(name) is not None and not overwrite:
+            report.append(f"  document {name}: already in target, skipped (use --overwrite)")
+            continue
+        if not dry_run:
+            target.save(name, source.load(name))
+        report.append(f"  document {name}: {copied}")
+
+    for name, shared in storage.registered_collections().items():
+        if shared and not include_shared:
+            continue
+        items = source.list_records(name)
+        if not items:
+            report.append(f"  collection {name}: empty in source, skipped")
+            continue
+        existing = target.count_records(name)
+        if existing and not overwrite:
+            report.append(f"  collection {name}: {existing} record(s) already in target, skipped (use --overwrite)")
+            continue
+        if not dry_run:
+            target.replace_records(name, items)
+            if target.count_records(name) != len(items):
+                raise storage.StorageError(f"Collection {name} has {target.count_records(name)} records "
+                                           f"in the target after copying {len(items)}.")
+        report.append(f"  collection {name}: {len(items)} record(s) {copied}")
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Copy Aura's stored data between storage backends.")
+    parser.add_argument("--from", dest="source", required=True, choices=sorted(storage.BACKENDS))
+    parser.add_argument("--to", dest="target", required=True, choices=sorted(storage.BACKENDS))
+    parser.add_argument("--user", type=int, action="append",
+                        help="Only migrate this Discord user's data (repeatable). Default: the owner and AURA_USER_IDS.")
+    parser.add_argument("--overwrite", action="store_true", help="Replace data that already exists in the target.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be copied without writing.")
+    args = parser.parse_args()
+
+    if storage.MemoryBackend.kind in (args.source, args.target):
+        parser.error("the memory backend only lives inside a running process and cannot be migrated")
+    if args.source == args.target:
+        parser.error("--from and --to must be different backends")
+
+    user_ids = args.user or user_context.known_user_ids() or [None]
+    folders: dict[str, bool] = {}
+    for user_id in user_ids:
+        directory = user_context.user_data_dir(user_id)
+        folders[directory] = folders.get(directory, False) or user_context.is_owner(user_id)
+
+    print(f"=== Migrating storage from {args.source} to {args.target}{' (dry run)' if args.dry_run else ''} ===")
+    failed = False
+    for directory, include_shared in folders.items():
+        print(f"{directory}{' (with shared data)' if include_shared else ''}:")
+        source = storage.open_store(args.source, directory)
+        target = storage.open_store(args.target, directory)
+        try:
+            for line in migrate_store(source, target, include_shared, args.overwrite, args.dry_run):
+                print(line)
+        except storage.StorageError as e:
+            print(f"  FAIL: {e}")
+            failed = True
+        finally:
+            source.close()
+            target.close()
+
+    if failed:
+        return 1
+    if not args.dry_run:
+        print(f"\nDone. Set AURA_STORAGE_BACKEND={args.target} and restart the bot.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
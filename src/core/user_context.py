@@ -0,0 +1,78 @@
+# File: src/core/user_context.py
+
+import contextvars
+import os
+from contextlib import contextmanager
+
+from src.core import config
+
+# Aura serves the owner and the team members listed in AURA_USER_IDS. The
+# Discord user that a piece of work is done for travels in a context variable:
+# commands and mentions set it from the message author, mail syncs from the
+# mailbox's user. Executor threads run with a copy of the caller's context, so
+# credentials, the Gmail tracker and the task/note stores all resolve the
+# right user's files wherever they run. Work done without a user is the owner's.
+
+_current_user: contextvars.ContextVar[int | None] = contextvars.ContextVar("aura_user_id", default=None)
+
+
+def get_user_id() -> int | None:
+    user_id = _current_user.get()
+    return config.DISCORD_OWNER_ID if user_id is None else user_id
+
+
+def set_user(user_id: int | None) -> contextvars.Token:
+    """Sets the user for the rest of the current task. Prefer as_user() where a block is enough."""
+    return _current_user.set(user_id)
+
+
+@contextmanager
+def as_user(user_id: int | None):
+    token = _current_user.set(user_id)
+    try:
+        yield
+    finally:
+        _current_user.reset(token)
+
+
+def is_owner(user_id: int | None = None) -> bool:
+    user_id = get_user_id() if user_id is None else user_id
+    return user_id is None or user_id == config.DISCORD_OWNER_ID
+
+
+def is_allowed(user_id: int) -> bool:
+    return user_id == config.DISCORD_OWNER_ID or user_id in config.AURA_USER_IDS
+
+
+def known_user_ids() -> list[int]:
+    """The owner followed by the configured team members."""
+    users = [config.DISCORD_OWNER_ID] if config.DISCORD_OWNER_ID is not None else []
+    return users + sorted(user_id for user_id in config.AURA_USER_IDS if user_id != config.DISCORD_OWNER_ID)
+
+
+def user_data_dir(user_id: int | None = None) -> str:
+    """
+    The folder that holds the user's files. The owner's files stay in the
+    project folder, as before multi-user support; everyone else gets their own.
+    The folder is not created here; code that writes a file calls
+    ensure_user_data_dir first.
+    """
+    user_id = get_user_id() if user_id is None else user_id
+    if is_owner(user_id):
+        return "."
+    return os.path.join(config.AURA_USER_DATA_DIR, str(user_id))
+
+
+def ensure_user_data_dir(user_id: int | None = None) -> str:
+    """Creates the user's folder (see user_data_dir) if needed and returns it."""
+    directory = user_data_dir(user_id)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def user_data_path(filename: str, user_id: int | None = None) -> str:
+    """Where the given per-user file lives (see user_data_dir)."""
+    user_id = get_user_id() if user_id is None else user_id
+    if is_owner(user_id):
+        return filename
+    return os.path.join(user_data_dir(user_id), filename)